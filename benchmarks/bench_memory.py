@@ -0,0 +1,107 @@
+"""
+Memory benchmark for the HTML node classes.
+
+Parses every page under content/, keeps N copies of each tree alive and
+measures the bytes allocated per node with tracemalloc for three layouts:
+
+  dict    the original __dict__-based classes, inline spans nested
+  slots   the __slots__ classes, inline spans nested
+  flat    the __slots__ classes with flattened inline spans (the default)
+
+Text strings are shared between the copies, so the numbers are node
+overhead only.
+
+Usage: python benchmarks/bench_memory.py [--copies N] [--content DIR]
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from htmlnode import LeafNode, ParentNode  # noqa: E402
+from textnode import markdown_to_html_node  # noqa: E402
+
+
+class DictLeafNode:
+    """Stand-in for LeafNode as it was before __slots__"""
+
+    def __init__(self, tag, value, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = None
+        self.props = props
+
+
+class DictParentNode:
+    """Stand-in for ParentNode as it was before __slots__"""
+
+    def __init__(self, tag, children, props=None):
+        self.tag = tag
+        self.value = None
+        self.children = children
+        self.props = props
+
+
+def clone(node, leaf_cls, parent_cls, nested):
+    """Copy a tree into the given classes, optionally re-nesting tagged leaves"""
+    if node.children is None:
+        if nested and node.tag and node.tag != "img":
+            return parent_cls(node.tag, [leaf_cls(None, node.value)], node.props)
+        return leaf_cls(node.tag, node.value, node.props)
+    children = [clone(child, leaf_cls, parent_cls, nested) for child in node.children]
+    return parent_cls(node.tag, children, node.props)
+
+
+def count_nodes(node):
+    if node.children is None:
+        return 1
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def load_trees(content_dir):
+    trees = []
+    for root, _, files in os.walk(content_dir):
+        for name in sorted(files):
+            if name.endswith(".md"):
+                with open(os.path.join(root, name), encoding="utf-8") as f:
+                    trees.append(markdown_to_html_node(f.read()))
+    return trees
+
+
+def measure(trees, copies, leaf_cls, parent_cls, nested):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [clone(tree, leaf_cls, parent_cls, nested) for _ in range(copies) for tree in trees]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    nodes = sum(count_nodes(tree) for tree in kept)
+    return allocated, nodes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, default=200, help="copies of each page tree to keep alive")
+    parser.add_argument("--content", default="content", help="markdown content directory")
+    args = parser.parse_args(argv)
+
+    trees = load_trees(args.content)
+    if not trees:
+        sys.exit(f"no markdown files found under {args.content}")
+
+    layouts = [
+        ("dict", DictLeafNode, DictParentNode, True),
+        ("slots", LeafNode, ParentNode, True),
+        ("flat", LeafNode, ParentNode, False),
+    ]
+    pages = len(trees) * args.copies
+    print(f"{'layout':<8}{'nodes':>10}{'bytes':>14}{'bytes/node':>12}{'bytes/page':>12}")
+    for name, leaf_cls, parent_cls, nested in layouts:
+        allocated, nodes = measure(trees, args.copies, leaf_cls, parent_cls, nested)
+        print(f"{name:<8}{nodes:>10}{allocated:>14}{allocated / nodes:>12.1f}{allocated / pages:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
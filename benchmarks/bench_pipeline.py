@@ -0,0 +1,217 @@
+"""
+Benchmarks for the markdown-to-HTML pipeline.
+
+Generates a synthetic content tree and times each stage on its own:
+
+  text_to_textnodes         inline parsing of paragraph text
+  markdown_to_blocks        block splitting of whole documents
+  block_to_html_node        block parsing, including inline parsing
+  to_html                   serialization of prebuilt node trees
+  generate_pages_recursive  the full page build, from disk to disk
+
+For every stage it reports the best time over --repeat runs, throughput in
+MB/s of markdown input and pages/s, and peak traced memory (from one
+extra run under tracemalloc, so tracing does not skew the timings).
+
+Results can be saved with --output and compared with --baseline; any stage
+slower than the baseline by more than --threshold makes the script exit 1.
+
+Usage:
+  python benchmarks/bench_pipeline.py --pages 200 --output bench.json
+  python benchmarks/bench_pipeline.py --pages 200 --baseline bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from main import generate_pages_recursive  # noqa: E402
+from engine import (  # noqa: E402
+    LENIENT_ENGINE,
+    block_to_block_type,
+    block_type_paragraph,
+    markdown_to_blocks,
+)
+from utils import text_to_textnodes  # noqa: E402
+
+WORDS = (
+    "elf ring hobbit wizard shire mordor river forest tower king road "
+    "mountain song lore age star shadow fellowship quest sword light"
+).split()
+
+TEMPLATE = "<html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>"
+
+
+def inline_text(rng, words, density):
+    """A run of words where roughly `density` of them carry inline markup"""
+    out = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        if rng.random() < density:
+            kind = rng.randrange(5)
+            if kind == 0:
+                word = f"**{word}**"
+            elif kind == 1:
+                word = f"*{word}*"
+            elif kind == 2:
+                word = f"`{word}`"
+            elif kind == 3:
+                word = f"[{word}](/{word}/)"
+            else:
+                word = f"![{word}](/images/{word}.png)"
+        out.append(word)
+    return " ".join(out)
+
+
+def generate_markdown(rng, blocks=30, density=0.15):
+    """One synthetic page mixing every block type the parser supports"""
+    parts = [f"# {inline_text(rng, 4, 0)}"]
+    for _ in range(blocks):
+        kind = rng.randrange(6)
+        if kind == 0:
+            parts.append(f"## {inline_text(rng, 5, 0)}")
+        elif kind == 1:
+            parts.append("\n".join(f"* {inline_text(rng, 8, density)}" for _ in range(rng.randint(2, 6))))
+        elif kind == 2:
+            parts.append("\n".join(f"{i}. {inline_text(rng, 8, density)}" for i in range(1, rng.randint(3, 7))))
+        elif kind == 3:
+            parts.append("\n".join(f"> {inline_text(rng, 12, density)}" for _ in range(rng.randint(1, 3))))
+        elif kind == 4:
+            parts.append("```\n" + "\n".join(inline_text(rng, 6, 0) for _ in range(4)) + "\n```")
+        else:
+            parts.append(inline_text(rng, rng.randint(40, 120), density))
+    return "\n\n".join(parts)
+
+
+def generate_tree(root, pages, depth, rng, blocks, density):
+    """Write `pages` markdown files under root, nested `depth` directories deep"""
+    documents = []
+    for i in range(pages):
+        segments = [f"section{(i >> (2 * level)) % 4}" for level in range(depth)]
+        directory = os.path.join(root, *segments, f"page{i}")
+        os.makedirs(directory, exist_ok=True)
+        markdown = generate_markdown(rng, blocks, density)
+        with open(os.path.join(directory, "index.md"), "w", encoding="utf-8") as f:
+            f.write(markdown)
+        documents.append(markdown)
+    return documents
+
+
+def time_stage(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        dest_dir = os.path.join(tmp, "docs")
+        template_path = os.path.join(tmp, "template.html")
+        with open(template_path, "w", encoding="utf-8") as f:
+            f.write(TEMPLATE)
+        documents = generate_tree(content_dir, args.pages, args.depth, rng, args.blocks, args.density)
+
+        input_bytes = sum(len(doc.encode("utf-8")) for doc in documents)
+        blocks = [block for doc in documents for block in markdown_to_blocks(doc)]
+        paragraphs = [block for block in blocks if block_to_block_type(block) == block_type_paragraph]
+        # Serialize the trees the build itself renders
+        trees = [LENIENT_ENGINE.markdown_to_html_node(doc) for doc in documents]
+
+        def build():
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_pages_recursive(content_dir, template_path, dest_dir)
+
+        stages = [
+            ("text_to_textnodes", lambda: [text_to_textnodes(p) for p in paragraphs],
+             sum(len(p.encode("utf-8")) for p in paragraphs)),
+            ("markdown_to_blocks", lambda: [markdown_to_blocks(doc) for doc in documents], input_bytes),
+            ("block_to_html_node", lambda: [LENIENT_ENGINE.block_to_html_node(block) for block in blocks], input_bytes),
+            ("to_html", lambda: [tree.to_html() for tree in trees], input_bytes),
+            ("generate_pages_recursive", build, input_bytes),
+        ]
+
+        results = {}
+        for name, function, stage_bytes in stages:
+            seconds, peak = time_stage(function, args.repeat)
+            results[name] = {
+                "seconds": seconds,
+                "mb_per_s": stage_bytes / seconds / 1e6,
+                "pages_per_s": args.pages / seconds,
+                "peak_bytes": peak,
+            }
+    return {
+        "config": {k: getattr(args, k) for k in ("pages", "depth", "blocks", "density", "seed", "repeat")},
+        "python": sys.version.split()[0],
+        "input_bytes": input_bytes,
+        "stages": results,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print the change against baseline per stage and return the regressed stages"""
+    regressions = []
+    for name, stage in results["stages"].items():
+        old = baseline.get("stages", {}).get(name)
+        if not old:
+            continue
+        change = stage["seconds"] / old["seconds"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<26}{old['seconds'] * 1000:>10.1f}ms -> {stage['seconds'] * 1000:>8.1f}ms {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100, help="number of synthetic pages")
+    parser.add_argument("--depth", type=int, default=2, help="directory nesting depth of the content tree")
+    parser.add_argument("--blocks", type=int, default=30, help="blocks per page")
+    parser.add_argument("--density", type=float, default=0.15, help="fraction of words with inline markup")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; the best is kept")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown versus the baseline that counts as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    print(f"{args.pages} pages, {results['input_bytes'] / 1e6:.2f} MB of markdown")
+    print(f"{'stage':<26}{'ms':>10}{'MB/s':>10}{'pages/s':>12}{'peak KiB':>12}")
+    for name, stage in results["stages"].items():
+        print(f"{name:<26}{stage['seconds'] * 1000:>10.1f}{stage['mb_per_s']:>10.2f}"
+              f"{stage['pages_per_s']:>12.0f}{stage['peak_bytes'] / 1024:>12.0f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != results["config"]:
+            print("warning: baseline was recorded with a different configuration")
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
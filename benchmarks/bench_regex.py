@@ -0,0 +1,121 @@
+"""
+Microbenchmarks for regex dispatch in inline parsing.
+
+Each case times the current code against an alternative, on the same
+synthetic paragraphs bench_pipeline.py generates:
+
+  extract_images    IMAGE_PATTERN.findall vs re.findall with a pattern string
+  extract_links     LINK_PATTERN.findall vs re.findall with a pattern string
+  spans_strict      finding images and links the way scan_inline does (an
+                    image finditer, then a link finditer per gap) vs one
+                    finditer over a combined image|link alternation with
+                    named groups
+  spans_lenient     the same with the build's lenient links-first syntax
+  scan_plain        scan_inline on paragraphs without links or images,
+                    which skip the link and image patterns entirely, vs
+                    running both patterns anyway
+
+re.findall with a string looks the pattern up in re's internal cache on
+every call, so the extract cases show what that lookup costs. The
+combined alternation loses the literal-prefix search re uses for a
+pattern starting with "!" or "[", which is why scan_inline keeps two
+passes.
+
+Usage:
+  python benchmarks/bench_regex.py --paragraphs 5000 --density 0.3
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bench_pipeline import inline_text  # noqa: E402
+from engine import LENIENT_LINKS_FIRST  # noqa: E402
+import textnode  # noqa: E402
+from textnode import IMAGE_PATTERN, LINK_PATTERN, STRICT_INLINE, scan_inline  # noqa: E402
+
+
+def best_time(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def two_pass_spans(text, syntax):
+    matches = []
+    position = 0
+    for image in syntax.image_pattern.finditer(text):
+        matches += syntax.link_pattern.finditer(text, position, image.start())
+        matches.append(image)
+        position = image.end()
+    matches += syntax.link_pattern.finditer(text, position)
+    return matches
+
+
+def combined_pattern(syntax):
+    return re.compile(f"(?P<image>{syntax.image_pattern.pattern})|(?P<link>{syntax.link_pattern.pattern})")
+
+
+def scan_without_shortcut(text, syntax):
+    """scan_inline as it was before text without "[" skipped the patterns"""
+    nodes = []
+    position = 0
+    for match in syntax.image_pattern.finditer(text):
+        position = match.end()
+    textnode._scan_links_first(text, position, len(text), syntax, nodes)
+    return nodes
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    paragraphs = [inline_text(rng, rng.randint(10, 60), args.density) for _ in range(args.paragraphs)]
+    plain = [p.replace("[", "(") for p in paragraphs]
+    image_source, link_source = IMAGE_PATTERN.pattern, LINK_PATTERN.pattern
+    strict_combined = combined_pattern(STRICT_INLINE)
+    lenient_combined = combined_pattern(LENIENT_LINKS_FIRST)
+    cases = [
+        ("extract_images",
+         lambda: [IMAGE_PATTERN.findall(p) for p in paragraphs],
+         lambda: [re.findall(image_source, p) for p in paragraphs]),
+        ("extract_links",
+         lambda: [LINK_PATTERN.findall(p) for p in paragraphs],
+         lambda: [re.findall(link_source, p) for p in paragraphs]),
+        ("spans_strict",
+         lambda: [two_pass_spans(p, STRICT_INLINE) for p in paragraphs],
+         lambda: [list(strict_combined.finditer(p)) for p in paragraphs]),
+        ("spans_lenient",
+         lambda: [two_pass_spans(p, LENIENT_LINKS_FIRST) for p in paragraphs],
+         lambda: [list(lenient_combined.finditer(p)) for p in paragraphs]),
+        ("scan_plain",
+         lambda: [scan_inline(p, LENIENT_LINKS_FIRST) for p in plain],
+         lambda: [scan_without_shortcut(p, LENIENT_LINKS_FIRST) for p in plain]),
+    ]
+    results = {}
+    for name, current, alternative in cases:
+        results[name] = (best_time(current, args.repeat), best_time(alternative, args.repeat))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=5000, help="number of synthetic paragraphs")
+    parser.add_argument("--density", type=float, default=0.15, help="fraction of words with inline markup")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case; the best is kept")
+    args = parser.parse_args(argv)
+
+    print(f"{args.paragraphs} paragraphs, markup density {args.density}")
+    print(f"{'case':<18}{'current ms':>12}{'other ms':>10}{'speedup':>10}")
+    for name, (current, other) in run(args).items():
+        print(f"{name:<18}{current * 1000:>12.2f}{other * 1000:>10.2f}{other / current:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
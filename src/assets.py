@@ -0,0 +1,81 @@
+import os
+import shutil
+
+from manifest import file_signature, hash_file
+
+# Hex digits of the content hash put into fingerprinted file names
+FINGERPRINT_LENGTH = 8
+
+
+def collect_static(static_dir, dest_dir_path):
+    """Return (source, dest) pairs for every file under the static directory"""
+    assets = []
+    for root, dirs, files in os.walk(static_dir):
+        dirs.sort()
+        for name in sorted(files):
+            src_path = os.path.join(root, name)
+            rel_path = os.path.relpath(src_path, static_dir)
+            assets.append((src_path, os.path.join(dest_dir_path, rel_path)))
+    return assets
+
+
+def fingerprint_path(path, digest, length=FINGERPRINT_LENGTH):
+    """Insert the start of digest before the extension: index.css -> index.3f2a9c1b.css"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest[:length]}{ext}"
+
+
+def url_path(rel_path):
+    """Root-relative URL of a file at rel_path inside the output directory"""
+    return "/" + rel_path.replace(os.sep, "/")
+
+
+def publish(src_path, dest_path, link=False):
+    """
+    Put a copy of src_path at dest_path. With link, a hardlink is tried
+    first, which costs no data copy; it falls back to copying when the
+    output is on another filesystem or links are not supported.
+    Returns True if the file was linked.
+    """
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    # Never write through an existing file: it may be a link to a source
+    if os.path.lexists(dest_path):
+        os.remove(dest_path)
+    if link:
+        try:
+            os.link(src_path, dest_path)
+            return True
+        except OSError:
+            pass
+    shutil.copy2(src_path, dest_path)
+    return False
+
+
+def build_assets(static_dir, dest_dir, old, new, fingerprint=False, link=False):
+    """
+    Publish every file under static_dir into dest_dir, recording each one in
+    the new manifest.
+
+    A file whose size and mtime match the old manifest is not even read;
+    otherwise it is hashed, and it is only copied if the hash changed or its
+    output is missing. With fingerprint, outputs are named after their
+    content (index.3f2a9c1b.css) and new.asset_map maps each original URL
+    to the fingerprinted one, for rewriting references in the template and
+    pages. Returns (copied, skipped).
+    """
+    copied = skipped = 0
+    for src_path, dest_path in collect_static(static_dir, dest_dir):
+        signature = file_signature(src_path)
+        source_hash = old.known_hash("assets", src_path, signature) or hash_file(src_path)
+        if fingerprint:
+            rel_path = os.path.relpath(dest_path, dest_dir)
+            fingerprinted = fingerprint_path(rel_path, source_hash)
+            new.asset_map[url_path(rel_path)] = url_path(fingerprinted)
+            dest_path = os.path.join(dest_dir, fingerprinted)
+        new.assets[src_path] = {"hash": source_hash, "dest": dest_path, "signature": signature}
+        if old.is_fresh("assets", src_path, source_hash, dest_path):
+            skipped += 1
+            continue
+        publish(src_path, dest_path, link)
+        copied += 1
+    return copied, skipped
@@ -0,0 +1,146 @@
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Outputs worth precompressing; images and fonts are compressed already
+TEXT_EXTENSIONS = (".html", ".css", ".js", ".json", ".xml", ".svg", ".txt")
+
+# Below this many bytes the compressed file saves less than a packet
+MIN_SIZE = 1024
+
+
+def _gzip(data):
+    # mtime=0 keeps the output reproducible between builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+def _zstd(data):
+    return zstandard.ZstdCompressor(level=19).compress(data)
+
+
+# Every sibling suffix the stage may write, whether or not its library is installed
+ENCODERS = {".gz": _gzip, ".br": _brotli, ".zst": _zstd}
+
+
+def available_encodings():
+    """Suffixes of the encodings usable in this environment; gzip always is"""
+    suffixes = [".gz"]
+    if brotli is not None:
+        suffixes.append(".br")
+    if zstandard is not None:
+        suffixes.append(".zst")
+    return suffixes
+
+
+def compressed_siblings(path):
+    """Paths the stage may have written for path"""
+    if not path.endswith(TEXT_EXTENSIONS):
+        return []
+    return [path + suffix for suffix in ENCODERS]
+
+
+def _compress_file(path, suffixes):
+    """
+    Write the compressed siblings of path that are missing or older than it.
+
+    A sibling gets the mtime of its source, so it is up to date exactly when
+    the two match. Returns [(suffix, source size, compressed size, written)].
+    """
+    stat = os.stat(path)
+    results = []
+    data = None
+    for suffix in suffixes:
+        out_path = path + suffix
+        try:
+            out_stat = os.stat(out_path)
+        except FileNotFoundError:
+            out_stat = None
+        if out_stat is not None and out_stat.st_mtime_ns == stat.st_mtime_ns:
+            results.append((suffix, stat.st_size, out_stat.st_size, False))
+            continue
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        compressed = ENCODERS[suffix](data)
+        tmp_path = f"{out_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(compressed)
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_path, out_path)
+        results.append((suffix, stat.st_size, len(compressed), True))
+    return results
+
+
+def _compressible(path, min_size):
+    return path.endswith(TEXT_EXTENSIONS) and os.path.getsize(path) >= min_size
+
+
+def collect_compressible(dest_dir, min_size=MIN_SIZE):
+    """
+    Return the text outputs under dest_dir of at least min_size bytes, and
+    remove compressed siblings left behind by smaller or deleted outputs.
+    Files like archive.tar.gz are not siblings of a text output and are kept.
+    """
+    paths = []
+    for root, dirs, files in os.walk(dest_dir):
+        dirs.sort()
+        names = set(files)
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            base, suffix = os.path.splitext(name)
+            if suffix in ENCODERS and base.endswith(TEXT_EXTENSIONS):
+                if base not in names or not _compressible(os.path.join(root, base), min_size):
+                    os.remove(path)
+            elif _compressible(path, min_size):
+                paths.append(path)
+    return paths
+
+
+def compress_outputs(dest_dir, workers=1, min_size=MIN_SIZE, suffixes=None):
+    """
+    Precompress every text output in dest_dir into .gz (and .br/.zst when
+    brotli/zstandard are installed) siblings, across `workers` processes.
+
+    Returns {suffix: {"written", "fresh", "bytes_in", "bytes_out"}}; the
+    byte counts cover every compressed file, including up-to-date ones.
+    """
+    suffixes = suffixes or available_encodings()
+    paths = collect_compressible(dest_dir, min_size)
+    if workers > 1 and len(paths) > 1:
+        workers = min(workers, len(paths))
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_compress_file, paths, repeat(suffixes), chunksize=chunksize))
+    else:
+        results = [_compress_file(path, suffixes) for path in paths]
+
+    totals = {suffix: {"written": 0, "fresh": 0, "bytes_in": 0, "bytes_out": 0} for suffix in suffixes}
+    for file_results in results:
+        for suffix, size_in, size_out, written in file_results:
+            entry = totals[suffix]
+            entry["written" if written else "fresh"] += 1
+            entry["bytes_in"] += size_in
+            entry["bytes_out"] += size_out
+    return totals
+
+
+def print_compression(totals):
+    for suffix, entry in totals.items():
+        ratio = entry["bytes_out"] / entry["bytes_in"] if entry["bytes_in"] else 1.0
+        print(f"Compressed {entry['written']} files to {suffix} ({entry['fresh']} up to date), "
+              f"{entry['bytes_in'] / 1024:.1f} KiB -> {entry['bytes_out'] / 1024:.1f} KiB ({ratio:.1%})")
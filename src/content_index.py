@@ -0,0 +1,127 @@
+import os
+
+from markdown_parser import read_page_metadata
+
+
+class PageEntry:
+    """
+    One markdown source in the content tree, with the output path it
+    renders to and the size and mtime seen while scanning. meta holds the
+    page's front matter metadata once it has been loaded.
+    """
+
+    __slots__ = ("source", "dest", "rel_path", "size", "mtime_ns", "meta")
+
+    def __init__(self, source, dest, rel_path, size, mtime_ns, meta=None):
+        self.source = source
+        self.dest = dest
+        # Path relative to the content directory, always with "/" separators
+        self.rel_path = rel_path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.meta = meta
+
+    @property
+    def signature(self):
+        """Same shape as manifest.file_signature, without another stat"""
+        return [self.size, self.mtime_ns]
+
+    @property
+    def url(self):
+        """Root-relative URL of the rendered page: blog/tom/index.md -> /blog/tom/"""
+        path = self.rel_path[:-3]
+        if path == "index" or path.endswith("/index"):
+            return "/" + path[:-5]
+        return f"/{path}.html"
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def __eq__(self, other):
+        return isinstance(other, PageEntry) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"PageEntry({self.source!r}, {self.dest!r})"
+
+
+class ContentIndex:
+    """
+    Every page in a content tree, in a stable order: entries of each
+    directory sorted by name, with subdirectories expanded in place.
+    Build it once with scan_content and hand it to every stage that needs
+    the page list.
+    """
+
+    def __init__(self, content_dir, dest_dir, pages=None):
+        self.content_dir = content_dir
+        self.dest_dir = dest_dir
+        self.pages = pages if pages is not None else []
+
+    def __iter__(self):
+        return iter(self.pages)
+
+    def load_metadata(self):
+        """Read the metadata of every page that has none yet, header only"""
+        for page in self.pages:
+            if page.meta is None:
+                page.meta = read_page_metadata(page.source)
+
+    def __len__(self):
+        return len(self.pages)
+
+    def to_dict(self):
+        return {
+            "content_dir": self.content_dir,
+            "dest_dir": self.dest_dir,
+            "pages": [page.to_dict() for page in self.pages],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        pages = [PageEntry.from_dict(page) for page in data["pages"]]
+        return cls(data["content_dir"], data["dest_dir"], pages)
+
+    def __repr__(self):
+        return f"ContentIndex({self.content_dir!r}, {len(self.pages)} pages)"
+
+
+def _sorted_entries(path):
+    with os.scandir(path) as it:
+        return sorted(it, key=lambda entry: entry.name)
+
+
+def scan_content(content_dir, dest_dir, extension=".md"):
+    """
+    Scan content_dir once and return its ContentIndex.
+
+    os.scandir reports file types from the directory listing itself, so the
+    only stat per page is the one that records its size and mtime. The walk
+    keeps an explicit stack of directory iterators instead of recursing, so
+    deep trees cannot hit the recursion limit.
+    """
+    pages = []
+    stack = [("", iter(_sorted_entries(content_dir)))]
+    while stack:
+        rel_dir, entries = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+        rel_path = rel_dir + entry.name
+        if entry.is_dir():
+            stack.append((rel_path + "/", iter(_sorted_entries(entry.path))))
+        elif entry.name.endswith(extension) and entry.is_file():
+            stat = entry.stat()
+            dest = os.path.join(dest_dir, *rel_path[:-len(extension)].split("/")) + ".html"
+            pages.append(PageEntry(entry.path, dest, rel_path, stat.st_size, stat.st_mtime_ns))
+    return ContentIndex(content_dir, dest_dir, pages)
+
+
+def make_directories(paths):
+    """Create the parent directory of every path, calling makedirs once per directory"""
+    for directory in sorted({os.path.dirname(path) for path in paths}):
+        os.makedirs(directory, exist_ok=True)
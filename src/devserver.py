@@ -0,0 +1,109 @@
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+def snapshot(paths):
+    """Map every file under paths to its (mtime_ns, size)"""
+    state = {}
+    for path in paths:
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+            continue
+        for root, _, files in os.walk(path):
+            for name in files:
+                file_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                state[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+class Watcher:
+    """
+    Polls a set of files and directories for changes.
+
+    Polling keeps this portable and dependency-free. wait_for_changes
+    debounces: once something changes it keeps polling until the tree has
+    been quiet for `debounce` seconds, so an editor saving several files,
+    or writing one file in several steps, triggers a single rebuild.
+    """
+
+    def __init__(self, paths, interval=0.5, debounce=0.3):
+        self.paths = list(paths)
+        self.interval = interval
+        self.debounce = debounce
+        self.state = snapshot(self.paths)
+
+    def poll(self):
+        """Return the set of paths added, removed or modified since the last poll"""
+        current = snapshot(self.paths)
+        changed = {
+            path for path in current.keys() | self.state.keys()
+            if current.get(path) != self.state.get(path)
+        }
+        self.state = current
+        return changed
+
+    def wait_for_changes(self, stop_event=None):
+        """Block until a debounced batch of changes is available and return it"""
+        changed = set()
+        quiet_since = None
+        while stop_event is None or not stop_event.is_set():
+            batch = self.poll()
+            now = time.monotonic()
+            if batch:
+                changed |= batch
+                quiet_since = now
+            elif changed and now - quiet_since >= self.debounce:
+                return changed
+            time.sleep(self.interval if not changed else min(self.interval, self.debounce))
+        return changed
+
+
+def start_server(directory, port=8888):
+    """Serve directory over HTTP from a background thread and return the server"""
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=directory)
+    server = ThreadingHTTPServer(("", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def _run_rebuild(rebuild, changed):
+    try:
+        rebuild(changed)
+    except Exception as exc:
+        print(f"Rebuild failed: {exc}")
+
+
+def serve(rebuild, watch_paths, directory, port=8888, interval=0.5):
+    """
+    Run rebuild() once, serve directory and call rebuild() again after every
+    batch of changes under watch_paths, until interrupted.
+
+    rebuild receives the set of changed paths (None for the first build).
+    Exceptions from any rebuild, the first included, are printed and the
+    server keeps running, so a typo in one page does not end the session.
+    The watch paths are snapshotted before the first build, so files saved
+    while it runs still trigger a rebuild.
+    """
+    watcher = Watcher(watch_paths, interval=interval)
+    _run_rebuild(rebuild, None)
+    server = start_server(directory, port)
+    print(f"Serving {directory}/ at http://localhost:{server.server_address[1]}/ (Ctrl+C to stop)")
+    try:
+        while True:
+            changed = watcher.wait_for_changes()
+            print(f"Detected changes in {len(changed)} file(s), rebuilding")
+            _run_rebuild(rebuild, changed)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
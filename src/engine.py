@@ -0,0 +1,312 @@
+from functools import lru_cache
+
+from highlight import Highlighter, fence_language, runs_to_html_nodes
+from htmlnode import CodeLeafNode, ParentNode
+from textnode import (
+    IMAGE_PATTERN,
+    LINK_PATTERN,
+    STRICT_INLINE,
+    InlineSyntax,
+    LeafInterner,
+    scan_inline,
+    text_node_to_html_node,
+)
+
+block_type_paragraph = "paragraph"
+block_type_heading = "heading"
+block_type_code = "code"
+block_type_quote = "quote"
+block_type_olist = "ordered_list"
+block_type_ulist = "unordered_list"
+
+# Spans kept by each build engine's LeafInterner
+INTERN_SIZE = 4096
+
+# Links first like STRICT_INLINE, but with the lenient patterns, so an empty
+# alt or URL still matches, and unclosed delimiters stay literal
+LENIENT_LINKS_FIRST = InlineSyntax(IMAGE_PATTERN, LINK_PATTERN, False, True)
+
+
+HEADING_PREFIXES = ("# ", "## ", "### ", "#### ", "##### ", "###### ")
+FENCE = "```"
+# First characters of every block type other than paragraph
+BLOCK_MARKERS = frozenset("#`>*-1")
+
+
+class Block:
+    """
+    One block of a markdown document: its type, its lines (the first with
+    leading and the last with trailing whitespace removed) and the
+    [start, end) span of 0-based source line numbers it came from.
+    """
+
+    __slots__ = ("block_type", "lines", "start", "end")
+
+    def __init__(self, block_type, lines, start, end):
+        self.block_type = block_type
+        self.lines = lines
+        self.start = start
+        self.end = end
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+    def __eq__(self, other):
+        return isinstance(other, Block) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self):
+        return f"Block({self.block_type!r}, {self.text!r}, {self.start}, {self.end})"
+
+
+def _is_fence(line):
+    """True for an opening ``` line; its info string cannot hold backticks"""
+    return line.startswith(FENCE) and "`" not in line.lstrip("`")
+
+
+def _is_closing_fence(line):
+    line = line.strip()
+    return line.startswith(FENCE) and not line.lstrip("`")
+
+
+def _lines_block_type(lines):
+    first = lines[0]
+    if first[:1] not in BLOCK_MARKERS:
+        return block_type_paragraph
+    if first.startswith(HEADING_PREFIXES):
+        return block_type_heading
+    if len(lines) > 1 and first.startswith(FENCE) and lines[-1].startswith(FENCE):
+        return block_type_code
+    if first.startswith(">"):
+        if all(line.startswith(">") for line in lines):
+            return block_type_quote
+        return block_type_paragraph
+    if first.startswith(("* ", "- ")):
+        marker = first[:2]
+        if all(line.startswith(marker) for line in lines):
+            return block_type_ulist
+        return block_type_paragraph
+    if first.startswith("1. "):
+        for i, line in enumerate(lines, 1):
+            if not line.startswith(f"{i}. "):
+                return block_type_paragraph
+        return block_type_olist
+    return block_type_paragraph
+
+
+def _finish_block(lines, start, block_type=None):
+    # Trailing whitespace-only lines belong to no block, as with str.strip()
+    while not lines[-1].strip():
+        lines.pop()
+    lines[-1] = lines[-1].rstrip()
+    return Block(block_type or _lines_block_type(lines), lines, start, start + len(lines))
+
+
+def scan_blocks(source):
+    """
+    Yield the Blocks of a markdown document in one pass over its lines.
+
+    source is a string, a text file or any iterable of lines. Only the
+    current block is held in memory. Blocks are separated by empty lines,
+    except inside a ``` fence, which runs to its closing fence (or the end
+    of the document) and may contain blank lines.
+    """
+    if isinstance(source, str):
+        source = source.split("\n")
+    else:
+        source = (line.rstrip("\n") for line in source)
+    lines = []
+    start = 0
+    fenced = False
+    for number, line in enumerate(source):
+        if fenced:
+            lines.append(line)
+            if _is_closing_fence(line):
+                lines[-1] = line.strip()
+                yield Block(block_type_code, lines, start, number + 1)
+                lines = []
+                fenced = False
+        elif not line:
+            if lines:
+                yield _finish_block(lines, start)
+                lines = []
+        elif lines:
+            lines.append(line)
+        # Leading whitespace-only lines belong to no block either
+        elif line.strip():
+            line = line.lstrip()
+            start = number
+            fenced = _is_fence(line)
+            lines.append(line)
+    if lines:
+        yield _finish_block(lines, start, block_type_code if fenced else None)
+
+
+def markdown_to_blocks(markdown):
+    """Split markdown into blocks separated by blank lines"""
+    return [block.text for block in scan_blocks(markdown)]
+
+
+def block_to_block_type(block):
+    return _lines_block_type(block.split("\n"))
+
+
+class MarkdownEngine:
+    """
+    The markdown-to-HTML pipeline used by the build.
+
+    Parsing runs in two phases that can be called separately: split_blocks
+    scans the document into typed Blocks, and blocks_to_html_node runs
+    inline parsing and builds the tree. markdown_to_html_node streams the
+    blocks straight into the tree, so a text file can be passed instead of a
+    string. In strict mode an unclosed **, * or ` raises ValueError; lenient
+    mode never raises and leaves unmatched delimiters in the text, as the
+    old textnode parser did.
+
+    With a Highlighter, fenced code blocks tagged with a language pygments
+    knows are rendered as highlighted spans; other code blocks stay plain.
+    With a LeafInterner, repeated inline spans share one node.
+    """
+
+    def __init__(self, strict=False, highlighter=None, interner=None):
+        self.strict = strict
+        self.highlighter = highlighter
+        self.interner = interner
+        self.inline_syntax = STRICT_INLINE if strict else LENIENT_LINKS_FIRST
+
+    def markdown_to_html_node(self, markdown):
+        return self.blocks_to_html_node(scan_blocks(markdown))
+
+    def split_blocks(self, markdown):
+        """Return the Blocks of markdown as a list"""
+        return list(scan_blocks(markdown))
+
+    def blocks_to_html_node(self, blocks):
+        return ParentNode("div", [self.lines_to_html_node(block.lines, block.block_type) for block in blocks])
+
+    def block_to_html_node(self, block, block_type=None):
+        """Convert one block given as a string"""
+        return self.lines_to_html_node(block.split("\n"), block_type)
+
+    def lines_to_html_node(self, lines, block_type=None):
+        if block_type is None:
+            block_type = _lines_block_type(lines)
+        if block_type == block_type_paragraph:
+            return self.paragraph_to_html_node(lines)
+        if block_type == block_type_heading:
+            return self.heading_to_html_node(lines)
+        if block_type == block_type_code:
+            return self.code_to_html_node(lines)
+        if block_type == block_type_olist:
+            return self.olist_to_html_node(lines)
+        if block_type == block_type_ulist:
+            return self.ulist_to_html_node(lines)
+        if block_type == block_type_quote:
+            return self.quote_to_html_node(lines)
+        raise ValueError("Invalid block type")
+
+    def text_to_children(self, text):
+        interner = self.interner
+        return [text_node_to_html_node(node, interner=interner) for node in scan_inline(text, self.inline_syntax)]
+
+    def paragraph_to_html_node(self, lines):
+        paragraph = " ".join(lines)
+        children = self.text_to_children(paragraph)
+        return ParentNode("p", children)
+
+    def heading_to_html_node(self, lines):
+        block = "\n".join(lines)
+        level = 0
+        for char in block:
+            if char == "#":
+                level += 1
+            else:
+                break
+        if level + 1 >= len(block):
+            raise ValueError(f"Invalid heading level: {level}")
+        text = block[level + 1 :]
+        children = self.text_to_children(text)
+        return ParentNode(f"h{level}", children)
+
+    def code_to_html_node(self, lines):
+        if not lines[0].startswith(FENCE):
+            raise ValueError("Invalid code block")
+        if len(lines) > 1 and _is_closing_fence(lines[-1]):
+            body = lines[1:-1]
+        elif self.strict and len(lines) > 1 and lines[-1].startswith(FENCE):
+            raise ValueError("Invalid code block")
+        else:
+            # A fence left open runs to the end of the document; in lenient
+            # mode that includes a last line such as ```x that cannot close it
+            body = lines[1:]
+        # Code is literal: skip the fence lines and never run inline parsing
+        text = "".join(line + "\n" for line in body)
+        if self.highlighter:
+            language = fence_language(lines[0])
+            runs = self.highlighter.runs(language, text)
+            if runs:
+                code = ParentNode("code", runs_to_html_nodes(runs), {"class": f"language-{language}"})
+                return ParentNode("pre", [code], {"class": "highlight"})
+        code = ParentNode("code", [CodeLeafNode(None, text)])
+        return ParentNode("pre", [code])
+
+    def olist_to_html_node(self, lines):
+        html_items = []
+        for item in lines:
+            text = item.split(". ", 1)[1]
+            children = self.text_to_children(text)
+            html_items.append(ParentNode("li", children))
+        return ParentNode("ol", html_items)
+
+    def ulist_to_html_node(self, lines):
+        html_items = []
+        for item in lines:
+            text = item[2:]
+            children = self.text_to_children(text)
+            html_items.append(ParentNode("li", children))
+        return ParentNode("ul", html_items)
+
+    def quote_to_html_node(self, lines):
+        new_lines = []
+        for line in lines:
+            if not line.startswith(">"):
+                raise ValueError("Invalid quote block")
+            new_lines.append(line.lstrip(">").strip())
+        content = " ".join(new_lines)
+        children = self.text_to_children(content)
+        return ParentNode("blockquote", children)
+
+    def __repr__(self):
+        if self.highlighter:
+            return f"MarkdownEngine(strict={self.strict!r}, highlighter={self.highlighter!r})"
+        return f"MarkdownEngine(strict={self.strict!r})"
+
+
+STRICT_ENGINE = MarkdownEngine(strict=True)
+LENIENT_ENGINE = MarkdownEngine(strict=False)
+
+
+@lru_cache(maxsize=None)
+def _configured_engine(strict, highlight_dir, interned):
+    highlighter = Highlighter(highlight_dir) if highlight_dir else None
+    return MarkdownEngine(strict, highlighter, LeafInterner(INTERN_SIZE) if interned else None)
+
+
+def get_engine(strict=False, highlight_dir=None, interned=False):
+    """
+    The shared engine for these options, one per process. With
+    highlight_dir, code blocks are highlighted and their tokens cached in
+    that directory. With interned, inline spans are shared FrozenLeafNodes
+    from the engine's LeafInterner; the build uses this, while trees handed
+    to library callers stay made of ordinary, mutable nodes.
+    """
+    if highlight_dir or interned:
+        return _configured_engine(strict, highlight_dir, interned)
+    return STRICT_ENGINE if strict else LENIENT_ENGINE
+
+
+def markdown_to_html_node(markdown, strict=False):
+    """Convert a markdown string to an HTML node"""
+    return get_engine(strict).markdown_to_html_node(markdown)
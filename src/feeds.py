@@ -0,0 +1,138 @@
+import glob
+import heapq
+import os
+import re
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+
+from listings import BLOG_DIR, is_post
+
+# The sitemaps.org protocol allows at most this many URLs per file
+SITEMAP_LIMIT = 50000
+SITEMAP_PART_PATTERN = re.compile(r"sitemap-[0-9]+\.xml")
+FEED_SIZE = 20
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+
+
+def absolute_url(site_url, basepath, url):
+    """site_url plus url under basepath, the same prefixing the page templates apply"""
+    return site_url.rstrip("/") + basepath + url[1:]
+
+
+def mtime_date(page):
+    return datetime.fromtimestamp(page.mtime_ns / 1e9, timezone.utc).date().isoformat()
+
+
+def lastmod(page):
+    """W3C date a page last changed: its front matter updated or date, else its source mtime"""
+    return page.meta.get("updated") or page.meta["date"] or mtime_date(page)
+
+
+def _attr(value):
+    return escape(value, {'"': "&quot;"})
+
+
+def _write_atomic(path, write):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def write_sitemap(pages, dest_dir, site_url, basepath="/", limit=SITEMAP_LIMIT, keep=()):
+    """
+    Write sitemap.xml for pages, streaming one <url> at a time.
+
+    Past `limit` URLs the entries are spread over sitemap-1.xml,
+    sitemap-2.xml, ... and sitemap.xml becomes a sitemap index pointing at
+    them. Numbered files left over from a larger earlier build are removed,
+    except for the paths in keep (files published from static/).
+    Returns the number of URLs written.
+    """
+    count = 0
+    parts = []
+
+    def open_part():
+        path = os.path.join(dest_dir, f"sitemap-{len(parts) + 1}.xml")
+        parts.append(path)
+        f = open(f"{path}.tmp", 'w', encoding='utf-8')
+        f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n')
+        return f
+
+    f = open_part()
+    try:
+        for page in pages:
+            if count and count % limit == 0:
+                f.write("</urlset>\n")
+                f.close()
+                f = open_part()
+            loc = escape(absolute_url(site_url, basepath, page.url))
+            f.write(f"<url><loc>{loc}</loc><lastmod>{escape(lastmod(page))}</lastmod></url>\n")
+            count += 1
+        f.write("</urlset>\n")
+    finally:
+        f.close()
+
+    sitemap_path = os.path.join(dest_dir, "sitemap.xml")
+    if len(parts) == 1:
+        os.replace(f"{parts[0]}.tmp", sitemap_path)
+        parts = []
+    else:
+        for path in parts:
+            os.replace(f"{path}.tmp", path)
+
+        def write_index(f):
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n')
+            for path in parts:
+                loc = escape(absolute_url(site_url, basepath, "/" + os.path.basename(path)))
+                f.write(f"<sitemap><loc>{loc}</loc></sitemap>\n")
+            f.write("</sitemapindex>\n")
+
+        _write_atomic(sitemap_path, write_index)
+    keep = {os.path.abspath(path) for path in [*parts, *keep]}
+    for path in glob.glob(os.path.join(dest_dir, "sitemap-*.xml")):
+        if SITEMAP_PART_PATTERN.fullmatch(os.path.basename(path)) and os.path.abspath(path) not in keep:
+            os.remove(path)
+    return count
+
+
+def newest_posts(pages, count=FEED_SIZE, blog_dir=BLOG_DIR):
+    """The `count` newest posts, newest first, picked with a heap instead of sorting every post"""
+    posts = (page for page in pages if is_post(page, blog_dir))
+    return heapq.nlargest(count, posts, key=lambda page: (lastmod(page), page.rel_path))
+
+
+def write_feed(pages, dest_dir, site_url, basepath="/", title="Blog", count=FEED_SIZE, blog_dir=BLOG_DIR,
+               author=None):
+    """
+    Write an Atom feed.xml of the newest `count` posts and return how many
+    it holds.
+
+    Atom requires an author: the feed names `author`, or the title when none
+    is given, and posts with an author in their front matter name their own.
+    """
+    entries = newest_posts(pages, count, blog_dir)
+    feed_url = absolute_url(site_url, basepath, "/feed.xml")
+    home_url = absolute_url(site_url, basepath, "/")
+    updated = f"{escape(lastmod(entries[0]))}T00:00:00Z" if entries else "1970-01-01T00:00:00Z"
+
+    def write(f):
+        f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="{ATOM_NS}">\n')
+        f.write(f"<title>{escape(title)}</title>\n<id>{escape(home_url)}</id>\n<updated>{updated}</updated>\n")
+        f.write(f"<author><name>{escape(author or title)}</name></author>\n")
+        f.write(f'<link href="{_attr(home_url)}"/>\n<link rel="self" href="{_attr(feed_url)}"/>\n')
+        for page in entries:
+            url = absolute_url(site_url, basepath, page.url)
+            entry_title = escape(page.meta["title"] or page.rel_path)
+            entry_author = page.meta.get("author")
+            f.write(f'<entry><title>{entry_title}</title><link href="{_attr(url)}"/><id>{escape(url)}</id>'
+                    f"<updated>{escape(lastmod(page))}T00:00:00Z</updated>")
+            if entry_author:
+                f.write(f"<author><name>{escape(entry_author)}</name></author>")
+            f.write("</entry>\n")
+        f.write("</feed>\n")
+
+    _write_atomic(os.path.join(dest_dir, "feed.xml"), write)
+    return len(entries)
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from htmlnode import CodeLeafNode
+
+try:
+    import pygments
+    from pygments.lexers import get_lexer_by_name
+    from pygments.token import STANDARD_TYPES
+    from pygments.util import ClassNotFound
+    from pygments.formatters import HtmlFormatter
+except ImportError:  # highlighting is optional
+    pygments = None
+
+HIGHLIGHT_STYLE = "default"
+# Bump when the cached token layout changes
+HIGHLIGHT_FORMAT = 1
+# Code blocks whose runs each Highlighter keeps in memory
+MEMO_SIZE = 1024
+
+
+def fence_language(fence_line):
+    """Language tag of a ``` fence line: "```python {.x}" -> "python", "```" -> "" """
+    words = fence_line[3:].split()
+    return words[0].lower() if words else ""
+
+
+def tokenize(code, language):
+    """
+    Highlight code as [css_class, text] runs, adjacent runs of the same
+    class merged, or None if pygments has no lexer for language.
+    """
+    try:
+        lexer = get_lexer_by_name(language, stripnl=False, ensurenl=False)
+    except ClassNotFound:
+        return None
+    runs = []
+    for token_type, text in lexer.get_tokens(code):
+        while token_type not in STANDARD_TYPES:
+            token_type = token_type.parent
+        css_class = STANDARD_TYPES[token_type]
+        if runs and runs[-1][0] == css_class:
+            runs[-1][1] += text
+        else:
+            runs.append([css_class, text])
+    return runs
+
+
+def runs_to_html_nodes(runs):
+    """One <span class="..."> per highlighted run; unstyled text stays bare"""
+    return [CodeLeafNode("span", text, {"class": css_class}) if css_class else CodeLeafNode(None, text)
+            for css_class, text in runs]
+
+
+class Highlighter:
+    """
+    Syntax highlighter for fenced code blocks, backed by pygments.
+
+    Tokenizing is the slow part, so the runs for each (language, code)
+    pair are memoized in memory, in an LRU of up to maxsize blocks, and
+    with a directory on disk as well, so code blocks that did not change
+    are never tokenized again by later builds. Entries are keyed by a hash
+    of the language, the code and the pygments version; unreadable entries
+    are treated as misses.
+    """
+
+    def __init__(self, directory=None, maxsize=MEMO_SIZE):
+        self.directory = directory
+        self.maxsize = maxsize
+        self._memo = OrderedDict()
+
+    @staticmethod
+    def available():
+        return pygments is not None
+
+    def key(self, language, code):
+        digest = hashlib.sha256(f"format {HIGHLIGHT_FORMAT} pygments {pygments.__version__}".encode())
+        digest.update(b"\0")
+        digest.update(language.encode('utf-8'))
+        digest.update(b"\0")
+        digest.update(code.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def runs(self, language, code):
+        """Highlighted runs of code, or None when it cannot be highlighted"""
+        if not language or pygments is None:
+            return None
+        key = self.key(language, code)
+        if key in self._memo:
+            self._memo.move_to_end(key)
+            return self._memo[key]
+        runs = self._load(key)
+        if runs is None:
+            runs = tokenize(code, language)
+            if self.directory and runs is not None:
+                self._store(key, runs)
+        self._memo[key] = runs
+        if len(self._memo) > self.maxsize:
+            self._memo.popitem(last=False)
+        return runs
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return None
+        return entry.get("runs")
+
+    def _store(self, key, runs):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique temp name: parallel workers may store the same block at once
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"key": key, "runs": runs}, f)
+        os.replace(tmp_path, path)
+
+    def __repr__(self):
+        version = pygments.__version__ if pygments else None
+        return f"Highlighter({self.directory!r}, pygments={version!r})"
+
+
+def stylesheet(style=HIGHLIGHT_STYLE):
+    """CSS for the span classes, scoped to <pre class="highlight">"""
+    return HtmlFormatter(style=style).get_style_defs(".highlight")
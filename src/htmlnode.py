@@ -1,4 +1,65 @@
+import re
+from functools import lru_cache
+from html.entities import html5
+from types import MappingProxyType
+
+# An & with what may follow it as a character reference: &name; &#65; &#x41;
+AMPERSAND_PATTERN = re.compile(r"&([A-Za-z][A-Za-z0-9]*;|#[0-9]+;|#[xX][0-9A-Fa-f]+;)?")
+
+
+def _escape_ampersand(match):
+    reference = match.group(1)
+    if reference and (reference[0] == "#" or reference in html5):
+        return match.group()
+    return "&amp;" + (reference or "")
+
+
+def escape_ampersands(text):
+    """Escape every & that does not start a valid character reference, so &copy; stays as written"""
+    return AMPERSAND_PATTERN.sub(_escape_ampersand, text)
+
+
+def escape_text(text):
+    """Escape &, < and > for HTML text content"""
+    # The membership tests are C-speed scans; most text has nothing to escape
+    if "&" in text:
+        text = escape_ampersands(text)
+    if "<" in text or ">" in text:
+        return text.replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+
+def escape_code(text):
+    """Escape every &, < and > for code, which shows &amp; and &copy; exactly as written"""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text or ">" in text:
+        return text.replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+
+def escape_attribute(value):
+    """Escape &, <, > and double quotes for a double-quoted attribute value"""
+    if "&" in value:
+        value = escape_ampersands(value)
+    if "<" in value or ">" in value or '"' in value:
+        return value.replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    return value
+
+
+@lru_cache(maxsize=4096)
+def render_attributes(items):
+    """
+    ' key="value"' for each (key, value) pair, values escaped. Memoized per
+    distinct pairs, since pages repeat the same links and images.
+    """
+    return "".join(f' {key}="{escape_attribute(str(value))}"' for key, value in items)
+
+
 class HTMLNode:
+    # Pages can hold thousands of nodes, so skip the per-instance __dict__
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props= None):
         self.tag = tag
         self.value = value
@@ -7,17 +68,31 @@ class HTMLNode:
 
     def to_html(self):
         raise NotImplementedError("to_html method not implemented")
+
+    def iter_html(self):
+        """Yield the node's HTML as a sequence of string fragments"""
+        yield self.to_html()
+
+    def write_html(self, fp):
+        """Write the node's HTML to a file-like object without building the whole string"""
+        fp.writelines(self.iter_html())
     
     def props_to_html(self):
-        
         if not self.props:
             return ""
-        return " ".join([f' {key}="{value}"' for key, value in self.props.items()])
+        items = tuple(self.props.items())
+        try:
+            return render_attributes(items)
+        except TypeError:
+            # A prop value that cannot be hashed cannot be a cache key either
+            return render_attributes.__wrapped__(items)
     
     def __repr__(self):
         return f"HTMLNode({self.tag!r}, {self.value!r}, {self.children!r}, {self.props!r})"
     
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
 
@@ -25,14 +100,76 @@ class LeafNode(HTMLNode):
         if not self.value:
             raise ValueError("all leaf nodes must have a value")
         if not self.tag:
-            return f"{self.value}"
+            return escape_text(self.value)
         
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+        return f"<{self.tag}{self.props_to_html()}>{escape_text(self.value)}</{self.tag}>"
 
     def __repr__(self):
         return f"LeafNode({self.tag!r}, {self.value!r}, {self.props!r})"
     
+class CodeLeafNode(LeafNode):
+    """
+    A LeafNode holding code: every &, < and > in its value is escaped,
+    character references included. An empty value is allowed, for an
+    empty code block.
+    """
+    __slots__ = ()
+
+    def to_html(self):
+        if self.value is None:
+            raise ValueError("all leaf nodes must have a value")
+        if not self.tag:
+            return escape_code(self.value)
+
+        return f"<{self.tag}{self.props_to_html()}>{escape_code(self.value)}</{self.tag}>"
+
+    def __repr__(self):
+        return f"CodeLeafNode({self.tag!r}, {self.value!r}, {self.props!r})"
+
+class FrozenLeafNode(LeafNode):
+    """
+    A LeafNode that can be shared between trees and pages. Its attributes
+    cannot be reassigned, its props are read-only and its HTML is rendered
+    once, on first use.
+    """
+    __slots__ = ("_html",)
+
+    def __init__(self, tag, value, props=None):
+        object.__setattr__(self, "tag", tag)
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "children", None)
+        object.__setattr__(self, "props", MappingProxyType(dict(props)) if props else None)
+        object.__setattr__(self, "_html", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (type(self), (self.tag, self.value, dict(self.props) if self.props else None))
+
+    def to_html(self):
+        html = self._html
+        if html is None:
+            html = super().to_html()
+            object.__setattr__(self, "_html", html)
+        return html
+
+    def __repr__(self):
+        return f"FrozenLeafNode({self.tag!r}, {self.value!r}, {self.props!r})"
+
+class FrozenCodeLeafNode(FrozenLeafNode, CodeLeafNode):
+    """A FrozenLeafNode that escapes its value as code"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"FrozenCodeLeafNode({self.tag!r}, {self.value!r}, {self.props!r})"
+    
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
@@ -46,6 +183,30 @@ class ParentNode(HTMLNode):
         
         return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
 
+    def iter_html(self):
+        """
+        Yield opening tags, leaf HTML and closing tags depth-first.
+
+        Uses an explicit stack instead of recursion, so no intermediate
+        string is built per nesting level and deep trees cannot hit the
+        recursion limit.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                yield node
+            elif isinstance(node, ParentNode):
+                if not node.tag:
+                    raise ValueError("all parent nodes must have a tag")
+                if not node.children:
+                    raise ValueError("all parent nodes must have children")
+                yield f"<{node.tag}{node.props_to_html()}>"
+                stack.append(f"</{node.tag}>")
+                stack.extend(reversed(node.children))
+            else:
+                yield from node.iter_html()
+
     def __repr__(self):
         return f"ParentNode({self.tag!r}, {self.children!r}, {self.props!r})"
     
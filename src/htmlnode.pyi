@@ -1,12 +1,30 @@
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Mapping, TextIO, Tuple
+
+def escape_ampersands(text: str) -> str: ...
+def escape_text(text: str) -> str: ...
+def escape_code(text: str) -> str: ...
+def escape_attribute(value: str) -> str: ...
+def render_attributes(items: Tuple[Tuple[str, str], ...]) -> str: ...
 
 class HtmlNode:
     def to_html(self) -> str: ...
+    def iter_html(self) -> Iterator[str]: ...
+    def write_html(self, fp: TextIO) -> None: ...
 
 class LeafNode(HtmlNode):
     def __init__(self, tag: Optional[str], value: Optional[str], props: Optional[Dict[str, str]] = None) -> None: ...
     def to_html(self) -> str: ...
 
+class CodeLeafNode(LeafNode):
+    def to_html(self) -> str: ...
+
+class FrozenLeafNode(LeafNode):
+    def __init__(self, tag: Optional[str], value: Optional[str], props: Optional[Mapping[str, str]] = None) -> None: ...
+    def to_html(self) -> str: ...
+
+class FrozenCodeLeafNode(FrozenLeafNode, CodeLeafNode): ...
+
 class ParentNode(HtmlNode):
     def __init__(self, tag: str, children: List[HtmlNode], props: Optional[Dict[str, str]] = None) -> None: ...
-    def to_html(self) -> str: ... 
\ No newline at end of file
+    def to_html(self) -> str: ...
+    def iter_html(self) -> Iterator[str]: ... 
\ No newline at end of file
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import re
+
+from htmlnode import LeafNode, ParentNode
+
+BLOG_DIR = "blog"
+PER_PAGE = 10
+TAG_SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+def tag_slug(tag):
+    """URL segment for a tag: "Middle Earth" -> "middle-earth" """
+    return TAG_SLUG_PATTERN.sub("-", tag.lower()).strip("-") or "tag"
+
+
+def is_post(page, blog_dir=BLOG_DIR):
+    """True for pages under blog_dir, except the blog's own index"""
+    return page.rel_path.startswith(blog_dir + "/") and page.rel_path != blog_dir + "/index.md"
+
+
+def collect_posts(pages, blog_dir=BLOG_DIR):
+    """
+    The pages under blog_dir (except its own index), newest first by their
+    front matter date. Undated posts come last, in path order.
+    """
+    posts = [page for page in pages if is_post(page, blog_dir)]
+    posts.sort(key=lambda page: page.rel_path)
+    # Stable sort: posts with the same date keep their path order
+    posts.sort(key=lambda page: page.meta["date"] or "", reverse=True)
+    return posts
+
+
+class Listing:
+    """
+    One generated listing page: a title, the (url, title, date) entries it
+    links to and the URLs of its neighbouring pages.
+    """
+
+    def __init__(self, url, title, entries, prev_url=None, next_url=None):
+        self.url = url
+        self.title = title
+        self.entries = entries
+        self.prev_url = prev_url
+        self.next_url = next_url
+
+    def dest(self, dest_dir):
+        return os.path.join(dest_dir, *self.url.strip("/").split("/"), "index.html")
+
+    def digest(self):
+        """Hash of everything the page shows, to tell whether it needs rewriting"""
+        data = [self.url, self.title, self.entries, self.prev_url, self.next_url]
+        return hashlib.sha256(json.dumps(data).encode('utf-8')).hexdigest()
+
+    def to_html_node(self):
+        items = []
+        for url, title, date in self.entries:
+            children = [LeafNode("a", title, {"href": url})]
+            if date:
+                children += [LeafNode(None, " "), LeafNode("time", date, {"datetime": date})]
+            items.append(ParentNode("li", children))
+        children = [LeafNode("h1", self.title)]
+        if items:
+            children.append(ParentNode("ul", items))
+        links = []
+        if self.prev_url:
+            links.append(LeafNode("a", "Newer", {"href": self.prev_url, "rel": "prev"}))
+        if self.next_url:
+            links.append(LeafNode("a", "Older", {"href": self.next_url, "rel": "next"}))
+        if links:
+            children.append(ParentNode("nav", links))
+        return ParentNode("div", children)
+
+    def __repr__(self):
+        return f"Listing({self.url!r}, {len(self.entries)} entries)"
+
+
+def paginate(base_url, title, entries, per_page=PER_PAGE):
+    """Split entries into Listings at base_url, base_url/page/2/, base_url/page/3/, ..."""
+    chunks = [entries[i:i + per_page] for i in range(0, len(entries), per_page)] or [[]]
+    urls = [base_url] + [f"{base_url}page/{number}/" for number in range(2, len(chunks) + 1)]
+    listings = []
+    for i, chunk in enumerate(chunks):
+        page_title = title if i == 0 else f"{title}, page {i + 1}"
+        prev_url = urls[i - 1] if i > 0 else None
+        next_url = urls[i + 1] if i + 1 < len(urls) else None
+        listings.append(Listing(urls[i], page_title, chunk, prev_url, next_url))
+    return listings
+
+
+def plan_listings(posts, per_page=PER_PAGE, blog_dir=BLOG_DIR):
+    """
+    Every listing page for posts (as returned by collect_posts): the
+    paginated blog index, a page of all tags and a paginated page per tag.
+    Built in one pass over the posts.
+    """
+    entries = []
+    tags = {}
+    for post in posts:
+        entry = (post.url, post.meta["title"] or post.rel_path, post.meta["date"])
+        entries.append(entry)
+        for tag in post.meta["tags"]:
+            name, tagged = tags.setdefault(tag_slug(tag), (tag, []))
+            tagged.append(entry)
+
+    base_url = f"/{blog_dir}/"
+    listings = paginate(base_url, "Blog", entries, per_page)
+    if tags:
+        tag_entries = [
+            (f"{base_url}tags/{slug}/", f"{name} ({len(tagged)})", None)
+            for slug, (name, tagged) in sorted(tags.items())
+        ]
+        listings.append(Listing(f"{base_url}tags/", "Tags", tag_entries))
+    for slug, (name, tagged) in sorted(tags.items()):
+        listings += paginate(f"{base_url}tags/{slug}/", f"Posts tagged {name}", tagged, per_page)
+    return listings
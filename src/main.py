@@ -1,40 +1,166 @@
+import argparse
+import asyncio
 import os
 import shutil
 import sys
-from markdown_parser import extract_title  
-from textnode import markdown_to_html_node 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
+from assets import build_assets
+from compress import compress_outputs, compressed_siblings, print_compression
+from content_index import make_directories, scan_content
+from devserver import serve
+from engine import get_engine
+from highlight import Highlighter, stylesheet
+from feeds import FEED_SIZE, write_feed, write_sitemap
+from listings import collect_posts, plan_listings
+from manifest import BuildManifest, hash_file
+from markdown_parser import FrontMatterError, extract_title, read_page_metadata, split_front_matter
+from page_cache import CacheEntryError, PageCache, parser_version
+from profiling import BuildProfile, PageProfile, count_nodes
+from search import SearchIndex, page_terms
+from template import load_template
+
+MANIFEST_PATH = os.path.join(".cache", "build-manifest.json")
+PAGE_CACHE_DIR = os.path.join(".cache", "pages")
+SEARCH_STATE_PATH = os.path.join(".cache", "search-index.json")
+HIGHLIGHT_CACHE_DIR = os.path.join(".cache", "highlight")
+HIGHLIGHT_CSS = "highlight.css"
+
+class PageBuildError(Exception):
+    """Raised when one or more pages fail to render"""
 
 def generate_page(from_path, template_path, dest_path, basepath="/"):
     """Generate an HTML page from markdown and template"""
     print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    render_page(from_path, template_path, dest_path, basepath)
+
+def read_text(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def parse_page(markdown_content, engine, profile=None):
+    """
+    Parse markdown into (title, body node), timing each phase into profile
+    if given. A front matter title wins over the first H1.
+    """
+    stage = profile.stage if profile else lambda name: nullcontext()
+    metadata, markdown_content = split_front_matter(markdown_content)
+    if profile:
+        before = engine.interner.info() if engine.interner else None
+        with stage("block split"):
+            blocks = engine.split_blocks(markdown_content)
+        with stage("inline parse"):
+            body = engine.blocks_to_html_node(blocks)
+        profile.nodes = count_nodes(body)
+        if before:
+            after = engine.interner.info()
+            profile.interned = (after.hits - before.hits, after.misses - before.misses)
+    else:
+        body = engine.markdown_to_html_node(markdown_content)
+    with stage("title"):
+        title = metadata["title"] or extract_title(markdown_content)
+    return title, body
+
+def page_template(template_path, metadata):
+    """The template a page asked for in its front matter, next to the default one"""
+    if metadata and metadata.get("template"):
+        return os.path.join(os.path.dirname(template_path), metadata["template"])
+    return template_path
+
+def write_page(dest_path, parts):
+    """
+    Write the strings in parts to a temporary file, then move it into place
+    so a failed render never leaves a truncated page
+    """
+    tmp_path = f"{dest_path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(parts)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, dest_path)
+
+def render_page(from_path, template_path, dest_path, basepath="/", cache_dir=None, strict=False,
+                assets=None, highlight_dir=None, index_terms=False, profile=None):
+    """
+    Render one page to dest_path without logging. The directory of dest_path
+    must already exist.
+
+    strict selects the markdown engine mode: unclosed inline delimiters
+    raise instead of being kept as literal text. assets maps asset URLs to
+    fingerprinted ones, applied together with basepath.
+
+    With cache_dir, the parsed body and title are looked up in (and stored
+    to) the persistent page cache. With highlight_dir, fenced code blocks
+    are highlighted, reusing the tokens cached there. With index_terms, the
+    page is parsed even if it is cached and its search terms are taken from
+    the node tree. Returns (cache_hit, terms), terms being None unless
+    index_terms is set.
+
+    The body is streamed into the page file, and into the page cache on a
+    miss. With a PageProfile, each stage is timed separately; serialization
+    and template filling then happen before the write instead of streaming.
+    A cached body found corrupt while streaming is re-parsed and re-cached.
+    """
+    stage = profile.stage if profile else lambda name: nullcontext()
     
     # Read markdown file
-    with open(from_path, 'r', encoding='utf-8') as f:
-        markdown_content = f.read()
-    
-    # Read template file
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_content = f.read()
-    
-    # Convert markdown to HTML and extract title
-    html_node = markdown_to_html_node(markdown_content)
-    html_content = html_node.to_html()
-    title = extract_title(markdown_content)
-    
-    # Replace placeholders in template
-    final_html = template_content.replace("{{ Title }}", title)
-    final_html = final_html.replace("{{ Content }}", html_content)
+    with stage("read"):
+        markdown_content = read_text(from_path)
     
-    # Replace basepath in href and src attributes
-    final_html = final_html.replace('href="/', f'href="{basepath}')
-    final_html = final_html.replace('src="/', f'src="{basepath}')
+    # The template is read and compiled once per process, not once per page
+    template = load_template(template_path, basepath, assets)
     
-    # Create destination directory if it doesn't exist
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    
-    # Write the final HTML to destination
-    with open(dest_path, 'w', encoding='utf-8') as f:
-        f.write(final_html)
+    # Convert markdown to HTML and extract title, unless an earlier build
+    # already did it for this exact markdown and parser version
+    engine = get_engine(strict, highlight_dir, interned=True)
+    cache = PageCache(cache_dir, variant=repr(engine)) if cache_dir else None
+    with stage("cache"):
+        cached = cache.get_body(markdown_content) if cache and not index_terms else None
+    terms = None
+    if cached:
+        title, body = cached
+        try:
+            _write_body(dest_path, template, title, body, stage, profile)
+            return True, terms
+        except CacheEntryError:
+            # The entry was deleted; parse the page and store it afresh
+            cached = None
+    title, body = parse_page(markdown_content, engine, profile)
+    if index_terms:
+        terms = page_terms(body)
+    if cache:
+        if profile:
+            with stage("serialize"):
+                body = body.to_html()
+            with stage("cache"):
+                cache.put(markdown_content, title, body)
+        else:
+            body = cache.recording(markdown_content, title, body)
+    _write_body(dest_path, template, title, body, stage, profile)
+    return False, terms
+
+def _write_body(dest_path, template, title, body, stage, profile):
+    """
+    Fill the template with body and write the page. The body is streamed
+    into the page file without ever holding the whole page in memory,
+    except with a PageProfile, where serialization and template filling
+    are timed separately before the write.
+    """
+    if profile:
+        if not isinstance(body, str):
+            with stage("serialize"):
+                body = body.to_html()
+        with stage("template fill"):
+            parts = [template.render(title, body)]
+    else:
+        parts = template.iter_parts(title, body)
+    with stage("write"):
+        write_page(dest_path, parts)
 
 def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/"):
     """
@@ -42,45 +168,419 @@ def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, bas
     """
     # Ensure destination directory exists
     os.makedirs(dest_dir_path, exist_ok=True)
-    
-    # Walk through content directory
-    for entry in os.listdir(dir_path_content):
-        entry_path = os.path.join(dir_path_content, entry)
-        
-        if os.path.isfile(entry_path) and entry.endswith('.md'):
-            # Generate HTML file path with same structure
-            rel_path = os.path.relpath(entry_path, dir_path_content)
-            dest_path = os.path.join(dest_dir_path, rel_path.replace('.md', '.html'))
-            
-            # Create subdirectories if needed
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-            
-            # Generate the page
-            generate_page(entry_path, template_path, dest_path, basepath)
-            
-        elif os.path.isdir(entry_path):
-            # Recursively process subdirectories
-            sub_dest_dir = os.path.join(dest_dir_path, entry)
-            generate_pages_recursive(entry_path, template_path, sub_dest_dir, basepath)
-
-def main():
-    # Get basepath from command line arguments, default to "/"
-    basepath = "/"
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
-    
-    # Clean docs directory
-    if os.path.exists("docs"):
-        shutil.rmtree("docs")
-    os.makedirs("docs")
-    
-    # Copy static files if they exist
-    if os.path.exists("static"):
-        shutil.copytree("static", "docs", dirs_exist_ok=True)
-    
-    # Generate all pages recursively
-    generate_pages_recursive("content", "template.html", "docs", basepath)
+
+    index = scan_content(dir_path_content, dest_dir_path)
+    index.load_metadata()
+    make_directories(page.dest for page in index)
+    for page in index:
+        if page.meta["draft"]:
+            continue
+        page_template_path = page_template(template_path, page.meta)
+        print(f"Generating page from {page.source} to {page.dest} using {page_template_path}")
+        render_page(page.source, page_template_path, page.dest, basepath)
+
+def _render_job(job, profiled=False):
+    """
+    Worker entry point for render_pages. Returns (error, cache_hit, terms,
+    profile), with an error message naming the source file instead of
+    raising, so a failure in one worker process does not hide failures in
+    the others.
+    """
+    profile = PageProfile(job[0]) if profiled else None
+    try:
+        cache_hit, terms = render_page(*job, profile=profile)
+        return None, cache_hit, terms, profile
+    except Exception as exc:
+        return f"{job[0]}: {type(exc).__name__}: {exc}", False, None, None
+
+def render_pages(jobs, workers=1, build_profile=None):
+    """
+    Render a list of (source, template, dest, basepath, cache_dir, strict,
+    assets, highlight_dir, index_terms) jobs, spreading them across worker
+    processes when workers > 1.
+
+    Log lines are printed in job order regardless of which worker finishes
+    first. Every failing page is reported before PageBuildError is raised.
+    Returns the number of pages served from the page cache and a dict of
+    search terms by source for the jobs with index_terms set. Page timings
+    are added to build_profile when one is given.
+    """
+    profiled = build_profile is not None
+    make_directories(job[2] for job in jobs)
+    if workers > 1 and len(jobs) > 1:
+        workers = min(workers, len(jobs))
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_render_job, jobs, repeat(profiled), chunksize=chunksize))
+    else:
+        results = [_render_job(job, profiled) for job in jobs]
+
+    errors = []
+    cache_hits = 0
+    terms_by_source = {}
+    for job, (error, cache_hit, terms, page_profile) in zip(jobs, results):
+        from_path, template_path, dest_path = job[:3]
+        if error:
+            errors.append(error)
+        else:
+            print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+            cache_hits += cache_hit
+            if terms is not None:
+                terms_by_source[from_path] = terms
+            if page_profile:
+                build_profile.add(page_profile)
+    if errors:
+        raise PageBuildError(f"{len(errors)} page(s) failed to render:\n" + "\n".join(errors))
+    return cache_hits, terms_by_source
+
+async def _render_job_async(job, io_executor, semaphore):
+    """
+    Render one page on the event loop. File and cache I/O run in
+    io_executor; parsing and template filling run on the loop thread,
+    overlapping with other pages' I/O. Returns (error, cache_hit, terms).
+    """
+    (from_path, template_path, dest_path, basepath, cache_dir, strict, assets, highlight_dir,
+     index_terms) = job
+    loop = asyncio.get_running_loop()
+    async with semaphore:
+        try:
+            markdown_content = await loop.run_in_executor(io_executor, read_text, from_path)
+            template = load_template(template_path, basepath, assets)
+            engine = get_engine(strict, highlight_dir, interned=True)
+            cache = PageCache(cache_dir, variant=repr(engine)) if cache_dir else None
+            cached = None
+            if cache and not index_terms:
+                cached = await loop.run_in_executor(io_executor, cache.get, markdown_content)
+            terms = None
+            if cached:
+                title, body = cached
+            else:
+                title, body = parse_page(markdown_content, engine)
+                if index_terms:
+                    terms = page_terms(body)
+                if cache:
+                    body = body.to_html()
+                    await loop.run_in_executor(io_executor, cache.put, markdown_content, title, body)
+            page = template.render(title, body)
+            await loop.run_in_executor(io_executor, write_page, dest_path, [page])
+        except Exception as exc:
+            return f"{from_path}: {type(exc).__name__}: {exc}", False, None
+    return None, cached is not None, terms
+
+async def _render_pages_async(jobs, io_threads):
+    with ThreadPoolExecutor(max_workers=io_threads) as io_executor:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(io_executor, make_directories, [job[2] for job in jobs])
+        # Bound the pages in flight so sources and rendered pages of a huge
+        # tree are not all held in memory at once
+        semaphore = asyncio.Semaphore(io_threads * 2)
+        return await asyncio.gather(*(_render_job_async(job, io_executor, semaphore) for job in jobs))
+
+def render_pages_async(jobs, io_threads=8):
+    """
+    Render the same jobs as render_pages in one process with an asyncio
+    driver: reads and writes go through a pool of io_threads threads and
+    overlap with parsing. Logging, errors and the return value match
+    render_pages.
+    """
+    results = asyncio.run(_render_pages_async(jobs, io_threads))
+    errors = []
+    cache_hits = 0
+    terms_by_source = {}
+    for job, (error, cache_hit, terms) in zip(jobs, results):
+        from_path, template_path, dest_path = job[:3]
+        if error:
+            errors.append(error)
+        else:
+            print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+            cache_hits += cache_hit
+            if terms is not None:
+                terms_by_source[from_path] = terms
+    if errors:
+        raise PageBuildError(f"{len(errors)} page(s) failed to render:\n" + "\n".join(errors))
+    return cache_hits, terms_by_source
+
+def renderer_fingerprint(strict=False, highlight_dir=None):
+    """The parser version and build engine configuration, which decide what HTML a page renders to"""
+    return f"{parser_version()} {get_engine(strict, highlight_dir, interned=True)!r}"
+
+def write_listings(listings, template_path, dest_dir, basepath, old, new, force=False):
+    """
+    Write generated listing pages, skipping those that show the same posts
+    as in the last build. A content page at the same path wins over a
+    listing. Records each listing in the new manifest and returns how many
+    were written.
+    """
+    template = load_template(template_path, basepath, new.asset_map)
+    page_outputs = {entry["dest"] for entry in new.pages.values()}
+    written = 0
+    for listing in listings:
+        dest_path = listing.dest(dest_dir)
+        if dest_path in page_outputs:
+            continue
+        digest = listing.digest()
+        new.listings[dest_path] = digest
+        if not force and old.listings.get(dest_path) == digest and os.path.exists(dest_path):
+            continue
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        write_page(dest_path, template.iter_parts(listing.title, listing.to_html_node()))
+        written += 1
+    return written
+
+def remove_output(dest_path, dest_dir_path):
+    """Delete an output file, its compressed siblings and any directories it leaves empty"""
+    for path in [dest_path] + compressed_siblings(dest_path):
+        if os.path.isfile(path):
+            os.remove(path)
+    directory = os.path.dirname(dest_path)
+    root = os.path.abspath(dest_dir_path)
+    while os.path.abspath(directory).startswith(root + os.sep):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            break
+        directory = os.path.dirname(directory)
+
+def build_site(content_dir, template_path, static_dir, dest_dir, basepath="/",
+               manifest_path=MANIFEST_PATH, incremental=False, workers=1,
+               cache_dir=PAGE_CACHE_DIR, profile=None, strict=False, fingerprint=False,
+               link_assets=False, io_threads=0, drafts=False, blog_per_page=0, site_url=None,
+               feed_size=FEED_SIZE, search=False, search_state_path=SEARCH_STATE_PATH,
+               highlight_dir=None, feed_author=None):
+    """
+    Build the site into dest_dir.
+
+    A full build wipes dest_dir first. An incremental build keeps it and
+    uses the manifest from the previous build to re-render only pages whose
+    markdown changed, copy only changed assets and delete outputs whose
+    source is gone. Changing a template, basepath, asset fingerprints, the
+    parser or the engine options re-renders every page. Both modes write a
+    fresh manifest so the next incremental build has an accurate baseline.
+
+    fingerprint and link_assets are passed to build_assets. Pages marked
+    draft in their front matter are left out unless drafts is set. strict
+    makes unclosed inline delimiters a build error. With blog_per_page, the
+    posts under content/blog/ also get generated index and tag listing pages
+    of that many posts.
+
+    With site_url, sitemap.xml and an Atom feed.xml of the newest feed_size
+    posts are written too; they need absolute URLs. The feed's author is
+    feed_author, else the author in the front matter of content/index.md,
+    else the site title.
+
+    With highlight_dir, fenced code blocks with a language tag are syntax
+    highlighted, their tokens cached in highlight_dir across builds, and the
+    matching stylesheet is written to dest_dir/highlight.css.
+
+    With search, a sharded search index is written to dest_dir/search/. Its
+    state is kept in search_state_path, so only new or changed pages are
+    tokenized, and unchanged pages that were never indexed are rendered once
+    to index them.
+
+    Pages are rendered across `workers` processes once the content tree has
+    been walked and the stale pages are known. Pages whose markdown was
+    parsed by an earlier build are taken from the page cache in cache_dir
+    (pass None to disable it), even when dest_dir was wiped. Per-stage page
+    timings are collected into profile, a BuildProfile, if given. With
+    io_threads, pages are rendered by the asyncio driver instead of worker
+    processes (see render_pages_async), without page profiling.
+    """
+    if incremental:
+        old = BuildManifest.load(manifest_path)
+    else:
+        old = BuildManifest(basepath=None)
+        if os.path.exists(dest_dir):
+            shutil.rmtree(dest_dir)
+    os.makedirs(dest_dir, exist_ok=True)
+
+    new = BuildManifest(basepath=basepath)
+    stats = {"rendered": 0, "cached": 0, "copied": 0, "skipped": 0, "removed": 0, "listings": 0,
+             "search_shards": 0}
+
+    # Publish static files if they exist
+    if os.path.exists(static_dir):
+        stats["copied"], stats["skipped"] = build_assets(static_dir, dest_dir, old, new,
+                                                         fingerprint, link_assets)
+
+    index = scan_content(content_dir, dest_dir)
+    pages = []
+    for page in index:
+        # Pages whose size and mtime are unchanged keep their recorded hash
+        # and metadata without being opened
+        known = old.known_entry("pages", page.source, page.signature) or {}
+        try:
+            page.meta = known.get("meta") or read_page_metadata(page.source)
+        except FrontMatterError as exc:
+            raise PageBuildError(f"{page.source}: {exc}") from None
+        if page.meta["draft"] and not drafts:
+            continue
+        source_hash = known.get("hash") or hash_file(page.source)
+        new.pages[page.source] = {"hash": source_hash, "dest": page.dest,
+                                  "signature": page.signature, "meta": page.meta}
+        pages.append((page, source_hash, page_template(template_path, page.meta)))
+
+    templates = sorted({template_path} | {page_template_path for _, _, page_template_path in pages})
+    missing = [path for path in templates if not os.path.isfile(path)]
+    if missing:
+        raise PageBuildError(f"template(s) not found: {', '.join(missing)}")
+    new.template_hash = "-".join(hash_file(path) for path in templates)
+    new.renderer = renderer_fingerprint(strict, highlight_dir)
+    pages_stale = (
+        old.basepath != new.basepath
+        or old.template_hash != new.template_hash
+        or old.asset_map != new.asset_map
+        or old.renderer != new.renderer
+    )
+
+    if highlight_dir:
+        write_page(os.path.join(dest_dir, HIGHLIGHT_CSS), [stylesheet()])
+
+    search_index = SearchIndex.load(search_state_path) if search else None
+    jobs = []
+    for page, source_hash, page_template_path in pages:
+        index_terms = search_index is not None and not search_index.has(page.source, source_hash)
+        if not pages_stale and not index_terms and old.is_fresh("pages", page.source, source_hash):
+            stats["skipped"] += 1
+            continue
+        jobs.append((page.source, page_template_path, page.dest, basepath, cache_dir, strict,
+                     new.asset_map, highlight_dir, index_terms))
+    if io_threads:
+        stats["cached"], terms_by_source = render_pages_async(jobs, io_threads)
+    else:
+        stats["cached"], terms_by_source = render_pages(jobs, workers, profile)
+    stats["rendered"] += len(jobs)
+
+    if search_index is not None:
+        # Forget removed pages first, so new pages can take over their ids
+        search_index.retain(page.source for page, _, _ in pages)
+        for page, source_hash, _ in pages:
+            search_index.update(page.source, source_hash, page.url, page.meta["title"] or page.rel_path,
+                                terms_by_source.get(page.source))
+        stats["search_shards"] = search_index.write(dest_dir, basepath, force=not incremental)
+        search_index.save(search_state_path)
+
+    if blog_per_page:
+        listings = plan_listings(collect_posts([page for page, _, _ in pages]), blog_per_page)
+        stats["listings"] = write_listings(listings, template_path, dest_dir, basepath, old, new,
+                                           force=pages_stale)
+
+    if site_url:
+        built = [page for page, _, _ in pages]
+        home = next((page.meta for page in built if page.rel_path == "index.md"), {})
+        write_sitemap(built, dest_dir, site_url, basepath,
+                      keep=[entry["dest"] for entry in new.assets.values()])
+        write_feed(built, dest_dir, site_url, basepath, home.get("title") or "Blog", feed_size,
+                   author=feed_author or home.get("author"))
+
+    # Delete outputs whose sources were removed since the last build
+    for dest_path in sorted(old.outputs() - new.outputs()):
+        remove_output(dest_path, dest_dir)
+        stats["removed"] += 1
+
+    new.save(manifest_path)
+    return stats
+
+def print_stats(stats):
+    print(f"Rendered {stats['rendered']} pages ({stats['cached']} from cache), copied {stats['copied']} assets, "
+          f"skipped {stats['skipped']} unchanged, removed {stats['removed']} stale outputs")
+    if stats.get("listings"):
+        print(f"Wrote {stats['listings']} listing pages")
+    if stats.get("search_shards"):
+        print(f"Wrote {stats['search_shards']} search index shards")
+
+def serve_main(argv):
+    """Build once, then serve docs/ and rebuild affected pages on every change"""
+    parser = argparse.ArgumentParser(prog="main.py serve",
+                                     description="Serve docs/ and rebuild when sources change")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--interval", type=float, default=0.5,
+                        help="seconds between polls of content/, static/ and template.html")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes for rendering (0 = one per CPU)")
+    args = parser.parse_args(argv)
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    def rebuild(changed):
+        # The manifest already limits the work to pages whose markdown changed,
+        # assets that changed and outputs whose source was deleted
+        print_stats(build_site("content", "template.html", "static", "docs",
+                               incremental=True, workers=workers))
+
+    serve(rebuild, ["content", "static", "template.html"], "docs", args.port, args.interval)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "serve":
+        return serve_main(argv[1:])
+
+    parser = argparse.ArgumentParser(description="Build the static site into docs/",
+                                     epilog="Run 'main.py serve' for a rebuilding dev server.")
+    parser.add_argument("basepath", nargs="?", default="/",
+                        help="URL prefix for absolute links (default: /)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only rebuild pages and assets that changed since the last build")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes for rendering (0 = one per CPU)")
+    parser.add_argument("--async-io", type=int, metavar="THREADS", default=0,
+                        help="render in one process with asyncio, overlapping parsing with file I/O "
+                             "on THREADS threads; for slow or network disks (replaces -j)")
+    parser.add_argument("--drafts", action="store_true",
+                        help="also build pages marked draft: true in their front matter")
+    parser.add_argument("--blog", type=int, metavar="PER_PAGE", nargs="?", const=10, default=0,
+                        help="generate blog index and tag pages for content/blog/, "
+                             "PER_PAGE posts each (default 10)")
+    parser.add_argument("--site-url", metavar="URL",
+                        help="public origin of the site, e.g. https://example.github.io; "
+                             "enables sitemap.xml and feed.xml")
+    parser.add_argument("--feed-size", type=int, default=FEED_SIZE,
+                        help=f"number of newest posts in feed.xml (default {FEED_SIZE})")
+    parser.add_argument("--feed-author", metavar="NAME",
+                        help="author named in feed.xml (default: author in content/index.md front matter, "
+                             "else the site title)")
+    parser.add_argument("--highlight", action="store_true",
+                        help="syntax highlight fenced code blocks with a language tag (needs pygments); "
+                             f"link {HIGHLIGHT_CSS} from the template for the colors")
+    parser.add_argument("--search", action="store_true",
+                        help="write a client-side search index and its loader to docs/search/")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"parse every page instead of reusing {PAGE_CACHE_DIR}")
+    parser.add_argument("--strict", action="store_true",
+                        help="fail on unclosed **, * or ` instead of keeping them as text")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="name assets after their content hash (index.3f2a9c1b.css) and rewrite references")
+    parser.add_argument("--link-assets", action="store_true",
+                        help="hardlink static files into docs/ instead of copying them where possible")
+    parser.add_argument("--compress", action="store_true",
+                        help="write precompressed .gz (and .br/.zst if available) copies of text outputs")
+    parser.add_argument("--stats", action="store_true",
+                        help="time every build stage and print totals and the slowest pages")
+    parser.add_argument("--profile", metavar="TRACE_JSON",
+                        help="like --stats, and also write a trace viewable in chrome://tracing or Perfetto")
+    args = parser.parse_args(argv)
+    workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    profile = BuildProfile() if args.stats or args.profile else None
+    if args.highlight and not Highlighter.available():
+        sys.exit("--highlight needs pygments: pip install pygments")
+
+    try:
+        stats = build_site("content", "template.html", "static", "docs", args.basepath,
+                           incremental=args.incremental, workers=workers,
+                           cache_dir=None if args.no_cache else PAGE_CACHE_DIR, profile=profile,
+                           strict=args.strict, fingerprint=args.fingerprint,
+                           link_assets=args.link_assets, io_threads=args.async_io,
+                           drafts=args.drafts, blog_per_page=args.blog, site_url=args.site_url,
+                           feed_size=args.feed_size, feed_author=args.feed_author, search=args.search,
+                           highlight_dir=HIGHLIGHT_CACHE_DIR if args.highlight else None)
+    except PageBuildError as exc:
+        sys.exit(f"Build failed: {exc}")
+    print_stats(stats)
+    if args.compress:
+        print_compression(compress_outputs("docs", workers))
+    if profile:
+        profile.report()
+        if args.profile:
+            profile.write_trace(args.profile)
+            print(f"Wrote trace to {args.profile}")
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+
+
+def hash_file(path):
+    """Return the sha256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_signature(path):
+    """(size, mtime_ns) of a file: cheap to read, and changes whenever the file is written"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class BuildManifest:
+    """
+    Record of the inputs that produced each file in the output directory.
+
+    Pages and assets are keyed by source path and map to
+    {"hash": <sha256 of the source>, "dest": <output path>, "signature":
+    <file_signature of the source>}; the signature lets unchanged files
+    skip hashing on the next build. Page entries also keep the page's
+    front matter metadata, so unchanged pages need not be opened at all.
+    Generated listing pages are keyed by output path and map to a hash of
+    what they show. The template hash, basepath, fingerprinted asset map
+    and renderer (the parser version and engine configuration) are stored
+    too, since changing any of them affects every rendered page.
+    """
+
+    def __init__(self, basepath="/", template_hash=None, pages=None, assets=None, asset_map=None,
+                 listings=None, renderer=None):
+        self.basepath = basepath
+        self.template_hash = template_hash
+        self.renderer = renderer
+        self.pages = pages if pages is not None else {}
+        self.assets = assets if assets is not None else {}
+        self.asset_map = asset_map if asset_map is not None else {}
+        self.listings = listings if listings is not None else {}
+
+    @classmethod
+    def load(cls, path):
+        """Load a manifest, returning an empty one if it is missing or unreadable"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(basepath=None)
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls(basepath=None)
+        return cls(
+            basepath=data.get("basepath"),
+            template_hash=data.get("template"),
+            pages=data.get("pages") or {},
+            assets=data.get("assets") or {},
+            asset_map=data.get("asset_map") or {},
+            listings=data.get("listings") or {},
+            renderer=data.get("renderer"),
+        )
+
+    def save(self, path):
+        """Write the manifest atomically so an interrupted build never leaves half a file"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "basepath": self.basepath,
+            "template": self.template_hash,
+            "pages": self.pages,
+            "assets": self.assets,
+            "asset_map": self.asset_map,
+            "listings": self.listings,
+            "renderer": self.renderer,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def is_fresh(self, section, source, source_hash, dest=None):
+        """
+        True if source was built from the same content and its output still
+        exists (at dest, when given)
+        """
+        entry = getattr(self, section).get(source)
+        return (
+            entry is not None
+            and entry.get("hash") == source_hash
+            and (dest is None or entry.get("dest") == dest)
+            and os.path.exists(entry.get("dest", ""))
+        )
+
+    def known_entry(self, section, source, signature):
+        """The recorded entry for source if its file_signature is unchanged, else None"""
+        entry = getattr(self, section).get(source)
+        if entry is not None and entry.get("signature") == signature:
+            return entry
+        return None
+
+    def known_hash(self, section, source, signature):
+        """The recorded hash of source if its file_signature is unchanged, else None"""
+        entry = self.known_entry(section, source, signature)
+        return entry.get("hash") if entry else None
+
+    def outputs(self):
+        """All output paths recorded in the manifest"""
+        return {entry["dest"] for entry in self.pages.values()} | {
+            entry["dest"] for entry in self.assets.values()
+        } | set(self.listings)
+
+    def __repr__(self):
+        return f"BuildManifest({self.basepath!r}, {len(self.pages)} pages, {len(self.assets)} assets)"
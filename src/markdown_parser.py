@@ -1,3 +1,6 @@
+from datetime import date
+
+
 def extract_title(markdown):
     """Extract the H1 header from markdown text"""
     if not markdown:
@@ -8,4 +11,111 @@ def extract_title(markdown):
         if line.strip().startswith('# '):
             return line.strip()[2:].strip()
             
-    raise ValueError("No H1 header (# title) found in markdown") 
\ No newline at end of file
+    raise ValueError("No H1 header (# title) found in markdown")
+
+
+FRONT_MATTER_DELIMITER = "---"
+
+# Every page's metadata has these keys, whether or not it has front matter
+FRONT_MATTER_DEFAULTS = {"title": None, "date": None, "tags": [], "draft": False, "template": None}
+
+
+class FrontMatterError(ValueError):
+    """Raised for a front matter block that cannot be parsed"""
+
+
+def default_metadata():
+    return {**FRONT_MATTER_DEFAULTS, "tags": []}
+
+
+def _parse_value(key, value):
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        value = value[1:-1]
+    if key == "tags":
+        if value.startswith("[") and value.endswith("]"):
+            value = value[1:-1]
+        return [tag.strip().strip("\"'") for tag in value.split(",") if tag.strip()]
+    if key == "draft":
+        lowered = value.lower()
+        if lowered in ("true", "yes"):
+            return True
+        if lowered in ("false", "no", ""):
+            return False
+        raise FrontMatterError(f"draft must be true or false, got {value!r}")
+    if key in ("date", "updated"):
+        try:
+            return date.fromisoformat(value).isoformat()
+        except ValueError:
+            raise FrontMatterError(f"{key} must be YYYY-MM-DD, got {value!r}") from None
+    return value
+
+
+def parse_front_matter(text):
+    """
+    Parse the inside of a front matter block: one "key: value" per line.
+
+    Only the flat subset of YAML that page headers need is supported: tags
+    is a comma separated list (optionally in brackets), draft a boolean,
+    and date and updated ISO dates, kept as their "YYYY-MM-DD" strings.
+    Blank lines and lines starting with # are ignored.
+    """
+    metadata = default_metadata()
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        key, sep, value = line.partition(":")
+        if not sep or not key.strip():
+            raise FrontMatterError(f"line {number}: expected 'key: value', got {line!r}")
+        key = key.strip().lower()
+        metadata[key] = _parse_value(key, value.strip())
+    return metadata
+
+
+def split_front_matter(markdown):
+    """
+    Split markdown into (metadata, body). Front matter is a block at the
+    very start of the file between two --- lines; without one, metadata
+    holds only the defaults and body is the whole text.
+    """
+    first, newline, rest = markdown.partition("\n")
+    if first.rstrip() != FRONT_MATTER_DELIMITER or not newline:
+        return default_metadata(), markdown
+    lines = rest.split("\n")
+    for i, line in enumerate(lines):
+        if line.rstrip() == FRONT_MATTER_DELIMITER:
+            return parse_front_matter("\n".join(lines[:i])), "\n".join(lines[i + 1:])
+    raise FrontMatterError("front matter is not closed with ---")
+
+
+def read_page_metadata(path):
+    """
+    Read a page's metadata without reading its body.
+
+    Only the front matter block is read, and when it sets no title, lines
+    up to the first H1 (usually the next one), which is enough for index
+    pages, feeds and draft filtering across thousands of posts.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.readline()
+        if first.rstrip() == FRONT_MATTER_DELIMITER:
+            header = []
+            for line in f:
+                if line.rstrip() == FRONT_MATTER_DELIMITER:
+                    break
+                header.append(line)
+            else:
+                raise FrontMatterError("front matter is not closed with ---")
+            metadata = parse_front_matter("".join(header))
+            first = ""
+        else:
+            metadata = default_metadata()
+        if not metadata["title"]:
+            line = first or f.readline()
+            while line:
+                if line.strip().startswith('# '):
+                    metadata["title"] = line.strip()[2:].strip()
+                    break
+                line = f.readline()
+    return metadata
+
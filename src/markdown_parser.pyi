@@ -1 +1,12 @@
-def extract_title(markdown: str) -> str: ... 
\ No newline at end of file
+from typing import Any, Dict, Tuple
+
+FRONT_MATTER_DELIMITER: str
+FRONT_MATTER_DEFAULTS: Dict[str, Any]
+
+class FrontMatterError(ValueError): ...
+
+def extract_title(markdown: str) -> str: ...
+def default_metadata() -> Dict[str, Any]: ...
+def parse_front_matter(text: str) -> Dict[str, Any]: ...
+def split_front_matter(markdown: str) -> Tuple[Dict[str, Any], str]: ...
+def read_page_metadata(path: str) -> Dict[str, Any]: ...
\ No newline at end of file
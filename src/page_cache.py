@@ -0,0 +1,244 @@
+import codecs
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+# Bump when the cached entry layout changes
+CACHE_FORMAT = 3
+# Bytes read at a time when streaming a cached body back
+READ_SIZE = 1 << 16
+
+# Modules whose code decides what HTML a markdown file turns into; the
+# build manifest also uses the fingerprint, so template.py is included
+PARSER_MODULES = ("htmlnode.py", "textnode.py", "engine.py", "highlight.py", "markdown_parser.py",
+                  "template.py")
+
+
+@lru_cache(maxsize=1)
+def parser_version():
+    """
+    Fingerprint of the parser: the cache format plus a hash of the parser
+    sources, so editing the parser invalidates every cached page without
+    anyone having to remember to bump a number.
+    """
+    digest = hashlib.sha256(f"format {CACHE_FORMAT}".encode())
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in PARSER_MODULES:
+        with open(os.path.join(src_dir, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class CacheEntryError(Exception):
+    """Raised while streaming a cached body that turns out to be corrupt"""
+
+
+class CachedBody:
+    """
+    A page body stored in the cache. Like an HTML node it has iter_html(),
+    which streams the body back from disk in chunks that end at a tag
+    boundary, so the page template can rewrite URLs chunk by chunk.
+
+    The bytes are checked against the entry's trailer as they stream. A
+    body that cannot be read or decoded, or does not match its digest,
+    has its entry deleted and raises CacheEntryError once streamed.
+    """
+
+    def __init__(self, path, offset, length, digest):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.digest = digest
+
+    def iter_html(self):
+        try:
+            yield from self._iter_checked()
+        except (OSError, UnicodeDecodeError, CacheEntryError) as exc:
+            _discard(self.path)
+            raise CacheEntryError(f"corrupt page cache entry {self.path}: {exc}") from exc
+
+    def _iter_checked(self):
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        digest = hashlib.sha256()
+        remaining = self.length
+        rest = ""
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            while remaining:
+                data = f.read(min(READ_SIZE, remaining))
+                if not data:
+                    raise CacheEntryError("body is shorter than recorded")
+                remaining -= len(data)
+                digest.update(data)
+                chunk = rest + decoder.decode(data)
+                cut = chunk.rfind(">") + 1
+                rest = chunk[cut:]
+                if cut:
+                    yield chunk[:cut]
+        rest += decoder.decode(b"", final=True)
+        if digest.hexdigest() != self.digest:
+            raise CacheEntryError("body does not match its digest")
+        if rest:
+            yield rest
+
+    def to_html(self):
+        return "".join(self.iter_html())
+
+    def __repr__(self):
+        return f"CachedBody({self.path!r})"
+
+
+class RecordingBody:
+    """
+    Wraps a body node so that streaming it with iter_html() also writes it
+    into a cache entry. The entry is moved into place only once the whole
+    body has been streamed; an interrupted render leaves no entry behind.
+    """
+
+    def __init__(self, cache, markdown, title, body):
+        self.cache = cache
+        self.markdown = markdown
+        self.title = title
+        self.body = body
+
+    def iter_html(self):
+        key = self.cache.key(self.markdown)
+        path = self.cache._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique temp name: parallel workers may store the same page at once
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        stored = False
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_header(key, self.title))
+                digest = hashlib.sha256()
+                length = 0
+                for chunk in self.body.iter_html():
+                    data = chunk.encode('utf-8')
+                    digest.update(data)
+                    length += len(data)
+                    f.write(data)
+                    yield chunk
+                f.write(_trailer(length, digest.hexdigest()))
+            os.replace(tmp_path, path)
+            stored = True
+        finally:
+            if not stored:
+                _discard(tmp_path)
+
+    def to_html(self):
+        return "".join(self.iter_html())
+
+    def __repr__(self):
+        return f"RecordingBody({self.body!r})"
+
+
+def _header(key, title):
+    return (json.dumps({"key": key, "title": title}) + "\n").encode('utf-8')
+
+
+def _trailer(length, digest):
+    return f"\n{length:020d} {digest}\n".encode('ascii')
+
+
+# A newline, the body length in bytes, a space, its sha256 and a newline
+TRAILER_SIZE = len(_trailer(0, "0" * 64))
+
+
+def _discard(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class PageCache:
+    """
+    On-disk cache of rendered page bodies, shared between builds.
+
+    Entries are keyed by a hash of the markdown text, the parser version
+    and the variant (the engine configuration). Each entry is a JSON
+    header line with the key and the page title, the raw HTML body, and a
+    trailer line with the body's length and sha256, so a body can be
+    stored while it is streamed to its page and streamed back, checked,
+    without loading it whole. The cache lives outside the
+    output directory, so wiping docs/ does not invalidate it. Unreadable
+    or mismatched entries are treated as misses and overwritten.
+    """
+
+    def __init__(self, directory, variant=""):
+        self.directory = directory
+        self.variant = variant
+
+    def key(self, markdown):
+        digest = hashlib.sha256(parser_version().encode())
+        digest.update(b"\0")
+        digest.update(self.variant.encode('utf-8'))
+        digest.update(b"\0")
+        digest.update(markdown.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.html")
+
+    def get_body(self, markdown):
+        """
+        Return (title, CachedBody) for markdown, or None on a miss. The
+        entry's size must match the body length in its trailer; the body
+        itself is checked while it streams.
+        """
+        key = self.key(markdown)
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                header_line = f.readline()
+                header = json.loads(header_line)
+                size = os.fstat(f.fileno()).st_size
+                f.seek(max(size - TRAILER_SIZE, 0))
+                trailer = f.read().decode('ascii')
+        except (OSError, ValueError):
+            return None
+        length, _, digest = trailer[1:-1].partition(" ")
+        if (
+            not isinstance(header, dict)
+            or header.get("key") != key
+            or not isinstance(header.get("title"), str)
+            or len(trailer) != TRAILER_SIZE
+            or not length.isdigit()
+            or len(digest) != 64
+            or int(length) == 0
+            or len(header_line) + int(length) + TRAILER_SIZE != size
+        ):
+            return None
+        return header["title"], CachedBody(path, len(header_line), int(length), digest)
+
+    def get(self, markdown):
+        """Return (title, html) for markdown, or None on a miss"""
+        cached = self.get_body(markdown)
+        if cached is None:
+            return None
+        title, body = cached
+        try:
+            return title, body.to_html()
+        except CacheEntryError:
+            return None
+
+    def put(self, markdown, title, html):
+        key = self.key(markdown)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        data = html.encode('utf-8')
+        with open(tmp_path, 'wb') as f:
+            f.write(_header(key, title))
+            f.write(data)
+            f.write(_trailer(len(data), hashlib.sha256(data).hexdigest()))
+        os.replace(tmp_path, path)
+
+    def recording(self, markdown, title, body):
+        """body wrapped so that streaming it stores it in the cache as well"""
+        return RecordingBody(self, markdown, title, body)
+
+    def __repr__(self):
+        return f"PageCache({self.directory!r}, variant={self.variant!r})"
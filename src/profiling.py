@@ -0,0 +1,120 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# Stages in the order render_page runs them
+STAGES = ("read", "cache", "block split", "inline parse", "title", "serialize", "template fill", "write")
+
+
+class PageProfile:
+    """
+    Timings for one page. Plain data, so worker processes can send it back
+    to the parent.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pid = os.getpid()
+        self.nodes = 0
+        # (hits, misses) of the engine's LeafInterner while parsing
+        self.interned = (0, 0)
+        # (stage, start, duration) with perf_counter timestamps in seconds
+        self.events = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append((name, start, time.perf_counter() - start))
+
+    @property
+    def total(self):
+        return sum(duration for _, _, duration in self.events)
+
+    def stage_totals(self):
+        totals = {}
+        for name, _, duration in self.events:
+            totals[name] = totals.get(name, 0.0) + duration
+        return totals
+
+    def __repr__(self):
+        return f"PageProfile({self.path!r}, {self.total * 1000:.2f}ms, {self.nodes} nodes)"
+
+
+def count_nodes(node):
+    """Number of HTML nodes in a tree, counted without recursion"""
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.children:
+            stack.extend(node.children)
+    return count
+
+
+class BuildProfile:
+    """Collects PageProfiles for a build and reports on them"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.pages = []
+
+    def add(self, page):
+        self.pages.append(page)
+
+    def report(self, top=10):
+        """Print per-stage totals and the slowest pages"""
+        totals = {}
+        for page in self.pages:
+            for name, duration in page.stage_totals().items():
+                totals[name] = totals.get(name, 0.0) + duration
+        grand_total = sum(totals.values()) or 1.0
+        nodes = sum(page.nodes for page in self.pages)
+
+        print(f"Profiled {len(self.pages)} pages, {nodes} nodes created")
+        print(f"{'stage':<16}{'total ms':>12}{'share':>8}")
+        for name in STAGES:
+            if name in totals:
+                print(f"{name:<16}{totals[name] * 1000:>12.2f}{totals[name] / grand_total:>8.1%}")
+        print(f"{'total':<16}{grand_total * 1000:>12.2f}")
+        hits = sum(page.interned[0] for page in self.pages)
+        misses = sum(page.interned[1] for page in self.pages)
+        if hits or misses:
+            print(f"Interned spans: {hits} shared, {misses} created ({hits / (hits + misses):.1%} reused)")
+
+        slowest = sorted(self.pages, key=lambda page: page.total, reverse=True)[:top]
+        if slowest:
+            print(f"Slowest {len(slowest)} pages:")
+            for page in slowest:
+                stage_name, duration = max(page.stage_totals().items(), key=lambda item: item[1])
+                print(f"{page.total * 1000:>10.2f}ms  {page.nodes:>7} nodes  {page.path}"
+                      f"  (mostly {stage_name}: {duration * 1000:.2f}ms)")
+
+    def write_trace(self, path):
+        """
+        Export the stage timings in the Trace Event Format, which loads in
+        chrome://tracing and Perfetto. Each worker process gets its own
+        track; timestamps are microseconds since the start of the build.
+        """
+        events = []
+        for page in self.pages:
+            for name, start, duration in page.events:
+                events.append({
+                    "name": name,
+                    "cat": "page",
+                    "ph": "X",
+                    "ts": round((start - self.start) * 1e6, 3),
+                    "dur": round(duration * 1e6, 3),
+                    "pid": 1,
+                    "tid": page.pid,
+                    "args": {"page": page.path},
+                })
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def __repr__(self):
+        return f"BuildProfile({len(self.pages)} pages)"
@@ -0,0 +1,101 @@
+// Client for the search index written by search.py.
+//
+// Loads search/meta.json once, then only the shards holding the query's
+// terms, each at most once per page view. Every word of the query must
+// match; the last one also matches as a prefix, so results update while
+// typing. Usage:
+//
+//   <script src="/search/search.js"></script>
+//   siteSearch("glorfindel balrog").then(results => ...)
+//
+// Each result is {url, title, score}, best first.
+(function () {
+  "use strict";
+
+  var root = new URL(".", document.currentScript.src);
+  var meta = null;
+  var shards = {};
+
+  function fetchJson(name) {
+    return fetch(new URL(name, root)).then(function (response) {
+      if (!response.ok) {
+        throw new Error("search: could not load " + name);
+      }
+      return response.json();
+    });
+  }
+
+  function loadMeta() {
+    if (!meta) {
+      meta = fetchJson("meta.json");
+    }
+    return meta;
+  }
+
+  function loadShard(index, prefix) {
+    var name = index.shards[prefix];
+    if (!name) {
+      return Promise.resolve({});
+    }
+    if (!shards[prefix]) {
+      shards[prefix] = fetchJson(name);
+    }
+    return shards[prefix];
+  }
+
+  // Lowercased like search.py's page_terms, which uses str.lower
+  function tokenize(query) {
+    return (query.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || []).filter(function (token) {
+      return token.length > 1;
+    });
+  }
+
+  // {id: count} for one query term; a prefix term sums every term it starts
+  function postings(shard, term, prefix) {
+    var scores = {};
+    Object.keys(shard).forEach(function (candidate) {
+      if (candidate === term || (prefix && candidate.lastIndexOf(term, 0) === 0)) {
+        shard[candidate].forEach(function (posting) {
+          scores[posting[0]] = (scores[posting[0]] || 0) + posting[1];
+        });
+      }
+    });
+    return scores;
+  }
+
+  window.siteSearch = function (query) {
+    var terms = tokenize(query);
+    if (!terms.length) {
+      return Promise.resolve([]);
+    }
+    return loadMeta().then(function (index) {
+      return Promise.all(terms.map(function (term) {
+        return loadShard(index, term.slice(0, index.prefix));
+      })).then(function (loaded) {
+        var total = null;
+        terms.forEach(function (term, i) {
+          var scores = postings(loaded[i], term, i === terms.length - 1);
+          if (total === null) {
+            total = scores;
+            return;
+          }
+          Object.keys(total).forEach(function (id) {
+            if (id in scores) {
+              total[id] += scores[id];
+            } else {
+              delete total[id];
+            }
+          });
+        });
+        return Object.keys(total).filter(function (id) {
+          return index.pages[id];
+        }).map(function (id) {
+          var page = index.pages[id];
+          return {url: page[0], title: page[1], score: total[id]};
+        }).sort(function (a, b) {
+          return b.score - a.score;
+        });
+      });
+    });
+  };
+})();
@@ -0,0 +1,178 @@
+import hashlib
+import heapq
+import json
+import os
+import re
+import shutil
+from collections import Counter
+
+SEARCH_VERSION = 2
+# Shards are keyed by the first PREFIX_LENGTH characters of each term
+PREFIX_LENGTH = 2
+TOKEN_PATTERN = re.compile(r"\w+")
+SHARD_NAME_PATTERN = re.compile(r"[a-z0-9_]+")
+LOADER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "search.js")
+
+
+def node_text(node):
+    """Yield the text of an HTML node tree, leaf by leaf, without recursion or serializing"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.children:
+            stack.extend(reversed(node.children))
+            continue
+        if node.value:
+            yield node.value
+        if node.props and node.props.get("alt"):
+            yield node.props["alt"]
+
+
+def page_terms(node):
+    """
+    {term: count} for the words of a rendered page; terms are lowercased
+    with str.lower, which matches the client's toLowerCase, and one letter
+    words are dropped
+    """
+    terms = Counter()
+    for text in node_text(node):
+        terms.update(token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1)
+    return dict(terms)
+
+
+def shard_name(prefix):
+    """File name of a shard: the prefix itself when it is plain ASCII, else its hex"""
+    if SHARD_NAME_PATTERN.fullmatch(prefix):
+        return f"{prefix}.json"
+    return f"x{prefix.encode('utf-8').hex()}.json"
+
+
+class SearchIndex:
+    """
+    Inverted index of the built pages, kept between builds.
+
+    Each page has a stable numeric id, so adding or removing a page only
+    changes the shards holding its terms. The ids of removed pages are
+    handed to the next new pages, so the page list does not grow with
+    every page ever built. write() turns the index into
+    docs/search/: meta.json with the page list and the shard table, and
+    one JSON shard per term prefix mapping sorted terms to [id, count]
+    postings. Shards whose content is unchanged are not rewritten.
+    """
+
+    def __init__(self, docs=None, shards=None, next_id=0):
+        # source path -> {"id", "hash", "url", "title", "terms"}
+        self.docs = docs if docs is not None else {}
+        # shard prefix -> digest of the last written content
+        self.shards = shards if shards is not None else {}
+        self.next_id = next_id
+        # Ids below next_id not held by any page, lowest first; built on demand
+        self._free_ids = None
+
+    @classmethod
+    def load(cls, path):
+        """Load saved state, or an empty index if it is missing or unreadable"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get("version") != SEARCH_VERSION:
+            return cls()
+        return cls(data.get("docs") or {}, data.get("shards") or {}, data.get("next_id") or 0)
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": SEARCH_VERSION, "docs": self.docs, "shards": self.shards,
+                       "next_id": self.next_id}, f)
+        os.replace(tmp_path, path)
+
+    def has(self, source, source_hash):
+        """True if the terms of source at this content hash are already indexed"""
+        doc = self.docs.get(source)
+        return doc is not None and doc["hash"] == source_hash
+
+    def update(self, source, source_hash, url, title, terms=None):
+        """Record a page; terms=None keeps the terms indexed for it before"""
+        doc = self.docs.get(source)
+        if doc is None:
+            doc = self.docs[source] = {"id": self._new_id(), "terms": {}}
+        doc.update(hash=source_hash, url=url, title=title)
+        if terms is not None:
+            doc["terms"] = terms
+
+    def retain(self, sources):
+        """Forget every page not in sources"""
+        for source in set(self.docs) - set(sources):
+            del self.docs[source]
+        self.next_id = max((doc["id"] for doc in self.docs.values()), default=-1) + 1
+        self._free_ids = None
+
+    def _new_id(self):
+        if self._free_ids is None:
+            used = {doc["id"] for doc in self.docs.values()}
+            self._free_ids = [i for i in range(self.next_id) if i not in used]
+            heapq.heapify(self._free_ids)
+        if self._free_ids:
+            return heapq.heappop(self._free_ids)
+        self.next_id += 1
+        return self.next_id - 1
+
+    def _postings(self):
+        shards = {}
+        for doc in self.docs.values():
+            for term, count in doc["terms"].items():
+                shard = shards.setdefault(term[:PREFIX_LENGTH], {})
+                shard.setdefault(term, []).append([doc["id"], count])
+        return shards
+
+    def write(self, dest_dir, basepath="/", force=False):
+        """Write docs/search/ and return the number of shard files written"""
+        search_dir = os.path.join(dest_dir, "search")
+        os.makedirs(search_dir, exist_ok=True)
+        shards = self._postings()
+        written = 0
+        digests = {}
+        for prefix, postings in shards.items():
+            content = json.dumps({term: sorted(postings[term]) for term in sorted(postings)},
+                                 separators=(",", ":"), ensure_ascii=False)
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            digests[prefix] = digest
+            path = os.path.join(search_dir, shard_name(prefix))
+            if not force and self.shards.get(prefix) == digest and os.path.exists(path):
+                continue
+            _write_text(path, content)
+            written += 1
+        for prefix in set(self.shards) - set(digests):
+            path = os.path.join(search_dir, shard_name(prefix))
+            if os.path.exists(path):
+                os.remove(path)
+        self.shards = digests
+
+        # Ids are stable, so ids not reused yet stay as null slots in the page list
+        pages = [None] * self.next_id
+        for doc in self.docs.values():
+            pages[doc["id"]] = [basepath + doc["url"][1:], doc["title"]]
+        meta = {
+            "prefix": PREFIX_LENGTH,
+            "pages": pages,
+            "shards": {prefix: shard_name(prefix) for prefix in sorted(digests)},
+        }
+        _write_text(os.path.join(search_dir, "meta.json"),
+                    json.dumps(meta, separators=(",", ":"), ensure_ascii=False))
+        shutil.copyfile(LOADER_PATH, os.path.join(search_dir, "search.js"))
+        return written
+
+    def __repr__(self):
+        return f"SearchIndex({len(self.docs)} pages, {len(self.shards)} shards)"
+
+
+def _write_text(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
@@ -0,0 +1,107 @@
+import os
+import re
+from functools import lru_cache
+
+from htmlnode import escape_text
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{ (Title|Content) \}\}")
+# The path of a root-relative URL, without any query string or fragment
+ASSET_URL_PATTERN = re.compile(r'(href|src)="(/[^"?#]*)')
+
+
+def rewrite_root_urls(html, basepath="/", assets=None):
+    """
+    Prefix every root-relative href/src attribute in html with basepath.
+
+    assets maps root-relative asset URLs to their fingerprinted names, e.g.
+    {"/index.css": "/index.3f2a9c1b.css"}; matching URLs are replaced first.
+    """
+    if not html:
+        return html
+    if assets:
+        def replace(match):
+            url = match.group(2)
+            return f'{match.group(1)}="{basepath}{assets.get(url, url)[1:]}'
+        return ASSET_URL_PATTERN.sub(replace, html)
+    if basepath == "/":
+        return html
+    # Two C-level replaces beat a regex substitution with a callback per match
+    return html.replace('href="/', f'href="{basepath}').replace('src="/', f'src="{basepath}')
+
+
+class Template:
+    """
+    A page template compiled for one basepath and asset map.
+
+    The template's own href/src URLs are rewritten once at compile time and
+    the text is split into literal fragments around the {{ Title }} and
+    {{ Content }} placeholders, so rendering a page is a single join.
+    """
+
+    def __init__(self, source, basepath="/", assets=None):
+        self.basepath = basepath
+        self.assets = assets or None
+        pieces = PLACEHOLDER_PATTERN.split(rewrite_root_urls(source, basepath, self.assets))
+        # re.split with one group alternates literal text and placeholder names
+        self.fragments = pieces[0::2]
+        self.slots = pieces[1::2]
+
+    @classmethod
+    def from_file(cls, path, basepath="/", assets=None):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read(), basepath, assets)
+
+    def iter_parts(self, title, content):
+        """
+        Yield the page as alternating template fragments and filled
+        placeholders.
+
+        content is either an HTML string or a node with iter_html(), in
+        which case its fragments are streamed through without joining them
+        first.
+        """
+        basepath, assets = self.basepath, self.assets
+        # The title is plain text, like the heading it usually comes from
+        title = escape_text(title)
+        yield self.fragments[0]
+        for slot, fragment in zip(self.slots, self.fragments[1:]):
+            if slot == "Title":
+                yield title
+            elif isinstance(content, str):
+                yield rewrite_root_urls(content, basepath, assets)
+            elif basepath == "/" and not assets:
+                yield from content.iter_html()
+            else:
+                # Most fragments are text or bare tags; only those holding a
+                # root-relative attribute go through the rewrite
+                for chunk in content.iter_html():
+                    if '="/' in chunk:
+                        chunk = rewrite_root_urls(chunk, basepath, assets)
+                    yield chunk
+            yield fragment
+
+    def render(self, title, content):
+        return "".join(self.iter_parts(title, content))
+
+    def write(self, fp, title, content):
+        """Stream the rendered page into a file-like object"""
+        fp.writelines(self.iter_parts(title, content))
+
+    def __repr__(self):
+        return f"Template({self.slots!r}, basepath={self.basepath!r})"
+
+
+@lru_cache(maxsize=8)
+def _load_template(path, basepath, asset_items, mtime_ns, size):
+    return Template.from_file(path, basepath, dict(asset_items))
+
+
+def load_template(path, basepath="/", assets=None):
+    """
+    Return the compiled template for path, reading the file only once per
+    process. The file's mtime and size are part of the cache key, so an
+    edited template is picked up by long-running processes.
+    """
+    stat = os.stat(path)
+    asset_items = tuple(sorted(assets.items())) if assets else ()
+    return _load_template(path, basepath, asset_items, stat.st_mtime_ns, stat.st_size)
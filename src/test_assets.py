@@ -0,0 +1,74 @@
+import os
+import unittest
+
+from assets import build_assets, fingerprint_path, publish, url_path
+from manifest import BuildManifest
+from test_support import TempTreeTestCase
+
+
+class TestAssets(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.static = os.path.join(self.root, "static")
+        self.docs = os.path.join(self.root, "docs")
+        self.write("static/index.css", "body {}")
+        self.write("static/images/a.png", "png")
+
+    def build(self, old, **kwargs):
+        new = BuildManifest()
+        return new, build_assets(self.static, self.docs, old, new, **kwargs)
+
+    def test_fingerprint_path(self):
+        self.assertEqual(fingerprint_path("index.css", "3f2a9c1b77"), "index.3f2a9c1b.css")
+        self.assertEqual(fingerprint_path(os.path.join("a", "LICENSE"), "abcdef0123"),
+                         os.path.join("a", "LICENSE.abcdef01"))
+
+    def test_url_path(self):
+        self.assertEqual(url_path(os.path.join("images", "a.png")), "/images/a.png")
+
+    def test_unchanged_files_are_skipped_without_hashing(self):
+        first, counts = self.build(BuildManifest(basepath=None))
+        self.assertEqual(counts, (2, 0))
+        src_path = os.path.join(self.static, "index.css")
+        # A bogus recorded hash with a matching signature is trusted as is
+        first.assets[src_path]["hash"] = "not-a-real-hash"
+        second, counts = self.build(first)
+        self.assertEqual(counts, (0, 2))
+        self.assertEqual(second.assets[src_path]["hash"], "not-a-real-hash")
+
+    def test_changed_file_is_copied(self):
+        first, _ = self.build(BuildManifest(basepath=None))
+        self.write("static/index.css", "body { color: red }")
+        _, counts = self.build(first)
+        self.assertEqual(counts, (1, 1))
+        with open(os.path.join(self.docs, "index.css")) as f:
+            self.assertEqual(f.read(), "body { color: red }")
+
+    def test_fingerprinted_names_and_map(self):
+        new, _ = self.build(BuildManifest(basepath=None), fingerprint=True)
+        fingerprinted = new.asset_map["/index.css"]
+        self.assertRegex(fingerprinted, r"^/index\.[0-9a-f]{8}\.css$")
+        self.assertTrue(os.path.exists(os.path.join(self.docs, fingerprinted[1:])))
+        self.assertIn("/images/a.png", new.asset_map)
+
+    def test_toggling_fingerprint_republishes(self):
+        first, _ = self.build(BuildManifest(basepath=None))
+        _, counts = self.build(first, fingerprint=True)
+        self.assertEqual(counts, (2, 0))
+
+    def test_publish_link_falls_back_to_copy(self):
+        src_path = os.path.join(self.static, "index.css")
+        dest_path = os.path.join(self.docs, "index.css")
+        linked = publish(src_path, dest_path, link=True)
+        if linked:
+            self.assertTrue(os.path.samefile(src_path, dest_path))
+        # Publishing again over a link must not write through to the source
+        publish(src_path, dest_path)
+        self.assertFalse(os.path.samefile(src_path, dest_path))
+        with open(src_path) as f:
+            self.assertEqual(f.read(), "body {}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import gzip
+import os
+import unittest
+
+from compress import collect_compressible, compress_outputs, compressed_siblings
+from test_support import TempTreeTestCase
+
+BIG = "<p>" + "hobbit " * 400 + "</p>"
+
+
+class TestCompress(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.docs = self.root
+        self.write("index.html", BIG)
+        self.write("blog/post.html", BIG)
+        self.write("small.css", "body {}")
+        self.write("image.png", BIG)
+
+    def exists(self, rel_path):
+        return os.path.exists(os.path.join(self.docs, rel_path))
+
+    def test_text_outputs_above_threshold_are_compressed(self):
+        totals = compress_outputs(self.docs, suffixes=[".gz"])
+        self.assertEqual(totals[".gz"]["written"], 2)
+        self.assertLess(totals[".gz"]["bytes_out"], totals[".gz"]["bytes_in"])
+        with gzip.open(os.path.join(self.docs, "index.html.gz"), 'rt') as f:
+            self.assertEqual(f.read(), BIG)
+        self.assertFalse(self.exists("small.css.gz"))
+        self.assertFalse(self.exists("image.png.gz"))
+
+    def test_up_to_date_outputs_are_skipped(self):
+        compress_outputs(self.docs, suffixes=[".gz"])
+        path = self.write("index.html", BIG + "<p>more</p>")
+        os.utime(path, ns=(0, 1))
+        totals = compress_outputs(self.docs, suffixes=[".gz"])
+        self.assertEqual(totals[".gz"]["written"], 1)
+        self.assertEqual(totals[".gz"]["fresh"], 1)
+        with gzip.open(path + ".gz", 'rt') as f:
+            self.assertEqual(f.read(), BIG + "<p>more</p>")
+
+    def test_parallel_matches_serial(self):
+        compress_outputs(self.docs, workers=2, suffixes=[".gz"])
+        with open(os.path.join(self.docs, "blog", "post.html.gz"), 'rb') as f:
+            parallel = f.read()
+        self.assertEqual(parallel, gzip.compress(BIG.encode(), compresslevel=9, mtime=0))
+
+    def test_orphaned_siblings_are_removed(self):
+        compress_outputs(self.docs, suffixes=[".gz"])
+        os.remove(os.path.join(self.docs, "index.html"))
+        self.write("archive.tar.gz", "not ours")
+        self.assertNotIn(os.path.join(self.docs, "index.html"), collect_compressible(self.docs))
+        self.assertFalse(self.exists("index.html.gz"))
+        self.assertTrue(self.exists("archive.tar.gz"))
+
+    def test_compressed_siblings(self):
+        self.assertIn("a.html.gz", compressed_siblings("a.html"))
+        self.assertEqual(compressed_siblings("a.png"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import unittest
+
+from content_index import ContentIndex, PageEntry, make_directories, scan_content
+from test_support import TempTreeTestCase
+
+
+class TestContentIndex(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.docs = os.path.join(self.root, "docs")
+        for rel_path in ("index.md", "b/index.md", "a.md", "c/d/index.md", "c/notes.txt", "b/z.md"):
+            self.write(f"content/{rel_path}", "# Page")
+
+    def test_order_and_paths(self):
+        index = scan_content(self.content, self.docs)
+        self.assertEqual([page.rel_path for page in index],
+                         ["a.md", "b/index.md", "b/z.md", "c/d/index.md", "index.md"])
+        page = index.pages[3]
+        self.assertEqual(page.source, os.path.join(self.content, "c", "d", "index.md"))
+        self.assertEqual(page.dest, os.path.join(self.docs, "c", "d", "index.html"))
+        self.assertEqual(page.size, len("# Page"))
+
+    def test_urls(self):
+        urls = [page.url for page in scan_content(self.content, self.docs)]
+        self.assertEqual(urls, ["/a.html", "/b/", "/b/z.html", "/c/d/", "/"])
+
+    def test_round_trips_through_json(self):
+        index = scan_content(self.content, self.docs)
+        restored = ContentIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+        self.assertEqual(restored.pages, index.pages)
+        self.assertEqual(restored.dest_dir, self.docs)
+
+    def test_deep_tree_does_not_recurse(self):
+        # Deeper than the default recursion limit; created with mkdir since
+        # os.makedirs itself recurses per level
+        path = self.content
+        for _ in range(1100):
+            path = os.path.join(path, "d")
+            os.mkdir(path)
+        with open(os.path.join(path, "index.md"), 'w') as f:
+            f.write("# Deep")
+        try:
+            index = scan_content(self.content, self.docs)
+            self.assertEqual(len(index), 6)
+            self.assertEqual(index.pages[-2].url, "/d" * 1100 + "/")
+        finally:
+            # shutil.rmtree recurses too, so take the tree down by hand
+            os.remove(os.path.join(path, "index.md"))
+            while path != self.content:
+                os.rmdir(path)
+                path = os.path.dirname(path)
+
+    def test_make_directories(self):
+        page = PageEntry("s", os.path.join(self.docs, "x", "y", "index.html"), "x/y/index.md", 0, 0)
+        make_directories([page.dest, os.path.join(self.docs, "x", "y", "other.html")])
+        self.assertTrue(os.path.isdir(os.path.join(self.docs, "x", "y")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+import urllib.request
+from contextlib import redirect_stdout
+from http.server import SimpleHTTPRequestHandler
+from io import StringIO
+from unittest import mock
+
+from devserver import Watcher, serve, snapshot, start_server
+from test_support import TempTreeTestCase
+
+
+class TestWatcher(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.page = self.write("content/index.md", "x")
+        self.template = self.write("template.html", "x")
+
+    def test_snapshot_accepts_files_and_directories(self):
+        state = snapshot([self.content, self.template, os.path.join(self.root, "missing")])
+        self.assertEqual(set(state), {self.page, self.template})
+
+    def test_poll_reports_added_modified_and_removed(self):
+        watcher = Watcher([self.content, self.template])
+        self.assertEqual(watcher.poll(), set())
+
+        new_page = self.write("content/new.md", "new")
+        self.write("template.html", "changed")
+        self.assertEqual(watcher.poll(), {new_page, self.template})
+
+        os.remove(self.page)
+        self.assertEqual(watcher.poll(), {self.page})
+        self.assertEqual(watcher.poll(), set())
+
+    def test_wait_for_changes_debounces_a_burst(self):
+        watcher = Watcher([self.content], interval=0.01, debounce=0.1)
+
+        def edit():
+            for i in range(3):
+                with open(os.path.join(self.content, f"{i}.md"), 'w') as f:
+                    f.write("x")
+                time.sleep(0.03)
+
+        thread = threading.Thread(target=edit)
+        thread.start()
+        changed = watcher.wait_for_changes()
+        thread.join()
+        self.assertEqual(len(changed), 3)
+
+    def test_wait_for_changes_stops(self):
+        watcher = Watcher([self.content], interval=0.01)
+        stop = threading.Event()
+        stop.set()
+        self.assertEqual(watcher.wait_for_changes(stop), set())
+
+
+class TestServe(unittest.TestCase):
+
+    def test_failed_first_build_keeps_serving_and_sees_edits_made_during_it(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            page = os.path.join(tmp, "index.md")
+            calls = []
+
+            def rebuild(changed):
+                calls.append(changed)
+                if changed is None:
+                    with open(page, 'w') as f:
+                        f.write("saved during the first build")
+                    raise ValueError("bad page")
+                raise KeyboardInterrupt
+
+            out = StringIO()
+            with mock.patch("devserver.start_server") as start, redirect_stdout(out):
+                start.return_value.server_address = ("", 0)
+                serve(rebuild, [tmp], tmp, interval=0.01)
+            self.assertEqual(calls, [None, {page}])
+            self.assertIn("Rebuild failed: bad page", out.getvalue())
+            start.return_value.shutdown.assert_called_once()
+
+
+class TestServer(unittest.TestCase):
+
+    # Keep the handler's request log out of the test output
+    @mock.patch.object(SimpleHTTPRequestHandler, "log_message")
+    def test_serves_directory(self, log_message):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "index.html"), 'w') as f:
+                f.write("<p>hi</p>")
+            server = start_server(tmp, port=0)
+            try:
+                url = f"http://127.0.0.1:{server.server_address[1]}/"
+                with urllib.request.urlopen(url) as response:
+                    self.assertEqual(response.read(), b"<p>hi</p>")
+            finally:
+                server.shutdown()
+                server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
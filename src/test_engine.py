@@ -0,0 +1,247 @@
+import io
+import unittest
+
+from engine import (
+    LENIENT_ENGINE,
+    STRICT_ENGINE,
+    block_type_code,
+    block_type_heading,
+    block_type_paragraph,
+    get_engine,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    scan_blocks,
+)
+
+# Markdown and the HTML both engines produce for it. Outputs were recorded
+# from the old utils.markdown_to_html_node, which the unified engine follows
+# block for block; the old textnode engine is only consulted below.
+CORPUS = {
+    "paragraph": (
+        "Just **bold**, *italic* and `code` text.",
+        "<div><p>Just <b>bold</b>, <i>italic</i> and <code>code</code> text.</p></div>",
+    ),
+    "multiline_paragraph": (
+        "First line\nsecond line with a [link](https://a.dev)",
+        '<div><p>First line second line with a <a href="https://a.dev">link</a></p></div>',
+    ),
+    "heading": (
+        "## A heading with **bold**",
+        "<div><h2>A heading with <b>bold</b></h2></div>",
+    ),
+    "heading_levels": (
+        "# One\n\n###### Six",
+        "<div><h1>One</h1><h6>Six</h6></div>",
+    ),
+    "quote": (
+        "> first line\n> second *line*",
+        "<div><blockquote>first line second <i>line</i></blockquote></div>",
+    ),
+    "ulist_star": (
+        "* one\n* **two**\n* three",
+        "<div><ul><li>one</li><li><b>two</b></li><li>three</li></ul></div>",
+    ),
+    "ulist_dash": (
+        "- one\n- two",
+        "<div><ul><li>one</li><li>two</li></ul></div>",
+    ),
+    "olist": (
+        "1. first\n2. second `x`\n3. third",
+        "<div><ol><li>first</li><li>second <code>x</code></li><li>third</li></ol></div>",
+    ),
+    "mixed_doc": (
+        "# Title\n\nParagraph with *it*.\n\n* a\n* b\n\n> quoted\n\n```\ncode\n```",
+        "<div><h1>Title</h1><p>Paragraph with <i>it</i>.</p><ul><li>a</li><li>b</li></ul>"
+        "<blockquote>quoted</blockquote><pre><code>code\n</code></pre></div>",
+    ),
+    "extra_blank_lines": (
+        "para one\n\n\n\npara two",
+        "<div><p>para one</p><p>para two</p></div>",
+    ),
+    # utils raised here (LeafNode("img", "")); the textnode output is kept
+    "image": (
+        "An image ![alt text](https://img.dev/a.png) here",
+        '<div><p>An image <img src="https://img.dev/a.png" alt="alt text"> </img> here</p></div>',
+    ),
+    "link_and_image": (
+        "[link](/a) and ![img](/b.png)",
+        '<div><p><a href="/a">link</a> and <img src="/b.png" alt="img"> </img></p></div>',
+    ),
+    "empty_alt_image": (
+        "![](/images/tom.png)",
+        '<div><p><img src="/images/tom.png" alt=""> </img></p></div>',
+    ),
+    "empty_url_link": (
+        "[text]()",
+        '<div><p><a href="#">text</a></p></div>',
+    ),
+    # Text and attributes used to be written out unescaped
+    "escaping": (
+        'Tom & Jerry <3 [a "quote"](/q?a=1&b=2)\n\n```\nif a < b:\n```',
+        '<div><p>Tom &amp; Jerry &lt;3 <a href="/q?a=1&amp;b=2">a "quote"</a></p>'
+        "<pre><code>if a &lt; b:\n</code></pre></div>",
+    ),
+    # Code shows character references as written; prose keeps them as entities
+    "code_ampersands": (
+        "Prose &amp; `&amp;`\n\n```\n&lt;\n```",
+        "<div><p>Prose &amp; <code>&amp;amp;</code></p><pre><code>&amp;lt;\n</code></pre></div>",
+    ),
+    # utils ran inline parsing over code; code is now literal
+    "code": (
+        "```\nprint('**not bold**')\nx = 1\n```",
+        "<div><pre><code>print('**not bold**')\nx = 1\n</code></pre></div>",
+    ),
+}
+
+# What the old textnode engine, used by the build, produced where it
+# disagreed with the corpus. Each of these is a deliberate change.
+TEXTNODE_DIVERGENCES = {
+    "multiline_paragraph": '<div><p>First linesecond line with a <a href="https://a.dev">link</a></p></div>',
+    "heading": "<div><h2>A heading with **bold**</h2></div>",
+    "quote": "<div><blockquote>first line</blockquote><blockquote>second <i>line</i></blockquote></div>",
+    "ulist_star": "<div><li>one</li><li><b>two</b></li><li>three</li></div>",
+    "ulist_dash": "<div><p>- one- two</p></div>",
+    "olist": "<div><li>first</li><li>second <code>x</code></li><li>third</li></div>",
+    "mixed_doc": "<div><h1>Title</h1><p>Paragraph with <i>it</i>.</p><li>a</li><li>b</li>"
+                 "<blockquote>quoted</blockquote><pre><code>code</code></pre></div>",
+    "code": "<div><pre><code>print('**not bold**')\nx = 1</code></pre></div>",
+}
+
+# Where strict mode differs from the corpus: its image and link patterns
+# need a non-empty alt and URL. An exception type means it raises.
+STRICT_DIVERGENCES = {
+    "empty_alt_image": ValueError,
+    "empty_url_link": "<div><p>[text]()</p></div>",
+}
+
+
+class TestConformance(unittest.TestCase):
+    def test_strict_corpus(self):
+        for name, (markdown, expected) in CORPUS.items():
+            expected = STRICT_DIVERGENCES.get(name, expected)
+            with self.subTest(name):
+                if isinstance(expected, type):
+                    with self.assertRaises(expected):
+                        STRICT_ENGINE.markdown_to_html_node(markdown).to_html()
+                else:
+                    self.assertEqual(STRICT_ENGINE.markdown_to_html_node(markdown).to_html(), expected)
+
+    def test_lenient_corpus(self):
+        for name, (markdown, expected) in CORPUS.items():
+            with self.subTest(name):
+                self.assertEqual(LENIENT_ENGINE.markdown_to_html_node(markdown).to_html(), expected)
+
+    def test_divergences_are_documented_cases(self):
+        self.assertLessEqual(TEXTNODE_DIVERGENCES.keys(), CORPUS.keys())
+        for name, old in TEXTNODE_DIVERGENCES.items():
+            with self.subTest(name):
+                self.assertNotEqual(CORPUS[name][1], old)
+
+    def test_two_phase_matches_one_shot(self):
+        for name, (markdown, expected) in CORPUS.items():
+            with self.subTest(name):
+                blocks = LENIENT_ENGINE.split_blocks(markdown)
+                self.assertEqual(LENIENT_ENGINE.blocks_to_html_node(blocks).to_html(), expected)
+
+
+class TestModes(unittest.TestCase):
+    def test_strict_raises_on_unclosed_delimiter(self):
+        with self.assertRaises(ValueError):
+            STRICT_ENGINE.markdown_to_html_node("an unclosed `code span")
+
+    def test_lenient_keeps_unclosed_delimiter(self):
+        node = LENIENT_ENGINE.markdown_to_html_node("an unclosed `code span")
+        self.assertEqual(node.to_html(), "<div><p>an unclosed `code span</p></div>")
+
+    def test_get_engine(self):
+        self.assertIs(get_engine(True), STRICT_ENGINE)
+        self.assertIs(get_engine(False), LENIENT_ENGINE)
+        self.assertIs(get_engine(), LENIENT_ENGINE)
+
+    def test_interned_engine_matches_corpus(self):
+        engine = get_engine(interned=True)
+        self.assertIsNot(engine, LENIENT_ENGINE)
+        self.assertIs(get_engine(interned=True), engine)
+        for name, (markdown, expected) in CORPUS.items():
+            with self.subTest(name):
+                self.assertEqual(engine.markdown_to_html_node(markdown).to_html(), expected)
+        self.assertIsNone(LENIENT_ENGINE.interner)
+
+    def test_module_function_is_lenient(self):
+        self.assertEqual(
+            markdown_to_html_node("a *b").to_html(),
+            "<div><p>a *b</p></div>",
+        )
+        with self.assertRaises(ValueError):
+            markdown_to_html_node("a *b", strict=True)
+
+    def test_split_blocks(self):
+        blocks = STRICT_ENGINE.split_blocks("# Title\n\n```\ncode\n```\n\n\n\ntext")
+        self.assertEqual(
+            [(block.block_type, block.text) for block in blocks],
+            [
+                (block_type_heading, "# Title"),
+                (block_type_code, "```\ncode\n```"),
+                (block_type_paragraph, "text"),
+            ],
+        )
+        self.assertEqual([(block.start, block.end) for block in blocks], [(0, 1), (2, 5), (8, 9)])
+
+
+def split_on_blank_lines(markdown):
+    """The block splitter scan_blocks replaced, for comparison"""
+    return [block.strip() for block in markdown.split("\n\n") if block.strip()]
+
+
+class TestScanBlocks(unittest.TestCase):
+    def test_matches_blank_line_split(self):
+        documents = [
+            "\n  # Heading  \n\n\n\npara\nmore\n",
+            "a\n \nb\n\n  \n\nc",
+            "  \n\t\n  * one\n* two  \n  \n\n1. x\n2. y",
+            "> a\n> b\n\n> c\nd",
+            "",
+            "\n\n\n",
+        ]
+        for markdown in documents:
+            with self.subTest(markdown):
+                self.assertEqual(markdown_to_blocks(markdown), split_on_blank_lines(markdown))
+
+    def test_fence_keeps_blank_lines(self):
+        markdown = "```python\ndef f():\n\n\n    return 1\n```\nafter"
+        blocks = list(scan_blocks(markdown))
+        self.assertEqual([block.block_type for block in blocks], [block_type_code, block_type_paragraph])
+        self.assertEqual((blocks[0].start, blocks[0].end), (0, 6))
+        html = LENIENT_ENGINE.markdown_to_html_node(markdown).to_html()
+        self.assertEqual(html, "<div><pre><code>def f():\n\n\n    return 1\n</code></pre><p>after</p></div>")
+
+    def test_unclosed_fence_runs_to_the_end(self):
+        html = LENIENT_ENGINE.markdown_to_html_node("```\na\n\n**b**\n\n").to_html()
+        self.assertEqual(html, "<div><pre><code>a\n\n**b**\n</code></pre></div>")
+
+    def test_fence_that_cannot_close_is_code(self):
+        html = LENIENT_ENGINE.markdown_to_html_node("```\na\n```x").to_html()
+        self.assertEqual(html, "<div><pre><code>a\n```x\n</code></pre></div>")
+        with self.assertRaises(ValueError):
+            STRICT_ENGINE.markdown_to_html_node("```\na\n```x")
+
+    def test_empty_fence(self):
+        for markdown in ("```\n```", "```py\n```"):
+            with self.subTest(markdown):
+                html = LENIENT_ENGINE.markdown_to_html_node(markdown).to_html()
+                self.assertEqual(html, "<div><pre><code></code></pre></div>")
+
+    def test_inline_triple_backticks_are_not_a_fence(self):
+        blocks = list(scan_blocks("```code```\n\ntext"))
+        self.assertEqual([block.block_type for block in blocks], [block_type_paragraph] * 2)
+
+    def test_streams_a_file(self):
+        markdown = "# Title\n\nSome *text*\n\n```\nx\n\ny\n```\n"
+        expected = LENIENT_ENGINE.markdown_to_html_node(markdown).to_html()
+        self.assertEqual(LENIENT_ENGINE.markdown_to_html_node(io.StringIO(markdown)).to_html(), expected)
+        lines = iter(markdown.split("\n"))
+        self.assertEqual(LENIENT_ENGINE.markdown_to_html_node(lines).to_html(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
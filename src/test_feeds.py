@@ -0,0 +1,100 @@
+import os
+import unittest
+import xml.etree.ElementTree as ET
+
+from content_index import PageEntry
+from feeds import ATOM_NS, SITEMAP_NS, absolute_url, lastmod, newest_posts, write_feed, write_sitemap
+from markdown_parser import default_metadata
+from test_support import TempTreeTestCase
+
+SITE = "https://example.org"
+
+
+def page(rel_path, title=None, date=None, mtime_ns=0):
+    meta = default_metadata()
+    meta.update(title=title, date=date)
+    return PageEntry(rel_path, rel_path, rel_path, 0, mtime_ns, meta)
+
+
+class TestFeeds(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.docs = self.root
+
+    def parse(self, name):
+        return ET.parse(os.path.join(self.docs, name)).getroot()
+
+    def test_absolute_url_matches_basepath_rewriting(self):
+        self.assertEqual(absolute_url(SITE + "/", "/static-website/", "/blog/tom/"),
+                         "https://example.org/static-website/blog/tom/")
+        self.assertEqual(absolute_url(SITE, "/", "/"), "https://example.org/")
+
+    def test_lastmod_prefers_front_matter(self):
+        self.assertEqual(lastmod(page("a.md", date="2024-01-05", mtime_ns=10**18)), "2024-01-05")
+        self.assertEqual(lastmod(page("a.md", mtime_ns=86400 * 10**9)), "1970-01-02")
+
+    def test_sitemap(self):
+        count = write_sitemap([page("index.md"), page("blog/a/index.md", date="2024-01-05")],
+                              self.docs, SITE, "/site/")
+        self.assertEqual(count, 2)
+        root = self.parse("sitemap.xml")
+        self.assertEqual(root.tag, f"{{{SITEMAP_NS}}}urlset")
+        locs = [element.text for element in root.iter(f"{{{SITEMAP_NS}}}loc")]
+        self.assertEqual(locs, ["https://example.org/site/", "https://example.org/site/blog/a/"])
+
+    def test_sitemap_index_past_limit(self):
+        pages = [page(f"p{i}.md") for i in range(5)]
+        write_sitemap(pages, self.docs, SITE, limit=2)
+        root = self.parse("sitemap.xml")
+        self.assertEqual(root.tag, f"{{{SITEMAP_NS}}}sitemapindex")
+        self.assertEqual(len(root), 3)
+        self.assertEqual(len(self.parse("sitemap-3.xml")), 1)
+        # A smaller site later drops the numbered parts again
+        write_sitemap(pages[:1], self.docs, SITE, limit=2)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "sitemap-1.xml")))
+        self.assertEqual(self.parse("sitemap.xml").tag, f"{{{SITEMAP_NS}}}urlset")
+
+    def test_sitemap_keeps_files_it_did_not_write(self):
+        published = [os.path.join(self.docs, name) for name in ("sitemap-news.xml", "sitemap-9.xml")]
+        for path in published:
+            with open(path, 'w') as f:
+                f.write("<urlset/>")
+        write_sitemap([page("index.md")], self.docs, SITE, keep=published[1:])
+        self.assertTrue(all(os.path.exists(path) for path in published))
+
+    def test_newest_posts(self):
+        pages = [page("index.md", date="2030-01-01")] + [
+            page(f"blog/p{i}/index.md", date=f"2024-01-{i + 1:02d}") for i in range(9)
+        ]
+        newest = newest_posts(pages, count=3)
+        self.assertEqual([post.rel_path for post in newest],
+                         ["blog/p8/index.md", "blog/p7/index.md", "blog/p6/index.md"])
+
+    def test_feed(self):
+        pages = [page("blog/a/index.md", 'A & "B"', "2024-01-05"), page("blog/b/index.md", "B", "2024-01-06")]
+        self.assertEqual(write_feed(pages, self.docs, SITE, "/site/", "Site", count=1), 1)
+        root = self.parse("feed.xml")
+        entries = root.findall(f"{{{ATOM_NS}}}entry")
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].find(f"{{{ATOM_NS}}}id").text, "https://example.org/site/blog/b/")
+        self.assertEqual(root.find(f"{{{ATOM_NS}}}updated").text, "2024-01-06T00:00:00Z")
+        write_feed(pages, self.docs, SITE, count=5)
+        titles = [entry.find(f"{{{ATOM_NS}}}title").text for entry in self.parse("feed.xml").iter(f"{{{ATOM_NS}}}entry")]
+        self.assertEqual(titles, ["B", 'A & "B"'])
+
+    def test_feed_authors(self):
+        pages = [page("blog/a/index.md", "A", "2024-01-05"), page("blog/b/index.md", "B", "2024-01-06")]
+        pages[0].meta["author"] = "Ann"
+        write_feed(pages, self.docs, SITE, title="Site")
+        root = self.parse("feed.xml")
+        self.assertEqual(root.find(f"{{{ATOM_NS}}}author/{{{ATOM_NS}}}name").text, "Site")
+        authors = [entry.findtext(f"{{{ATOM_NS}}}author/{{{ATOM_NS}}}name")
+                   for entry in root.iter(f"{{{ATOM_NS}}}entry")]
+        self.assertEqual(authors, [None, "Ann"])
+        write_feed(pages, self.docs, SITE, title="Site", author="Bo & Co")
+        self.assertEqual(self.parse("feed.xml").find(f"{{{ATOM_NS}}}author/{{{ATOM_NS}}}name").text, "Bo & Co")
+
+
+if __name__ == "__main__":
+    unittest.main()
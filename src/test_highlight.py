@@ -0,0 +1,79 @@
+import os
+import unittest
+from unittest import mock
+
+import highlight
+from engine import MarkdownEngine
+from highlight import Highlighter, fence_language
+from test_support import TempTreeTestCase
+
+CODE_BLOCK = "```python\nx = 1  # **not bold**\n```"
+
+
+@unittest.skipUnless(Highlighter.available(), "pygments is not installed")
+class TestHighlight(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = self.root
+
+    def test_fence_language(self):
+        self.assertEqual(fence_language("```Python"), "python")
+        self.assertEqual(fence_language("``` js {.wide}"), "js")
+        self.assertEqual(fence_language("```"), "")
+
+    def test_highlighted_block(self):
+        engine = MarkdownEngine(highlighter=Highlighter())
+        html = engine.markdown_to_html_node(CODE_BLOCK).to_html()
+        self.assertTrue(html.startswith('<div><pre class="highlight"><code class="language-python">'))
+        self.assertIn('<span class="o">=</span>', html)
+        # Code never goes through inline parsing
+        self.assertIn('<span class="c1"># **not bold**</span>', html)
+
+    def test_highlighted_code_escapes_every_ampersand(self):
+        engine = MarkdownEngine(highlighter=Highlighter())
+        html = engine.markdown_to_html_node('```python\ns = "&lt;"\n```').to_html()
+        self.assertIn("&amp;lt;", html)
+        self.assertNotIn('"&lt;"', html)
+
+    def test_unknown_or_missing_language_stays_plain(self):
+        engine = MarkdownEngine(highlighter=Highlighter())
+        for fence in ("```", "```no-such-language"):
+            html = engine.markdown_to_html_node(f"{fence}\nx = 1\n```").to_html()
+            self.assertEqual(html, "<div><pre><code>x = 1\n</code></pre></div>")
+
+    def test_tokens_are_cached_on_disk(self):
+        runs = Highlighter(self.directory).runs("python", "x = 1\n")
+        with mock.patch.object(highlight, "tokenize") as tokenize:
+            self.assertEqual(Highlighter(self.directory).runs("python", "x = 1\n"), runs)
+        tokenize.assert_not_called()
+
+    def test_tokens_are_memoized(self):
+        highlighter = Highlighter()
+        highlighter.runs("python", "x = 1\n")
+        with mock.patch.object(highlight, "tokenize") as tokenize:
+            highlighter.runs("python", "x = 1\n")
+        tokenize.assert_not_called()
+
+    def test_memo_is_bounded(self):
+        highlighter = Highlighter(maxsize=2)
+        for code in ("a = 1\n", "b = 2\n", "a = 1\n", "c = 3\n"):
+            highlighter.runs("python", code)
+        with mock.patch.object(highlight, "tokenize", return_value=[]) as tokenize:
+            highlighter.runs("python", "a = 1\n")
+            tokenize.assert_not_called()
+            highlighter.runs("python", "b = 2\n")
+            tokenize.assert_called_once()
+        self.assertEqual(len(highlighter._memo), 2)
+
+    def test_corrupt_entry_is_retokenized(self):
+        runs = Highlighter(self.directory).runs("python", "x = 1\n")
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                with open(os.path.join(root, name), 'w') as f:
+                    f.write("{")
+        self.assertEqual(Highlighter(self.directory).runs("python", "x = 1\n"), runs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,17 @@
+import io
+import pickle
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from htmlnode import (
+    CodeLeafNode,
+    FrozenCodeLeafNode,
+    FrozenLeafNode,
+    HTMLNode,
+    LeafNode,
+    ParentNode,
+    escape_text,
+    render_attributes,
+)
 
 class TestHTMLNode(unittest.TestCase):
 
@@ -28,6 +39,12 @@ class TestHTMLNode(unittest.TestCase):
         expected_repr = "HTMLNode('a', 'Click me', None, {'href': 'https://example.com'})"
         self.assertEqual(repr(node), expected_repr)
 
+    def test_nodes_have_no_instance_dict(self):
+        for node in (HTMLNode("p"), LeafNode("b", "x"), ParentNode("p", [LeafNode(None, "x")])):
+            self.assertFalse(hasattr(node, "__dict__"))
+            with self.assertRaises(AttributeError):
+                node.extra = 1
+
 class TestLeafNode(unittest.TestCase):
 
     def test_initialization(self):
@@ -110,6 +127,97 @@ class TestParentNode(unittest.TestCase):
             node.to_html()
         self.assertTrue("all parent nodes must have children" in str(context.exception))
 
+class TestStreamingHTML(unittest.TestCase):
+
+    def test_iter_html_matches_to_html(self):
+        node = ParentNode(
+            "div",
+            [
+                ParentNode("p", [LeafNode("b", "Bold"), LeafNode(None, "text")]),
+                LeafNode("a", "Link", {"href": "https://example.com"}),
+                ParentNode("ul", [ParentNode("li", [LeafNode(None, "one")])]),
+            ],
+            {"class": "container"}
+        )
+        self.assertEqual("".join(node.iter_html()), node.to_html())
+
+    def test_leaf_iter_html(self):
+        node = LeafNode("i", "x")
+        self.assertEqual(list(node.iter_html()), ["<i>x</i>"])
+
+    def test_write_html(self):
+        node = ParentNode("p", [LeafNode(None, "Hello "), LeafNode("b", "world")])
+        buffer = io.StringIO()
+        node.write_html(buffer)
+        self.assertEqual(buffer.getvalue(), "<p>Hello <b>world</b></p>")
+
+    def test_deep_tree_does_not_recurse(self):
+        node = LeafNode(None, "deep")
+        for _ in range(5000):
+            node = ParentNode("span", [node])
+        html = "".join(node.iter_html())
+        self.assertTrue(html.startswith("<span>" * 5000 + "deep"))
+        self.assertTrue(html.endswith("</span>" * 5000))
+
+    def test_iter_html_validates_nested_parents(self):
+        node = ParentNode("div", [LeafNode(None, "ok"), ParentNode("p", [])])
+        with self.assertRaises(ValueError):
+            list(node.iter_html())
+
+
+
+class TestFrozenLeafNode(unittest.TestCase):
+    def test_renders_like_a_leaf(self):
+        node = FrozenLeafNode("a", "link", {"href": "/x"})
+        self.assertEqual(node.to_html(), LeafNode("a", "link", {"href": "/x"}).to_html())
+        self.assertIs(node.to_html(), node.to_html())
+
+    def test_is_immutable(self):
+        node = FrozenLeafNode("b", "bold")
+        with self.assertRaises(AttributeError):
+            node.value = "changed"
+        with self.assertRaises(AttributeError):
+            del node.tag
+        with self.assertRaises(TypeError):
+            FrozenLeafNode("a", "x", {"href": "/x"}).props["href"] = "/y"
+
+    def test_pickles(self):
+        node = pickle.loads(pickle.dumps(FrozenLeafNode("a", "link", {"href": "/x"})))
+        self.assertEqual(node.to_html(), '<a href="/x">link</a>')
+
+
+class TestEscaping(unittest.TestCase):
+    def test_attributes_are_single_spaced_and_escaped(self):
+        node = LeafNode("a", "x", {"href": '/q?a=1&b="2"', "title": "<t>"})
+        self.assertEqual(node.to_html(), '<a href="/q?a=1&amp;b=&quot;2&quot;" title="&lt;t&gt;">x</a>')
+
+    def test_text_is_escaped(self):
+        self.assertEqual(LeafNode("b", "a < b & c").to_html(), "<b>a &lt; b &amp; c</b>")
+        self.assertEqual(LeafNode(None, "<script>").to_html(), "&lt;script&gt;")
+        self.assertEqual(escape_text('plain "quotes"'), 'plain "quotes"')
+
+    def test_character_references_are_not_escaped_again(self):
+        self.assertEqual(escape_text("&copy; &amp; &#169; &#xA9;"), "&copy; &amp; &#169; &#xA9;")
+        self.assertEqual(escape_text("Q&A &bogus; &#; &"), "Q&amp;A &amp;bogus; &amp;#; &amp;")
+        self.assertEqual(LeafNode("a", "x", {"href": "/q?a=1&amp;b=2&c=3"}).to_html(),
+                         '<a href="/q?a=1&amp;b=2&amp;c=3">x</a>')
+
+    def test_code_escapes_character_references_too(self):
+        self.assertEqual(CodeLeafNode("code", "&copy; &amp; <b>").to_html(), "<code>&amp;copy; &amp;amp; &lt;b&gt;</code>")
+        self.assertEqual(CodeLeafNode(None, "a && b").to_html(), "a &amp;&amp; b")
+        frozen = pickle.loads(pickle.dumps(FrozenCodeLeafNode("code", "&lt;")))
+        self.assertEqual(frozen.to_html(), "<code>&amp;lt;</code>")
+
+    def test_unhashable_prop_values_render_uncached(self):
+        node = LeafNode("a", "x", {"href": "/x", "data-tags": ["a", "b"]})
+        self.assertEqual(node.to_html(), '<a href="/x" data-tags="[\'a\', \'b\']">x</a>')
+
+    def test_attributes_are_memoized_per_props(self):
+        render_attributes.cache_clear()
+        for _ in range(3):
+            ParentNode("p", [LeafNode(None, "x")], {"class": "note"}).to_html()
+        self.assertEqual(render_attributes.cache_info().hits, 2)
+
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,99 @@
+import random
+import unittest
+
+import textnode
+import utils
+from textnode import TextNode, TextType, scan_inline, STRICT_INLINE, LENIENT_INLINE
+
+
+def chained_strict(text):
+    """The multi-pass pipeline utils.text_to_textnodes used before scan_inline"""
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = utils.split_nodes_image(nodes)
+    nodes = utils.split_nodes_link(nodes)
+    nodes = utils.split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = utils.split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+    return utils.split_nodes_delimiter(nodes, "`", TextType.CODE)
+
+
+def chained_lenient(text):
+    """The multi-pass pipeline textnode.text_to_textnodes used before scan_inline"""
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = textnode.split_nodes_image(nodes)
+    nodes = textnode.split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = textnode.split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+    nodes = textnode.split_nodes_delimiter(nodes, "`", TextType.CODE)
+    return textnode.split_nodes_link(nodes)
+
+
+def outcome(function, text):
+    try:
+        return function(text)
+    except ValueError as exc:
+        return ("error", str(exc))
+
+
+CORPUS = [
+    "",
+    "plain text",
+    "This is **text** with an *italic* word and a `code block` and an ![image](img.jpg) and a [link](url)",
+    "This **has *nested* formatting**",
+    "**bold** at start and *italic* at end *",
+    "***",
+    "***a***",
+    "a ** b",
+    "a * b",
+    "`unclosed code",
+    "**bold `code` bold** and `code **not bold**`",
+    "[**bold link**](/url) and ![*alt*](/img.png)",
+    "[[text]](url) and [a[b]c](url)",
+    "![](empty-alt.png) and [](empty-text)",
+    "![a](b)![c](d)[e](f)[g](h)",
+    "[link](/same) then [link](/same) again",
+    "a [link with *star](/x*y) here*",
+    "[a ![b](c)](d)",
+    "*[x](y)* and **[z](w)**",
+    "trailing `",
+]
+
+FUZZ_PIECES = ["a", "b ", " ", "*", "**", "`", "[x](u)", "![i](p)", "[", "]", "(", ")", "!", "[t](", "u)"]
+
+
+def fuzz_inputs(count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(FUZZ_PIECES) for _ in range(rng.randint(0, 14)))
+
+
+class TestInlineParity(unittest.TestCase):
+
+    def assertParity(self, text):
+        self.assertEqual(outcome(chained_strict, text), outcome(lambda t: scan_inline(t, STRICT_INLINE), text), text)
+        self.assertEqual(outcome(chained_lenient, text), outcome(lambda t: scan_inline(t, LENIENT_INLINE), text), text)
+
+    def test_corpus(self):
+        for text in CORPUS:
+            self.assertParity(text)
+
+    def test_fuzz(self):
+        for text in fuzz_inputs(3000, seed=5):
+            self.assertParity(text)
+
+    def test_text_to_textnodes_uses_scanner(self):
+        text = "**b** *i* `c` [l](u) ![m](p)"
+        self.assertEqual(utils.text_to_textnodes(text), chained_strict(text))
+        self.assertEqual(textnode.text_to_textnodes(text), chained_lenient(text))
+
+    def test_strict_raises_on_unclosed_delimiter(self):
+        with self.assertRaises(ValueError):
+            scan_inline("an *unclosed delimiter", STRICT_INLINE)
+
+    def test_lenient_keeps_unclosed_delimiter(self):
+        self.assertEqual(
+            scan_inline("an `unclosed delimiter", LENIENT_INLINE),
+            [TextNode("an `unclosed delimiter", TextType.TEXT)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from content_index import PageEntry
+from listings import Listing, collect_posts, paginate, plan_listings, tag_slug
+from markdown_parser import default_metadata
+
+
+def post(rel_path, title=None, date=None, tags=()):
+    meta = default_metadata()
+    meta.update(title=title, date=date, tags=list(tags))
+    return PageEntry(rel_path, rel_path, rel_path, 0, 0, meta)
+
+
+class TestListings(unittest.TestCase):
+
+    def test_tag_slug(self):
+        self.assertEqual(tag_slug("Middle Earth"), "middle-earth")
+        self.assertEqual(tag_slug("C++"), "c")
+        self.assertEqual(tag_slug("!!"), "tag")
+
+    def test_collect_posts_orders_newest_first(self):
+        pages = [
+            post("index.md"),
+            post("blog/index.md"),
+            post("blog/b/index.md"),
+            post("blog/a/index.md"),
+            post("blog/old/index.md", date="2020-01-01"),
+            post("blog/new/index.md", date="2024-01-01"),
+        ]
+        self.assertEqual(
+            [page.rel_path for page in collect_posts(pages)],
+            ["blog/new/index.md", "blog/old/index.md", "blog/a/index.md", "blog/b/index.md"],
+        )
+
+    def test_paginate(self):
+        entries = [(f"/p{i}/", f"P{i}", None) for i in range(5)]
+        listings = paginate("/blog/", "Blog", entries, per_page=2)
+        self.assertEqual([listing.url for listing in listings], ["/blog/", "/blog/page/2/", "/blog/page/3/"])
+        self.assertEqual(listings[1].title, "Blog, page 2")
+        self.assertEqual((listings[1].prev_url, listings[1].next_url), ("/blog/", "/blog/page/3/"))
+        self.assertEqual(len(listings[2].entries), 1)
+        self.assertEqual(len(paginate("/blog/", "Blog", [], 2)), 1)
+
+    def test_plan_listings_with_tags(self):
+        posts = collect_posts([
+            post("blog/a/index.md", "A", "2024-01-02", ["Elves"]),
+            post("blog/b/index.md", "B", "2024-01-01", ["elves", "hobbits"]),
+        ])
+        urls = [listing.url for listing in plan_listings(posts)]
+        self.assertEqual(urls, ["/blog/", "/blog/tags/", "/blog/tags/elves/", "/blog/tags/hobbits/"])
+        elves = plan_listings(posts)[2]
+        self.assertEqual([entry[1] for entry in elves.entries], ["A", "B"])
+
+    def test_html_and_digest(self):
+        listing = Listing("/blog/", "Blog", [("/blog/a/", "A", "2024-01-02")], next_url="/blog/page/2/")
+        html = listing.to_html_node().to_html()
+        self.assertIn('<a href="/blog/a/">A</a> <time', html)
+        self.assertIn('rel="next"', html)
+        same = Listing("/blog/", "Blog", [("/blog/a/", "A", "2024-01-02")], next_url="/blog/page/2/")
+        self.assertEqual(listing.digest(), same.digest())
+        same.entries.append(("/blog/b/", "B", None))
+        self.assertNotEqual(listing.digest(), same.digest())
+
+
+if __name__ == "__main__":
+    unittest.main()
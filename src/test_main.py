@@ -0,0 +1,396 @@
+import io
+import json
+import os
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from compress import compress_outputs
+from highlight import Highlighter
+from main import PageBuildError, build_site
+from test_support import TempTreeTestCase
+
+TEMPLATE = '<title>{{ Title }}</title><link href="/index.css"><article>{{ Content }}</article>'
+
+
+class SiteTestCase(TempTreeTestCase):
+    """Creates a throwaway content/static/template tree for build tests"""
+
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.docs = os.path.join(self.root, "docs")
+        self.template = os.path.join(self.root, "template.html")
+        self.manifest = os.path.join(self.root, ".cache", "manifest.json")
+        self.cache_dir = os.path.join(self.root, ".cache", "pages")
+        self.search_state = os.path.join(self.root, ".cache", "search-index.json")
+        self.write("template.html", TEMPLATE)
+        self.write("content/index.md", "# Home\n\nWelcome **home**")
+        self.write("content/blog/post/index.md", "# Post\n\nA post")
+        self.write("static/index.css", "body {}")
+        self.write("static/images/a.png", "png")
+
+    def read(self, rel_path):
+        with open(os.path.join(self.root, rel_path), encoding='utf-8') as f:
+            return f.read()
+
+    def build(self, **kwargs):
+        kwargs.setdefault("manifest_path", self.manifest)
+        kwargs.setdefault("cache_dir", self.cache_dir)
+        kwargs.setdefault("search_state_path", self.search_state)
+        with redirect_stdout(io.StringIO()):
+            return build_site(self.content, self.template, self.static, self.docs, **kwargs)
+
+
+class TestIncrementalBuild(SiteTestCase):
+
+    def test_full_build(self):
+        stats = self.build()
+        self.assertEqual(stats["rendered"], 2)
+        self.assertEqual(stats["copied"], 2)
+        self.assertIn("<b>home</b>", self.read("docs/index.html"))
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "images", "a.png")))
+
+    def test_unchanged_build_skips_everything(self):
+        self.build()
+        stats = self.build(incremental=True)
+        self.assertEqual(stats["rendered"], 0)
+        self.assertEqual(stats["copied"], 0)
+        self.assertEqual(stats["skipped"], 4)
+
+    def test_only_changed_page_is_rendered(self):
+        self.build()
+        self.write("content/blog/post/index.md", "# Post\n\nEdited")
+        stats = self.build(incremental=True)
+        self.assertEqual(stats["rendered"], 1)
+        self.assertIn("Edited", self.read("docs/blog/post/index.html"))
+
+    def test_deleted_output_is_regenerated(self):
+        self.build()
+        os.remove(os.path.join(self.docs, "index.html"))
+        stats = self.build(incremental=True)
+        self.assertEqual(stats["rendered"], 1)
+
+    def test_removed_source_deletes_output(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post", "index.md"))
+        os.remove(os.path.join(self.static, "images", "a.png"))
+        stats = self.build(incremental=True)
+        self.assertEqual(stats["removed"], 2)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog")))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "images")))
+
+    def test_removed_source_deletes_compressed_output(self):
+        self.build()
+        compress_outputs(self.docs, min_size=0, suffixes=[".gz"])
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "blog", "post", "index.html.gz")))
+        os.remove(os.path.join(self.content, "blog", "post", "index.md"))
+        self.build(incremental=True)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog")))
+
+    def test_template_or_basepath_change_rerenders_all(self):
+        self.build()
+        self.write("template.html", TEMPLATE + "<footer></footer>")
+        self.assertEqual(self.build(incremental=True)["rendered"], 2)
+        stats = self.build(incremental=True, basepath="/site/")
+        self.assertEqual(stats["rendered"], 2)
+        self.assertIn('href="/site/index.css"', self.read("docs/index.html"))
+
+    def test_parser_change_rerenders_all(self):
+        self.build()
+        with mock.patch("main.parser_version", return_value="next"):
+            self.assertEqual(self.build(incremental=True)["rendered"], 2)
+            self.assertEqual(self.build(incremental=True)["rendered"], 0)
+
+    def test_corrupt_manifest_triggers_rebuild(self):
+        self.build()
+        with open(self.manifest, 'w') as f:
+            f.write("{not json")
+        self.assertEqual(self.build(incremental=True)["rendered"], 2)
+
+    def test_fingerprinted_assets_are_referenced(self):
+        self.write("content/index.md", "# Home\n\n![a](/images/a.png)")
+        self.build(fingerprint=True)
+        html = self.read("docs/index.html")
+        self.assertRegex(html, r'href="/index\.[0-9a-f]{8}\.css"')
+        self.assertRegex(html, r'src="/images/a\.[0-9a-f]{8}\.png"')
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "index.css")))
+
+    def test_changed_fingerprint_rerenders_pages_and_removes_old_asset(self):
+        self.build(fingerprint=True, incremental=True)
+        old_css = [name for name in os.listdir(self.docs) if name.endswith(".css")]
+        self.write("static/index.css", "body { margin: 0 }")
+        stats = self.build(fingerprint=True, incremental=True)
+        self.assertEqual(stats["rendered"], 2)
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, old_css[0])))
+
+
+class TestFrontMatter(SiteTestCase):
+
+    def test_front_matter_title_and_body(self):
+        self.write("content/index.md", "---\ntitle: Front Title\ntags: a, b\n---\n# Heading\n\nWelcome")
+        self.build()
+        html = self.read("docs/index.html")
+        self.assertIn("<title>Front Title</title>", html)
+        self.assertNotIn("tags:", html)
+        self.assertIn("<h1>Heading</h1>", html)
+
+    def test_drafts_are_skipped_and_removed(self):
+        self.build(incremental=True)
+        self.write("content/blog/post/index.md", "---\ndraft: true\n---\n# Post")
+        self.build(incremental=True)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog", "post", "index.html")))
+        self.build(incremental=True, drafts=True)
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "blog", "post", "index.html")))
+
+    def test_page_template_from_front_matter(self):
+        self.write("post.html", "<main>{{ Content }}</main>")
+        self.write("content/blog/post/index.md", "---\ntemplate: post.html\n---\n# Post")
+        self.build(incremental=True)
+        self.assertEqual(self.read("docs/blog/post/index.html"), "<main><div><h1>Post</h1></div></main>")
+        self.write("post.html", "<article>{{ Content }}</article>")
+        self.assertEqual(self.build(incremental=True)["rendered"], 2)
+
+    def test_missing_template_or_bad_front_matter_fails(self):
+        self.write("content/blog/post/index.md", "---\ntemplate: nope.html\n---\n# Post")
+        with self.assertRaises(PageBuildError):
+            self.build()
+        self.write("content/blog/post/index.md", "---\ndate: soon\n---\n# Post")
+        with self.assertRaises(PageBuildError) as context:
+            self.build()
+        self.assertIn("index.md", str(context.exception))
+
+    def test_unclosed_front_matter_names_the_file_once(self):
+        self.write("content/blog/post/index.md", "---\ntitle: Post\n# Post")
+        with self.assertRaises(PageBuildError) as context:
+            self.build()
+        message = str(context.exception)
+        self.assertIn("front matter is not closed with ---", message)
+        self.assertEqual(message.count(os.path.join("post", "index.md")), 1)
+
+
+class TestListings(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write("content/blog/a/index.md", "---\ndate: 2024-01-01\ntags: elves\n---\n# A")
+        self.write("content/blog/b/index.md", "---\ndate: 2024-01-02\ntags: hobbits\n---\n# B")
+
+    def test_listing_pages(self):
+        stats = self.build(blog_per_page=2)
+        self.assertEqual(stats["listings"], 5)
+        index = self.read("docs/blog/index.html")
+        self.assertLess(index.index("/blog/b/"), index.index("/blog/a/"))
+        self.assertIn('href="/blog/page/2/"', index)
+        self.assertIn("/blog/post/", self.read("docs/blog/page/2/index.html"))
+        self.assertIn("/blog/a/", self.read("docs/blog/tags/elves/index.html"))
+
+    def test_new_post_rewrites_only_affected_listings(self):
+        self.build(blog_per_page=10, incremental=True)
+        self.assertEqual(self.build(blog_per_page=10, incremental=True)["listings"], 0)
+        self.write("content/blog/c/index.md", "---\ndate: 2024-01-03\ntags: elves\n---\n# C")
+        stats = self.build(blog_per_page=10, incremental=True)
+        self.assertEqual(stats["rendered"], 1)
+        # The blog index, the elves page and the tag list (its count changed);
+        # the hobbits page is untouched
+        self.assertEqual(stats["listings"], 3)
+
+    def test_removed_tag_page_is_deleted(self):
+        self.build(blog_per_page=10, incremental=True)
+        self.write("content/blog/b/index.md", "---\ndate: 2024-01-02\n---\n# B")
+        stats = self.build(blog_per_page=10, incremental=True)
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog", "tags", "hobbits")))
+
+    def test_sitemap_and_feed_skip_drafts(self):
+        self.write("content/blog/c/index.md", "---\ndraft: true\n---\n# C")
+        self.build(site_url="https://example.org", basepath="/site/")
+        sitemap = self.read("docs/sitemap.xml")
+        self.assertIn("<loc>https://example.org/site/blog/a/</loc>", sitemap)
+        self.assertNotIn("/blog/c/", sitemap)
+        feed = self.read("docs/feed.xml")
+        self.assertIn("<title>Home</title>", feed)
+        self.assertIn("<author><name>Home</name></author>", feed)
+        self.build(site_url="https://example.org", feed_author="Ann")
+        self.assertIn("<author><name>Ann</name></author>", self.read("docs/feed.xml"))
+        self.assertLess(feed.index("/blog/b/"), feed.index("/blog/a/"))
+
+    def test_content_page_wins_over_listing(self):
+        self.write("content/blog/index.md", "# My blog")
+        self.build(blog_per_page=10)
+        self.assertIn("<h1>My blog</h1>", self.read("docs/blog/index.html"))
+
+
+class TestSearch(SiteTestCase):
+
+    def read_json(self, rel_path):
+        return json.loads(self.read(os.path.join("docs", "search", rel_path)))
+
+    def test_search_index(self):
+        stats = self.build(search=True, basepath="/site/")
+        meta = self.read_json("meta.json")
+        self.assertEqual(meta["pages"], [["/site/blog/post/", "Post"], ["/site/", "Home"]])
+        self.assertEqual(self.read_json(meta["shards"]["ho"])["home"], [[1, 2]])
+        self.assertEqual(stats["search_shards"], len(meta["shards"]))
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "search", "search.js")))
+
+    def test_unchanged_pages_are_not_reindexed(self):
+        self.build(search=True, incremental=True)
+        stats = self.build(search=True, incremental=True)
+        self.assertEqual((stats["rendered"], stats["search_shards"]), (0, 0))
+        self.write("content/blog/post/index.md", "# Post\n\nA post, elves")
+        stats = self.build(search=True, incremental=True)
+        self.assertEqual((stats["rendered"], stats["search_shards"]), (1, 1))
+        self.assertEqual(self.read_json("el.json"), {"elves": [[0, 1]]})
+
+    def test_enabling_search_indexes_skipped_pages(self):
+        self.build(incremental=True)
+        stats = self.build(search=True, incremental=True)
+        self.assertEqual(stats["rendered"], 2)
+        self.assertEqual(len(self.read_json("meta.json")["pages"]), 2)
+
+    def test_search_reads_terms_past_the_page_cache(self):
+        self.build()
+        stats = self.build(search=True)
+        self.assertEqual(stats["cached"], 0)
+        self.assertIn("welcome", self.read_json("we.json"))
+
+
+@unittest.skipUnless(Highlighter.available(), "pygments is not installed")
+class TestHighlightBuild(SiteTestCase):
+
+    def test_highlight_build(self):
+        self.write("content/code/index.md", "# Code\n\n```python\nx = 1\n```\n\n```\nplain\n```")
+        highlight_dir = os.path.join(self.root, ".cache", "highlight")
+        self.build(highlight_dir=highlight_dir)
+        html = self.read("docs/code/index.html")
+        self.assertIn('<code class="language-python"><span class="n">x</span>', html)
+        self.assertIn("<pre><code>plain\n</code></pre>", html)
+        self.assertIn(".highlight", self.read("docs/highlight.css"))
+        self.assertTrue(os.listdir(highlight_dir))
+
+    def test_toggling_highlight_rerenders_unchanged_pages(self):
+        self.write("content/code/index.md", "# Code\n\n```python\nx = 1\n```")
+        highlight_dir = os.path.join(self.root, ".cache", "highlight")
+        self.build()
+        stats = self.build(incremental=True, highlight_dir=highlight_dir)
+        self.assertEqual(stats["rendered"], 3)
+        self.assertIn('class="highlight"', self.read("docs/code/index.html"))
+        self.assertEqual(self.build(incremental=True)["rendered"], 3)
+        self.assertNotIn('class="highlight"', self.read("docs/code/index.html"))
+
+
+class TestParallelBuild(SiteTestCase):
+
+    def test_parallel_output_matches_serial(self):
+        for i in range(6):
+            self.write(f"content/notes/{i}/index.md", f"# Note {i}\n\nBody *{i}*")
+        self.build()
+        serial = {path: self.read(os.path.join("docs", path)) for path in ("index.html", "notes/3/index.html")}
+        stats = self.build(workers=3)
+        self.assertEqual(stats["rendered"], 8)
+        for path, html in serial.items():
+            self.assertEqual(self.read(os.path.join("docs", path)), html)
+
+    def test_log_order_is_deterministic(self):
+        for i in range(5):
+            self.write(f"content/notes/{i}/index.md", f"# Note {i}")
+        out = io.StringIO()
+        with redirect_stdout(out):
+            build_site(self.content, self.template, self.static, self.docs,
+                       manifest_path=self.manifest, cache_dir=self.cache_dir, workers=4)
+        sources = [line.split()[3] for line in out.getvalue().splitlines()]
+        self.assertEqual(sources, sorted(sources))
+
+    def test_errors_name_failing_files(self):
+        self.write("content/broken/index.md", "no title here")
+        self.write("content/worse/index.md", "## still no title")
+        with self.assertRaises(PageBuildError) as context:
+            self.build(workers=2)
+        message = str(context.exception)
+        self.assertIn(os.path.join("broken", "index.md"), message)
+        self.assertIn(os.path.join("worse", "index.md"), message)
+        self.assertIn("2 page(s) failed", message)
+
+
+class TestAsyncBuild(SiteTestCase):
+
+    def test_async_output_matches_serial(self):
+        for i in range(6):
+            self.write(f"content/notes/{i}/index.md", f"# Note {i}\n\nBody *{i}*")
+        self.build(cache_dir=None)
+        serial = {path: self.read(os.path.join("docs", path)) for path in ("index.html", "notes/3/index.html")}
+        stats = self.build(io_threads=3)
+        self.assertEqual(stats["rendered"], 8)
+        for path, html in serial.items():
+            self.assertEqual(self.read(os.path.join("docs", path)), html)
+        self.assertEqual(self.build(io_threads=3)["cached"], 8)
+
+    def test_async_errors_name_failing_files(self):
+        self.write("content/broken/index.md", "no title here")
+        with self.assertRaises(PageBuildError) as context:
+            self.build(io_threads=2)
+        self.assertIn(os.path.join("broken", "index.md"), str(context.exception))
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "index.html")))
+
+
+class TestPageCache(SiteTestCase):
+
+    def test_wiped_output_reuses_cache(self):
+        first = self.build()
+        self.assertEqual(first["cached"], 0)
+        html = self.read("docs/index.html")
+        second = self.build()
+        self.assertEqual(second["rendered"], 2)
+        self.assertEqual(second["cached"], 2)
+        self.assertEqual(self.read("docs/index.html"), html)
+
+    def test_cache_disabled(self):
+        self.build(cache_dir=None)
+        self.assertFalse(os.path.exists(self.cache_dir))
+        self.assertEqual(self.build(cache_dir=None)["cached"], 0)
+
+    def test_corrupt_entries_are_rebuilt(self):
+        self.build()
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                with open(os.path.join(root, name), 'w') as f:
+                    f.write('{"key": "truncated')
+        stats = self.build()
+        self.assertEqual(stats["cached"], 0)
+        self.assertIn("<b>home</b>", self.read("docs/index.html"))
+        self.assertEqual(self.build()["cached"], 2)
+
+    def test_entries_corrupt_mid_body_are_reparsed(self):
+        self.build()
+        html = self.read("docs/index.html")
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                with open(path, 'rb') as f:
+                    data = f.read()
+                with open(path, 'wb') as f:
+                    f.write(data.replace(b"</b>", b"\xff/b>"))
+        # Only the home page has bold text to corrupt
+        self.assertEqual(self.build()["cached"], 1)
+        self.assertEqual(self.read("docs/index.html"), html)
+        self.assertEqual(self.build()["cached"], 2)
+
+    def test_strict_build_does_not_reuse_lenient_entries(self):
+        self.write("content/index.md", "# Home\n\nAn unclosed `tick")
+        self.build()
+        self.assertIn("An unclosed `tick", self.read("docs/index.html"))
+        with self.assertRaises(PageBuildError):
+            self.build(strict=True)
+
+    def test_incremental_strict_build_rechecks_unchanged_pages(self):
+        self.write("content/index.md", "# Home\n\nAn unclosed *star")
+        self.build()
+        with self.assertRaises(PageBuildError):
+            self.build(incremental=True, strict=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
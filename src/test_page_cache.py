@@ -0,0 +1,96 @@
+import json
+import os
+import unittest
+from unittest import mock
+
+import page_cache
+from htmlnode import LeafNode, ParentNode
+from page_cache import PageCache
+from test_support import TempTreeTestCase
+
+
+class TestPageCache(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = PageCache(self.root)
+
+    def entry_path(self, markdown):
+        key = self.cache.key(markdown)
+        return os.path.join(self.root, key[:2], f"{key}.html")
+
+    def test_round_trip(self):
+        self.assertIsNone(self.cache.get("# Hi"))
+        self.cache.put("# Hi", "Hi", "<div><h1>Hi</h1></div>")
+        self.assertEqual(self.cache.get("# Hi"), ("Hi", "<div><h1>Hi</h1></div>"))
+        self.assertIsNone(self.cache.get("# Hi!"))
+
+    def test_corrupt_entry_is_a_miss(self):
+        self.cache.put("# Hi", "Hi", "<h1>Hi</h1>")
+        with open(self.entry_path("# Hi"), 'w') as f:
+            f.write("\x00garbage")
+        self.assertIsNone(self.cache.get("# Hi"))
+
+    def test_entry_with_wrong_shape_is_a_miss(self):
+        self.cache.put("# Hi", "Hi", "<h1>Hi</h1>")
+        for header, body in (({"key": self.cache.key("# Hi")}, "<h1>Hi</h1>"),
+                             ({"key": self.cache.key("# Hi"), "title": "Hi"}, "")):
+            with open(self.entry_path("# Hi"), 'w') as f:
+                f.write(json.dumps(header) + "\n" + body)
+            self.assertIsNone(self.cache.get("# Hi"))
+
+    def test_truncated_entry_is_a_miss(self):
+        self.cache.put("# Hi", "Hi", "<div><h1>Hi</h1></div>")
+        path = self.entry_path("# Hi")
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data[:-20])
+        self.assertIsNone(self.cache.get_body("# Hi"))
+
+    def test_corrupt_body_is_discarded_while_streaming(self):
+        self.cache.put("# Hi", "Hi", "<div><h1>Hi</h1></div>")
+        path = self.entry_path("# Hi")
+        with open(path, 'rb') as f:
+            data = f.read()
+        for corrupt in (b"\xff", b"X"):
+            with open(path, 'wb') as f:
+                f.write(data.replace(b"Hi<", corrupt + b"i<"))
+            title, body = self.cache.get_body("# Hi")
+            with self.assertRaises(page_cache.CacheEntryError):
+                body.to_html()
+            self.assertFalse(os.path.exists(path))
+            self.assertIsNone(self.cache.get("# Hi"))
+
+    def test_recording_body_streams_and_stores(self):
+        node = ParentNode("div", [LeafNode("p", f"para {i}") for i in range(300)])
+        recording = self.cache.recording("# Big", "Big", node)
+        self.assertEqual("".join(recording.iter_html()), node.to_html())
+        title, body = self.cache.get_body("# Big")
+        self.assertEqual(title, "Big")
+        with mock.patch.object(page_cache, "READ_SIZE", 100):
+            chunks = list(body.iter_html())
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(chunk.endswith(">") for chunk in chunks))
+        self.assertEqual("".join(chunks), node.to_html())
+
+    def test_interrupted_recording_stores_nothing(self):
+        parts = self.cache.recording("# Hi", "Hi", ParentNode("div", [LeafNode("p", "x")])).iter_html()
+        next(parts)
+        parts.close()
+        self.assertIsNone(self.cache.get("# Hi"))
+        self.assertEqual(os.listdir(self.root), [os.path.basename(os.path.dirname(self.entry_path("# Hi")))])
+        self.assertEqual(os.listdir(os.path.dirname(self.entry_path("# Hi"))), [])
+
+    def test_parser_version_change_invalidates(self):
+        self.cache.put("# Hi", "Hi", "<h1>Hi</h1>")
+        with mock.patch.object(page_cache, "parser_version", return_value="other"):
+            self.assertIsNone(self.cache.get("# Hi"))
+
+    def test_parser_version_is_stable(self):
+        self.assertEqual(page_cache.parser_version(), page_cache.parser_version())
+        self.assertEqual(len(page_cache.parser_version()), 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
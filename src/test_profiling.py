@@ -0,0 +1,93 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from htmlnode import LeafNode, ParentNode
+from profiling import BuildProfile, PageProfile, count_nodes
+from test_main import SiteTestCase
+
+
+class TestPageProfile(unittest.TestCase):
+
+    def test_stage_records_events(self):
+        profile = PageProfile("a.md")
+        with profile.stage("read"):
+            pass
+        with profile.stage("write"):
+            pass
+        with profile.stage("read"):
+            pass
+        self.assertEqual([name for name, _, _ in profile.events], ["read", "write", "read"])
+        self.assertEqual(set(profile.stage_totals()), {"read", "write"})
+        self.assertGreaterEqual(profile.total, 0)
+
+    def test_stage_records_on_error(self):
+        profile = PageProfile("a.md")
+        with self.assertRaises(ValueError):
+            with profile.stage("inline parse"):
+                raise ValueError("boom")
+        self.assertEqual(profile.events[0][0], "inline parse")
+
+    def test_count_nodes(self):
+        tree = ParentNode("div", [ParentNode("p", [LeafNode(None, "a"), LeafNode("b", "c")])])
+        self.assertEqual(count_nodes(tree), 4)
+
+
+class TestBuildProfile(unittest.TestCase):
+
+    def make_profile(self):
+        build = BuildProfile()
+        for path in ("slow.md", "fast.md"):
+            page = PageProfile(path)
+            page.events = [("read", build.start, 0.001), ("inline parse", build.start + 0.001,
+                                                          0.5 if path == "slow.md" else 0.01)]
+            page.nodes = 10
+            build.add(page)
+        return build
+
+    def test_report_lists_slowest_first(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.make_profile().report()
+        report = out.getvalue()
+        self.assertIn("Profiled 2 pages, 20 nodes created", report)
+        self.assertLess(report.index("slow.md"), report.index("fast.md"))
+        self.assertIn("mostly inline parse", report)
+
+    def test_write_trace(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            self.make_profile().write_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+        events = trace["traceEvents"]
+        self.assertEqual(len(events), 4)
+        self.assertEqual({event["ph"] for event in events}, {"X"})
+        self.assertEqual(events[1]["dur"], 500000.0)
+        self.assertEqual(events[1]["args"]["page"], "slow.md")
+
+
+class TestProfiledBuild(SiteTestCase):
+
+    def test_build_collects_stage_timings(self):
+        profile = BuildProfile()
+        self.build(profile=profile, cache_dir=None)
+        self.assertEqual(len(profile.pages), 2)
+        stages = set()
+        for page in profile.pages:
+            stages |= set(page.stage_totals())
+            self.assertGreater(page.nodes, 0)
+        self.assertTrue({"read", "block split", "inline parse", "serialize", "template fill", "write"} <= stages)
+
+    def test_profiled_output_matches_streamed_output(self):
+        self.build(cache_dir=None)
+        html = self.read("docs/index.html")
+        self.build(profile=BuildProfile(), cache_dir=None)
+        self.assertEqual(self.read("docs/index.html"), html)
+
+
+if __name__ == "__main__":
+    unittest.main()
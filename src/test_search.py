@@ -0,0 +1,89 @@
+import json
+import os
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from search import SearchIndex, node_text, page_terms, shard_name
+from test_support import TempTreeTestCase
+
+
+class TestPageTerms(unittest.TestCase):
+
+    def test_node_text_in_document_order(self):
+        node = ParentNode("div", [
+            LeafNode("p", "One"),
+            ParentNode("p", [LeafNode(None, "two "), LeafNode("b", "three")]),
+            LeafNode("img", "", {"src": "a.png", "alt": "four"}),
+        ])
+        self.assertEqual(list(node_text(node)), ["One", "two ", "three", "four"])
+
+    def test_terms_are_lowercased_and_counted(self):
+        node = ParentNode("div", [LeafNode("p", "Tolkien's Elves, elves; a Balrog in Straße")])
+        self.assertEqual(page_terms(node), {"tolkien": 1, "elves": 2, "balrog": 1, "in": 1, "straße": 1})
+
+    def test_shard_name(self):
+        self.assertEqual(shard_name("el"), "el.json")
+        self.assertEqual(shard_name("é"), "xc3a9.json")
+
+
+class TestSearchIndex(TempTreeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.dest = self.root
+        self.index = SearchIndex()
+        self.index.update("a.md", "h1", "/a.html", "A", {"elves": 2, "balrog": 1})
+        self.index.update("b.md", "h2", "/b/", "B", {"elves": 1})
+
+    def read_json(self, name):
+        with open(os.path.join(self.dest, "search", name), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_write_shards(self):
+        self.assertEqual(self.index.write(self.dest, "/site/"), 2)
+        meta = self.read_json("meta.json")
+        self.assertEqual(meta["pages"], [["/site/a.html", "A"], ["/site/b/", "B"]])
+        self.assertEqual(meta["shards"], {"ba": "ba.json", "el": "el.json"})
+        self.assertEqual(self.read_json("el.json"), {"elves": [[0, 2], [1, 1]]})
+
+    def test_only_changed_shards_are_rewritten(self):
+        self.index.write(self.dest)
+        self.index.update("b.md", "h3", "/b/", "B", {"elves": 1, "hobbits": 1})
+        self.assertEqual(self.index.write(self.dest), 1)
+        self.assertEqual(self.index.write(self.dest, force=True), 3)
+
+    def test_removed_page_keeps_other_ids(self):
+        self.index.write(self.dest)
+        self.index.retain(["b.md"])
+        self.index.write(self.dest)
+        self.assertEqual(self.read_json("meta.json")["pages"], [None, ["/b/", "B"]])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "search", "ba.json")))
+
+    def test_removed_ids_are_reused(self):
+        self.index.retain(["b.md"])
+        self.index.update("c.md", "h4", "/c/", "C", {"hobbits": 1})
+        self.index.update("d.md", "h5", "/d/", "D", {"hobbits": 1})
+        self.index.write(self.dest)
+        self.assertEqual(self.read_json("meta.json")["pages"], [["/c/", "C"], ["/b/", "B"], ["/d/", "D"]])
+        self.index.retain(["b.md"])
+        self.index.write(self.dest)
+        self.assertEqual(self.read_json("meta.json")["pages"], [None, ["/b/", "B"]])
+
+    def test_state_round_trip(self):
+        path = os.path.join(self.dest, "state.json")
+        self.index.write(self.dest)
+        self.index.save(path)
+        loaded = SearchIndex.load(path)
+        self.assertTrue(loaded.has("a.md", "h1"))
+        self.assertFalse(loaded.has("a.md", "h9"))
+        self.assertEqual(loaded.write(self.dest), 0)
+
+    def test_unreadable_state_starts_empty(self):
+        path = os.path.join(self.dest, "state.json")
+        with open(path, 'w') as f:
+            f.write("{")
+        self.assertEqual(len(SearchIndex.load(path).docs), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,20 @@
+import os
+import tempfile
+import unittest
+
+
+class TempTreeTestCase(unittest.TestCase):
+    """Gives each test a throwaway directory, self.root, to write files into"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    def write(self, rel_path, text):
+        """Write text to rel_path, a "/"-separated path under self.root, and return its full path"""
+        path = os.path.join(self.root, *rel_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
@@ -0,0 +1,88 @@
+import io
+import os
+import tempfile
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from template import Template, load_template, rewrite_root_urls
+
+
+class TestTemplate(unittest.TestCase):
+
+    def test_render_fills_placeholders(self):
+        template = Template("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        self.assertEqual(template.render("Hi", "<p>x</p>"), "<title>Hi</title><body><p>x</p></body>")
+
+    def test_title_is_escaped(self):
+        template = Template("<title>{{ Title }}</title>")
+        self.assertEqual(template.render("Q&A <draft> &copy;", "C"), "<title>Q&amp;A &lt;draft&gt; &copy;</title>")
+
+    def test_repeated_and_reordered_placeholders(self):
+        template = Template("{{ Content }}|{{ Title }}|{{ Title }}")
+        self.assertEqual(template.render("T", "C"), "C|T|T")
+
+    def test_no_placeholders(self):
+        template = Template("static")
+        self.assertEqual(template.render("T", "C"), "static")
+
+    def test_basepath_applies_to_template_and_content(self):
+        template = Template('<link href="/index.css">{{ Content }}', "/site/")
+        html = template.render("T", '<a href="/post">p</a><img src="/a.png"><a href="https://x.com">x</a>')
+        self.assertEqual(
+            html,
+            '<link href="/site/index.css"><a href="/site/post">p</a>'
+            '<img src="/site/a.png"><a href="https://x.com">x</a>',
+        )
+
+    def test_matches_replace_chain(self):
+        source = '<title>{{ Title }}</title><link href="/a.css"><script src="/b.js"></script>{{ Content }}'
+        content = '<p><a href="/x">x</a></p>'
+        expected = source.replace("{{ Title }}", "T").replace("{{ Content }}", content)
+        expected = expected.replace('href="/', 'href="/base/').replace('src="/', 'src="/base/')
+        self.assertEqual(Template(source, "/base/").render("T", content), expected)
+
+    def test_write_streams_node_content(self):
+        template = Template('<h1>{{ Title }}</h1>{{ Content }}<footer></footer>', "/b/")
+        node = ParentNode("div", [LeafNode("a", "home", {"href": "/"}), LeafNode(None, "text")])
+        buffer = io.StringIO()
+        template.write(buffer, "T", node)
+        self.assertEqual(buffer.getvalue(), template.render("T", node.to_html()))
+        self.assertIn('<a href="/b/">home</a>', buffer.getvalue())
+
+    def test_streamed_node_matches_string_content(self):
+        node = ParentNode("p", [LeafNode("a", "css", {"href": "/index.css"}), LeafNode(None, "x"),
+                                LeafNode("img", " ", {"src": "/a.png", "alt": ""})], {"class": "c"})
+        assets = {"/index.css": "/index.3f2a9c1b.css"}
+        for basepath, asset_map in (("/", None), ("/", assets), ("/b/", None), ("/b/", assets)):
+            with self.subTest(basepath=basepath, assets=asset_map):
+                template = Template("{{ Content }}", basepath, asset_map)
+                self.assertEqual(template.render("T", node), template.render("T", node.to_html()))
+
+    def test_rewrite_root_urls_default_basepath(self):
+        html = '<a href="/x">x</a>'
+        self.assertIs(rewrite_root_urls(html, "/"), html)
+
+    def test_asset_map_rewrites_before_basepath(self):
+        assets = {"/index.css": "/index.3f2a9c1b.css", "/images/a.png": "/images/a.0123abcd.png"}
+        template = Template('<link href="/index.css">{{ Content }}', "/site/", assets)
+        html = template.render("T", '<img src="/images/a.png?v=1"><a href="/post">p</a>')
+        self.assertEqual(
+            html,
+            '<link href="/site/index.3f2a9c1b.css"><img src="/site/images/a.0123abcd.png?v=1">'
+            '<a href="/site/post">p</a>',
+        )
+
+    def test_load_template_is_cached_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, 'w') as f:
+                f.write("{{ Content }}")
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+            with open(path, 'w') as f:
+                f.write("<main>{{ Content }}</main>")
+            self.assertEqual(load_template(path).render("T", "C"), "<main>C</main>")
+
+
+if __name__ == "__main__":
+    unittest.main()
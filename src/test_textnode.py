@@ -1,6 +1,15 @@
 import unittest
 
-from textnode import TextNode, TextType
+import utils
+from textnode import (
+    LeafInterner,
+    TextNode,
+    TextType,
+    split_nodes_image,
+    split_nodes_link,
+    text_node_to_html_node,
+)
+from htmlnode import FrozenLeafNode, LeafNode, ParentNode
 
 
 class TestTextNode(unittest.TestCase):
@@ -30,6 +39,106 @@ class TestTextNode(unittest.TestCase):
             "TextNode('This is a text node', TextType.TEXT, 'https://www.boot.dev')", repr(node)
         )
 
+    def test_slots(self):
+        node = TextNode("text", TextType.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+
+
+class TestTextNodeToHTMLNode(unittest.TestCase):
+    def test_flattened_spans(self):
+        node = text_node_to_html_node(TextNode("bold", TextType.BOLD))
+        self.assertIsInstance(node, LeafNode)
+        self.assertEqual(node.to_html(), "<b>bold</b>")
+
+    def test_flat_and_nested_render_the_same(self):
+        for text_node in [
+            TextNode("b", TextType.BOLD),
+            TextNode("i", TextType.ITALIC),
+            TextNode("c", TextType.CODE),
+            TextNode("link", TextType.LINK, "/url"),
+            TextNode("link", TextType.LINK),
+        ]:
+            nested = text_node_to_html_node(text_node, flatten=False)
+            self.assertIsInstance(nested, ParentNode)
+            self.assertEqual(text_node_to_html_node(text_node).to_html(), nested.to_html())
+
+    def test_text_and_image(self):
+        self.assertEqual(text_node_to_html_node(TextNode("plain", TextType.TEXT)).to_html(), "plain")
+        image = text_node_to_html_node(TextNode("alt", TextType.IMAGE, "/a.png"))
+        self.assertEqual(image.props, {"src": "/a.png", "alt": "alt"})
+
+
+class TestSplitNodesLinkImage(unittest.TestCase):
+
+    def test_thousands_of_links(self):
+        count = 5000
+        text = " ".join(f"[ref {i}](/refs/{i})" for i in range(count))
+        for split in (split_nodes_link, utils.split_nodes_link):
+            nodes = split([TextNode(text, TextType.TEXT)])
+            self.assertEqual(len(nodes), 2 * count - 1)
+            self.assertEqual(nodes[0], TextNode("ref 0", TextType.LINK, "/refs/0"))
+            self.assertEqual(nodes[1], TextNode(" ", TextType.TEXT))
+            self.assertEqual(nodes[-1], TextNode(f"ref {count - 1}", TextType.LINK, f"/refs/{count - 1}"))
+
+    def test_thousands_of_identical_images(self):
+        text = "![a](b)x" * 3000
+        for split in (split_nodes_image, utils.split_nodes_image):
+            nodes = split([TextNode(text, TextType.TEXT)])
+            self.assertEqual(nodes, [TextNode("a", TextType.IMAGE, "b"), TextNode("x", TextType.TEXT)] * 3000)
+
+    def test_repeated_link_keeps_text_in_place(self):
+        nodes = split_nodes_link([TextNode("[a](b) mid [a](b) end", TextType.TEXT)])
+        self.assertEqual(nodes, [
+            TextNode("a", TextType.LINK, "b"),
+            TextNode(" mid ", TextType.TEXT),
+            TextNode("a", TextType.LINK, "b"),
+            TextNode(" end", TextType.TEXT),
+        ])
+
+    def test_node_without_matches_is_kept(self):
+        node = TextNode("no links", TextType.TEXT)
+        self.assertIs(split_nodes_link([node])[0], node)
+
+
+class TestLeafInterner(unittest.TestCase):
+
+    def test_repeated_spans_share_a_node(self):
+        interner = LeafInterner()
+        first = text_node_to_html_node(TextNode("x", TextType.LINK, "/x"), interner=interner)
+        second = text_node_to_html_node(TextNode("x", TextType.LINK, "/x"), interner=interner)
+        other = text_node_to_html_node(TextNode("x", TextType.LINK, "/y"), interner=interner)
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertIsInstance(first, FrozenLeafNode)
+        self.assertEqual(first.to_html(), text_node_to_html_node(TextNode("x", TextType.LINK, "/x")).to_html())
+        self.assertEqual(interner.info(), (1, 2, 4096, 2))
+
+    def test_interned_code_escapes_every_ampersand(self):
+        interner = LeafInterner()
+        node = text_node_to_html_node(TextNode("&amp;", TextType.CODE), interner=interner)
+        self.assertIsInstance(node, FrozenLeafNode)
+        self.assertEqual(node.to_html(), "<code>&amp;amp;</code>")
+
+    def test_plain_text_and_nested_spans_are_not_interned(self):
+        interner = LeafInterner()
+        text = text_node_to_html_node(TextNode("plain", TextType.TEXT), interner=interner)
+        nested = text_node_to_html_node(TextNode("b", TextType.BOLD), flatten=False, interner=interner)
+        self.assertNotIsInstance(text, FrozenLeafNode)
+        self.assertIsInstance(nested, ParentNode)
+        self.assertEqual(interner.info().currsize, 0)
+
+    def test_least_recently_used_is_evicted(self):
+        interner = LeafInterner(maxsize=2)
+        a = interner.intern(TextNode("a", TextType.BOLD))
+        interner.intern(TextNode("b", TextType.BOLD))
+        interner.intern(TextNode("a", TextType.BOLD))
+        interner.intern(TextNode("c", TextType.BOLD))
+        self.assertIs(interner.intern(TextNode("a", TextType.BOLD)), a)
+        interner.intern(TextNode("b", TextType.BOLD))
+        self.assertEqual(interner.info(), (2, 4, 2, 2))
+        interner.clear()
+        self.assertEqual(interner.info(), (0, 0, 2, 0))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -16,7 +16,14 @@ from utils import (
     block_type_code,
     block_type_olist,
     block_type_ulist,
-    block_type_quote,)
+    block_type_quote,
+    paragraph_to_html_node,
+    heading_to_html_node,
+    code_to_html_node,
+    olist_to_html_node,
+    ulist_to_html_node,
+    quote_to_html_node,
+    text_to_children,)
 from textnode import TextNode, TextType
 
 class TestTextNodeToHtmlNode(unittest.TestCase):
@@ -661,5 +668,19 @@ this is paragraph text
             html,
             "<div><blockquote>This is a blockquote block</blockquote><p>this is paragraph text</p></div>",
         )
+
+    def test_block_helpers(self):
+        cases = [
+            (paragraph_to_html_node, "two\nlines", "<p>two lines</p>"),
+            (heading_to_html_node, "### three", "<h3>three</h3>"),
+            (code_to_html_node, "```\nx = *1*\n```", "<pre><code>x = *1*\n</code></pre>"),
+            (olist_to_html_node, "1. a\n2. b", "<ol><li>a</li><li>b</li></ol>"),
+            (ulist_to_html_node, "* a\n* b", "<ul><li>a</li><li>b</li></ul>"),
+            (quote_to_html_node, "> a\n> b", "<blockquote>a b</blockquote>"),
+        ]
+        for helper, block, expected in cases:
+            with self.subTest(helper.__name__):
+                self.assertEqual(helper(block).to_html(), expected)
+        self.assertEqual("".join(node.to_html() for node in text_to_children("a **b**")), "a <b>b</b>")
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,6 @@
+from collections import OrderedDict, namedtuple
 from enum import Enum
-from htmlnode import LeafNode, ParentNode
+from htmlnode import CodeLeafNode, FrozenCodeLeafNode, FrozenLeafNode, LeafNode, ParentNode
 import re
 
 class TextType(Enum):
@@ -11,6 +12,8 @@ class TextType(Enum):
     IMAGE = "image"
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
@@ -28,21 +31,117 @@ class TextNode:
 
 def text_to_textnodes(text):
     """Convert text to TextNode objects, handling markdown inline formatting"""
-    nodes = [TextNode(text, TextType.TEXT)]
-    
-    # Handle images first since they use ![ which includes the [ character
-    nodes = split_nodes_image(nodes)
-    
-    # Handle other delimiters
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    
-    # Handle links last since they depend on having text nodes to wrap
-    nodes = split_nodes_link(nodes)
-    
+    # Images first since they use ![ which includes the [ character, then the
+    # **, * and ` delimiters, and links last on whatever text is left
+    return scan_inline(text, LENIENT_INLINE)
+
+class InlineSyntax:
+    """
+    The inline rules of one markdown dialect.
+
+    image_pattern and link_pattern (strings or compiled patterns) must
+    capture exactly (text, url). With links_first the link pattern runs on
+    the text between images before delimiters are split, otherwise on the
+    text left after delimiters. In strict mode an unclosed delimiter raises
+    ValueError; otherwise the text is kept as-is and handed to the next
+    delimiter.
+    """
+
+    def __init__(self, image_pattern, link_pattern, strict, links_first):
+        self.image_pattern = re.compile(image_pattern)
+        self.link_pattern = re.compile(link_pattern)
+        self.strict = strict
+        self.links_first = links_first
+
+# Compiled once at import; the extract_* helpers share them with the syntaxes
+IMAGE_PATTERN = re.compile(r'!\[(.*?)\]\((.*?)\)')
+LINK_PATTERN = re.compile(r'\[(.*?)\]\((.*?)\)')
+STRICT_IMAGE_PATTERN = re.compile(r'\!\[([^\]]+)\]\(([^\)]+)\)')
+STRICT_LINK_PATTERN = re.compile(r'\[(.*?)\]\(([^\)]+)\)')
+
+# The rules used by utils.text_to_textnodes and textnode.text_to_textnodes
+STRICT_INLINE = InlineSyntax(STRICT_IMAGE_PATTERN, STRICT_LINK_PATTERN, True, True)
+LENIENT_INLINE = InlineSyntax(IMAGE_PATTERN, LINK_PATTERN, False, False)
+
+DELIMITER_LEVELS = (("**", TextType.BOLD), ("*", TextType.ITALIC), ("`", TextType.CODE))
+
+def scan_inline(text, syntax=STRICT_INLINE):
+    """
+    Split text into TextNodes in one left-to-right walk.
+
+    Produces the same nodes as chaining split_nodes_image, split_nodes_link
+    and split_nodes_delimiter under the given syntax, but each piece of
+    text is taken straight to its final TextNode: no intermediate node
+    lists are built and delimiters that do not occur are skipped without
+    splitting.
+
+    Text without a "[" cannot hold an image or link and goes straight to
+    the delimiters.
+    """
+    nodes = []
+    if not text:
+        return nodes
+    if "[" not in text:
+        _split_delimiters(text, 0, syntax, nodes)
+        return nodes
+    position = 0
+    for match in syntax.image_pattern.finditer(text):
+        if match.start() > position:
+            _scan_links_first(text, position, match.start(), syntax, nodes)
+        nodes.append(TextNode(match.group(1), TextType.IMAGE, match.group(2)))
+        position = match.end()
+    if position < len(text):
+        _scan_links_first(text, position, len(text), syntax, nodes)
     return nodes
 
+def _scan_links_first(text, start, end, syntax, nodes):
+    if not syntax.links_first:
+        _split_delimiters(text[start:end], 0, syntax, nodes)
+        return
+    for match in syntax.link_pattern.finditer(text, start, end):
+        if match.start() > start:
+            _split_delimiters(text[start:match.start()], 0, syntax, nodes)
+        nodes.append(TextNode(match.group(1), TextType.LINK, match.group(2)))
+        start = match.end()
+    if start < end:
+        _split_delimiters(text[start:end], 0, syntax, nodes)
+
+def _scan_links_last(text, syntax, nodes):
+    if syntax.links_first:
+        nodes.append(TextNode(text, TextType.TEXT))
+        return
+    start = 0
+    for match in syntax.link_pattern.finditer(text):
+        if match.start() > start:
+            nodes.append(TextNode(text[start:match.start()], TextType.TEXT))
+        nodes.append(TextNode(match.group(1), TextType.LINK, match.group(2)))
+        start = match.end()
+    if start < len(text):
+        nodes.append(TextNode(text[start:], TextType.TEXT))
+
+def _split_delimiters(text, level, syntax, nodes):
+    """Split text on the delimiter of this level, descending into the plain sections"""
+    # Skip straight past delimiters that do not occur in this text
+    while level < len(DELIMITER_LEVELS) and DELIMITER_LEVELS[level][0] not in text:
+        level += 1
+    if level == len(DELIMITER_LEVELS):
+        _scan_links_last(text, syntax, nodes)
+        return
+    delimiter, text_type = DELIMITER_LEVELS[level]
+    sections = text.split(delimiter)
+    if len(sections) % 2 == 0:
+        if syntax.strict:
+            raise ValueError("Invalid markdown, formatted section not closed")
+        _split_delimiters(text, level + 1, syntax, nodes)
+        return
+    for i, section in enumerate(sections):
+        if not section:
+            continue
+        if i % 2 == 0:
+            _split_delimiters(section, level + 1, syntax, nodes)
+        else:
+            nodes.append(TextNode(section, text_type))
+
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     """Split nodes by delimiter and create new nodes with the specified text type"""
     new_nodes = []
@@ -69,166 +168,129 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
 
 def extract_markdown_links(text):
     """Extract all markdown links from text. Returns list of (text, url) tuples."""
-    pattern = r'\[(.*?)\]\((.*?)\)'
-    return re.findall(pattern, text)
+    return LINK_PATTERN.findall(text)
 
 def extract_markdown_images(text):
     """Extract all markdown images from text. Returns list of (alt_text, url) tuples."""
-    pattern = r'!\[(.*?)\]\((.*?)\)'
-    return re.findall(pattern, text)
+    return IMAGE_PATTERN.findall(text)
 
-def split_nodes_image(old_nodes):
-    """Split nodes by image markdown and create image nodes"""
+def split_nodes_pattern(old_nodes, pattern, text_type):
+    """
+    Split TEXT nodes around every match of pattern, which must capture
+    (text, url). The text is sliced at each match's span, so a node with k
+    matches is walked once instead of being re-split k times.
+    """
     new_nodes = []
-    
     for old_node in old_nodes:
         if old_node.text_type != TextType.TEXT:
             new_nodes.append(old_node)
             continue
-            
-        images = extract_markdown_images(old_node.text)
-        if not images:
+        text = old_node.text
+        position = 0
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if start > position:
+                new_nodes.append(TextNode(text[position:start], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            position = end
+        if position == 0:
             new_nodes.append(old_node)
-            continue
-            
-        # Split text by images and create appropriate nodes
-        current_text = old_node.text
-        for alt_text, url in images:
-            parts = current_text.split(f"![{alt_text}]({url})", 1)
-            if parts[0]:
-                new_nodes.append(TextNode(parts[0], TextType.TEXT))
-            new_nodes.append(TextNode(alt_text, TextType.IMAGE, url))
-            current_text = parts[1] if len(parts) > 1 else ""
-            
-        if current_text:
-            new_nodes.append(TextNode(current_text, TextType.TEXT))
-            
+        elif position < len(text):
+            new_nodes.append(TextNode(text[position:], TextType.TEXT))
     return new_nodes
 
+def split_nodes_image(old_nodes):
+    """Split nodes by image markdown and create image nodes"""
+    return split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.IMAGE)
+
 def split_nodes_link(old_nodes):
     """Split nodes by link markdown and create link nodes"""
-    new_nodes = []
-    
-    for old_node in old_nodes:
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-            
-        links = extract_markdown_links(old_node.text)
-        if not links:
-            new_nodes.append(old_node)
-            continue
-            
-        # Split text by links and create appropriate nodes
-        current_text = old_node.text
-        for text, url in links:
-            parts = current_text.split(f"[{text}]({url})", 1)
-            if parts[0]:
-                new_nodes.append(TextNode(parts[0], TextType.TEXT))
-            new_nodes.append(TextNode(text, TextType.LINK, url))
-            current_text = parts[1] if len(parts) > 1 else ""
-            
-        if current_text:
-            new_nodes.append(TextNode(current_text, TextType.TEXT))
-            
-    return new_nodes
+    return split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.LINK)
+
+# Tags used for spans that wrap a single run of text
+SPAN_TAGS = {
+    TextType.BOLD: "b",
+    TextType.ITALIC: "i",
+    TextType.CODE: "code",
+    TextType.LINK: "a",
+}
+
+InternInfo = namedtuple("InternInfo", ["hits", "misses", "maxsize", "currsize"])
+
+class LeafInterner:
+    """
+    Bounded LRU of shared FrozenLeafNodes for inline spans, keyed by
+    (text type, text, url).
 
-def text_node_to_html_node(text_node):
-    """Convert a TextNode to its corresponding HTML node"""
+    The same links, bold terms and images recur across pages; interning
+    hands out one node (whose HTML is rendered once) for each of them
+    instead of a new node per occurrence. Plain text runs are rarely
+    repeated and are left out so they do not evict the spans that are.
+    info() reports hits and misses like functools.lru_cache.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._nodes = OrderedDict()
+
+    def intern(self, text_node):
+        key = (text_node.text_type, text_node.text, text_node.url)
+        node = self._nodes.get(key)
+        if node is not None:
+            self._nodes.move_to_end(key)
+            self.hits += 1
+            return node
+        self.misses += 1
+        leaf = text_node_to_html_node(text_node)
+        frozen = FrozenCodeLeafNode if isinstance(leaf, CodeLeafNode) else FrozenLeafNode
+        node = self._nodes[key] = frozen(leaf.tag, leaf.value, leaf.props)
+        if len(self._nodes) > self.maxsize:
+            self._nodes.popitem(last=False)
+        return node
+
+    def info(self):
+        return InternInfo(self.hits, self.misses, self.maxsize, len(self._nodes))
+
+    def clear(self):
+        self._nodes.clear()
+        self.hits = self.misses = 0
+
+    def __repr__(self):
+        return f"LeafInterner(maxsize={self.maxsize!r})"
+
+def text_node_to_html_node(text_node, flatten=True, interner=None):
+    """
+    Convert a TextNode to its corresponding HTML node.
+
+    With flatten, bold/italic/code/link spans become a single tagged
+    LeafNode instead of a ParentNode wrapping an untagged LeafNode. Both
+    forms serialize to the same HTML; the flat one is half the objects.
+    With a LeafInterner, flattened spans and images come from it as
+    shared, immutable nodes.
+    """
+    if interner is not None and flatten and text_node.text_type != TextType.TEXT:
+        return interner.intern(text_node)
     # Ensure we have a valid text value
     text = text_node.text if text_node.text is not None else ""
     
     if text_node.text_type == TextType.TEXT:
         return LeafNode(None, text)
-    elif text_node.text_type == TextType.BOLD:
-        return ParentNode("b", [LeafNode(None, text)])  # Changed back to b
-    elif text_node.text_type == TextType.ITALIC:
-        return ParentNode("i", [LeafNode(None, text)])  # Changed back to i
-    elif text_node.text_type == TextType.CODE:
-        return ParentNode("code", [LeafNode(None, text)])
-    elif text_node.text_type == TextType.LINK:
-        return ParentNode("a", [LeafNode(None, text)], {"href": text_node.url or "#"})
+    elif text_node.text_type in SPAN_TAGS:
+        tag = SPAN_TAGS[text_node.text_type]
+        props = {"href": text_node.url or "#"} if text_node.text_type == TextType.LINK else None
+        leaf = CodeLeafNode if text_node.text_type == TextType.CODE else LeafNode
+        if flatten:
+            return leaf(tag, text, props)
+        return ParentNode(tag, [leaf(None, text)], props)
     elif text_node.text_type == TextType.IMAGE:
         return LeafNode("img", " ", {"src": text_node.url or "", "alt": text})
     else:
         raise ValueError(f"Invalid text type: {text_node.text_type}")
 
 def markdown_to_html_node(markdown):
-    """Convert a markdown string to an HTML node"""
-    block_nodes = []
-    current_nodes = []
-    
-    lines = markdown.split('\n')
-    in_code_block = False
-    code_content = []
-    
-    for line in lines:
-        if line.startswith('```'):
-            if in_code_block:
-                # End code block
-                code_text = '\n'.join(code_content)
-                if not code_text:
-                    code_text = ""
-                block_nodes.append(ParentNode("pre", [ParentNode("code", [LeafNode(None, code_text)])]))
-                code_content = []
-                in_code_block = False
-            else:
-                # Start code block
-                in_code_block = True
-            continue
-            
-        if in_code_block:
-            code_content.append(line)
-            continue
-            
-        if line.strip() == "":
-            if current_nodes:
-                block_nodes.append(ParentNode("p", current_nodes))
-                current_nodes = []
-            continue
-            
-        # Handle headers
-        if line.startswith('#'):
-            count = 0
-            while count < len(line) and line[count] == '#':
-                count += 1
-            text = line[count:].strip()
-            # Simpler header handling that was working before
-            node = ParentNode(f"h{count}", [LeafNode(None, text or "")])  # Ensure empty string if text is empty
-            block_nodes.append(node)
-            continue
-            
-        # Handle unordered lists
-        if line.strip().startswith('* '):
-            text = line.strip()[2:]
-            text_nodes = text_to_textnodes(text)
-            html_nodes = [text_node_to_html_node(node) for node in text_nodes]
-            block_nodes.append(ParentNode("li", html_nodes))
-            continue
-            
-        # Handle ordered lists
-        if re.match(r'^\d+\. ', line.strip()):
-            text = line.strip().split('. ', 1)[1]
-            text_nodes = text_to_textnodes(text)
-            html_nodes = [text_node_to_html_node(node) for node in text_nodes]
-            block_nodes.append(ParentNode("li", html_nodes))
-            continue
-            
-        # Handle blockquotes
-        if line.strip().startswith('> '):
-            text = line.strip()[2:]
-            text_nodes = text_to_textnodes(text)
-            html_nodes = [text_node_to_html_node(node) for node in text_nodes]
-            block_nodes.append(ParentNode("blockquote", html_nodes))
-            continue
-            
-        # Regular paragraph text
-        text_nodes = text_to_textnodes(line)
-        html_nodes = [text_node_to_html_node(node) for node in text_nodes]
-        current_nodes.extend(html_nodes)
-    
-    # Handle any remaining nodes
-    if current_nodes:
-        block_nodes.append(ParentNode("p", current_nodes))
-    
-    return ParentNode("div", block_nodes)
+    """Convert a markdown string to an HTML node with the lenient engine"""
+    # Imported here because engine itself imports this module
+    from engine import LENIENT_ENGINE
+    return LENIENT_ENGINE.markdown_to_html_node(markdown)
@@ -1,6 +1,6 @@
 from enum import Enum
-from typing import Optional
-from htmlnode import ParentNode
+from typing import List, NamedTuple, Optional, Pattern, Union
+from htmlnode import FrozenLeafNode, HtmlNode, ParentNode
 
 class TextType(Enum):
     TEXT: str
@@ -13,4 +13,41 @@ class TextType(Enum):
 class TextNode:
     def __init__(self, text: str, text_type: TextType, url: Optional[str] = None) -> None: ...
 
-def markdown_to_html_node(markdown: str) -> ParentNode: ... 
\ No newline at end of file
+class InlineSyntax:
+    image_pattern: Pattern[str]
+    link_pattern: Pattern[str]
+    strict: bool
+    links_first: bool
+    def __init__(self, image_pattern: Union[str, Pattern[str]], link_pattern: Union[str, Pattern[str]],
+                 strict: bool, links_first: bool) -> None: ...
+
+IMAGE_PATTERN: Pattern[str]
+LINK_PATTERN: Pattern[str]
+STRICT_IMAGE_PATTERN: Pattern[str]
+STRICT_LINK_PATTERN: Pattern[str]
+STRICT_INLINE: InlineSyntax
+LENIENT_INLINE: InlineSyntax
+
+def scan_inline(text: str, syntax: InlineSyntax = ...) -> List[TextNode]: ...
+
+class InternInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+class LeafInterner:
+    maxsize: int
+    hits: int
+    misses: int
+    def __init__(self, maxsize: int = 4096) -> None: ...
+    def intern(self, text_node: TextNode) -> FrozenLeafNode: ...
+    def info(self) -> InternInfo: ...
+    def clear(self) -> None: ...
+
+def text_node_to_html_node(text_node: TextNode, flatten: bool = True,
+                           interner: Optional[LeafInterner] = None) -> HtmlNode: ...
+
+def text_to_textnodes(text: str) -> List[TextNode]: ...
+
+def markdown_to_html_node(markdown: str) -> ParentNode: ...
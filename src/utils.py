@@ -1,6 +1,25 @@
-import re
-from textnode import TextNode, TextType
-from htmlnode import ParentNode, LeafNode
+from textnode import (
+    TextNode,
+    TextType,
+    scan_inline,
+    split_nodes_pattern,
+    STRICT_INLINE,
+    STRICT_IMAGE_PATTERN,
+    STRICT_LINK_PATTERN,
+)
+from htmlnode import CodeLeafNode, LeafNode
+# Block parsing lives in the shared engine; re-exported for existing callers
+from engine import (
+    STRICT_ENGINE,
+    markdown_to_blocks,
+    block_to_block_type,
+    block_type_paragraph,
+    block_type_heading,
+    block_type_code,
+    block_type_quote,
+    block_type_olist,
+    block_type_ulist,
+)
 
 def text_node_to_html_node(text_node):
     if not isinstance(text_node, TextNode):
@@ -13,7 +32,7 @@ def text_node_to_html_node(text_node):
     elif text_node.text_type == TextType.ITALIC:
         return LeafNode("i", text_node.text)
     elif text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text)
+        return CodeLeafNode("code", text_node.text)
     elif text_node.text_type == TextType.LINK:
         return LeafNode("a", text_node.text, {"href": text_node.url})
     elif text_node.text_type == TextType.IMAGE:
@@ -58,14 +77,13 @@ def extract_markdown_images(text):
         >>> extract_markdown_images(text)
         [('cat', 'cat.jpg'), ('dog', 'dog.png')]
     """
-    # The regex pattern breaks down as:
+    # STRICT_IMAGE_PATTERN breaks down as:
     # \!           - Match the literal '!' that precedes markdown images
     # \[([^\]]+)\] - Capture the alt text between square brackets
     # \(([^\)]+)\) - Capture the URL between parentheses
-    pattern = r'\!\[([^\]]+)\]\(([^\)]+)\)'
     
     # findall() returns a list of tuples where each tuple contains the captured groups
-    return re.findall(pattern, text)
+    return STRICT_IMAGE_PATTERN.findall(text)
 
 def extract_markdown_links(text):
     """
@@ -84,7 +102,7 @@ def extract_markdown_links(text):
         >>> extract_markdown_links(text)
         [('Google', 'https://google.com'), ('Bing', 'https://bing.com')]
     """
-    # The regex pattern breaks down as:
+    # STRICT_LINK_PATTERN breaks down as:
     """
     \[     # Match an opening square bracket (escaped because [ has special meaning)
     (.*?)  # First capturing group - match any characters (non-greedy)
@@ -93,9 +111,7 @@ def extract_markdown_links(text):
     ([^\)]+)  # Second capturing group - match one or more non-) characters
     \)     # Match a closing parenthesis (escaped)
     """
-    pattern = r'\[(.*?)\]\(([^\)]+)\)'
-    
-    return re.findall(pattern, text)
+    return STRICT_LINK_PATTERN.findall(text)
 
 def split_nodes_image(old_nodes):
     """
@@ -115,49 +131,9 @@ def split_nodes_image(old_nodes):
     Returns:
         list[TextNode]: New list of nodes with images split out
     """
-    new_nodes = []
-    for old_node in old_nodes:
-        # Skip nodes that aren't normal text
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-            
-        # Process the node's text
-        current_text = old_node.text
-        current_index = 0
-        image_matches = extract_markdown_images(current_text)
-        
-        # Handle each image match and the text between matches
-        for alt_text, url in image_matches:
-            # Find the full image markdown in the text
-            image_markdown = f"![{alt_text}]({url})"
-            image_index = current_text.find(image_markdown, current_index)
-            
-            # Add any text that comes before the image
-            if image_index > current_index:
-                new_nodes.append(
-                    TextNode(
-                        current_text[current_index:image_index],
-                        TextType.TEXT
-                    )
-                )
-            
-            # Add the image node
-            new_nodes.append(TextNode(alt_text, TextType.IMAGE, url))
-            
-            # Update the current index for the next iteration
-            current_index = image_index + len(image_markdown)
-        
-        # Add any remaining text after the last image
-        if current_index < len(current_text):
-            new_nodes.append(
-                TextNode(
-                    current_text[current_index:],
-                    TextType.TEXT
-                )
-            )
-            
-    return new_nodes
+    # Slices at each match's span; rebuilding the markdown and searching
+    # for it again could land on an earlier, identical-looking occurrence
+    return split_nodes_pattern(old_nodes, STRICT_IMAGE_PATTERN, TextType.IMAGE)
 
 def split_nodes_link(old_nodes):
     """
@@ -170,50 +146,15 @@ def split_nodes_link(old_nodes):
     Returns:
         list[TextNode]: New list of nodes with links split out
     """
-    new_nodes = []
-    for old_node in old_nodes:
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-            
-        current_text = old_node.text
-        current_index = 0
-        link_matches = extract_markdown_links(current_text)
-        
-        for anchor_text, url in link_matches:
-            # We need to handle the case where anchor_text might contain brackets
-            link_markdown = f"[{anchor_text}]({url})"
-            link_index = current_text.find(link_markdown, current_index)
-            
-            if link_index > current_index:
-                new_nodes.append(
-                    TextNode(
-                        current_text[current_index:link_index],
-                        TextType.TEXT
-                    )
-                )
-            
-            # Create the link node with the proper anchor text
-            new_nodes.append(TextNode(anchor_text, TextType.LINK, url))
-            
-            current_index = link_index + len(link_markdown)
-        
-        if current_index < len(current_text):
-            new_nodes.append(
-                TextNode(
-                    current_text[current_index:],
-                    TextType.TEXT
-                )
-            )
-            
-    return new_nodes
+    return split_nodes_pattern(old_nodes, STRICT_LINK_PATTERN, TextType.LINK)
 
 def text_to_textnodes(text):
     """
-    Converts markdown text into a list of TextNode objects by applying
-    a series of splitting functions to process different markdown elements.
+    Converts markdown text into a list of TextNode objects, with the same
+    result as applying a series of splitting functions to process
+    different markdown elements.
     
-    The function processes elements in this order:
+    The elements are processed in this order:
     1. Images (![alt](url))
     2. Links ([text](url))
     3. Bold text (**text**)
@@ -236,167 +177,43 @@ def text_to_textnodes(text):
         #     TextNode("alt", TextType.IMAGE, "url")
         # ]
     """
-    # Start with a single text node containing the entire text
-    nodes = [TextNode(text, TextType.TEXT)]
-    
-    # Process images first since they contain brackets that could interfere
-    # with link processing if done later
-    nodes = split_nodes_image(nodes)
-    
-    # Process links next for the same reason - they contain brackets
-    nodes = split_nodes_link(nodes)
-    
-    # Process bold text with double asterisks
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    
-    # Process italic text with single asterisks
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
-    
-    # Finally process code blocks
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    
-    return nodes
-
-def markdown_to_blocks(markdown):
-    blocks = markdown.split("\n\n")
-    filtered_blocks = []
-    for block in blocks:
-        if block == "":
-            continue
-        block = block.strip()
-        filtered_blocks.append(block)
-    return filtered_blocks
-
-block_type_paragraph = "paragraph"
-block_type_heading = "heading"
-block_type_code = "code"
-block_type_quote = "quote"
-block_type_olist = "ordered_list"
-block_type_ulist = "unordered_list"
-
-def block_to_block_type(block):
-    lines = block.split("\n")
-
-    if block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
-        return block_type_heading
-    if len(lines) > 1 and lines[0].startswith("```") and lines[-1].startswith("```"):
-        return block_type_code
-    if block.startswith(">"):
-        for line in lines:
-            if not line.startswith(">"):
-                return block_type_paragraph
-        return block_type_quote
-    if block.startswith("* "):
-        for line in lines:
-            if not line.startswith("* "):
-                return block_type_paragraph
-        return block_type_ulist
-    if block.startswith("- "):
-        for line in lines:
-            if not line.startswith("- "):
-                return block_type_paragraph
-        return block_type_ulist
-    if block.startswith("1. "):
-        i = 1
-        for line in lines:
-            if not line.startswith(f"{i}. "):
-                return block_type_paragraph
-            i += 1
-        return block_type_olist
-    return block_type_paragraph
+    # A single scan over the text yields the same nodes as chaining
+    # split_nodes_image, split_nodes_link and split_nodes_delimiter in the
+    # order above, without building a new node list for every pass
+    return scan_inline(text, STRICT_INLINE)
 
 def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    children = []
-    for block in blocks:
-        html_node = block_to_html_node(block)
-        children.append(html_node)
-    return ParentNode("div", children, None)
+    """Convert markdown to an HTML node with the strict engine"""
+    return STRICT_ENGINE.markdown_to_html_node(markdown)
 
 
 def block_to_html_node(block):
-    block_type = block_to_block_type(block)
-    if block_type == block_type_paragraph:
-        return paragraph_to_html_node(block)
-    if block_type == block_type_heading:
-        return heading_to_html_node(block)
-    if block_type == block_type_code:
-        return code_to_html_node(block)
-    if block_type == block_type_olist:
-        return olist_to_html_node(block)
-    if block_type == block_type_ulist:
-        return ulist_to_html_node(block)
-    if block_type == block_type_quote:
-        return quote_to_html_node(block)
-    raise ValueError("Invalid block type")
+    return STRICT_ENGINE.block_to_html_node(block)
 
 
 def text_to_children(text):
-    text_nodes = text_to_textnodes(text)
-    children = []
-    for text_node in text_nodes:
-        html_node = text_node_to_html_node(text_node)
-        children.append(html_node)
-    return children
+    return STRICT_ENGINE.text_to_children(text)
 
 
 def paragraph_to_html_node(block):
-    lines = block.split("\n")
-    paragraph = " ".join(lines)
-    children = text_to_children(paragraph)
-    return ParentNode("p", children)
+    return STRICT_ENGINE.paragraph_to_html_node(block.split("\n"))
 
 
 def heading_to_html_node(block):
-    level = 0
-    for char in block:
-        if char == "#":
-            level += 1
-        else:
-            break
-    if level + 1 >= len(block):
-        raise ValueError(f"Invalid heading level: {level}")
-    text = block[level + 1 :]
-    children = text_to_children(text)
-    return ParentNode(f"h{level}", children)
+    return STRICT_ENGINE.heading_to_html_node(block.split("\n"))
 
 
 def code_to_html_node(block):
-    if not block.startswith("```") or not block.endswith("```"):
-        raise ValueError("Invalid code block")
-    text = block[4:-3]
-    children = text_to_children(text)
-    code = ParentNode("code", children)
-    return ParentNode("pre", [code])
+    return STRICT_ENGINE.code_to_html_node(block.split("\n"))
 
 
 def olist_to_html_node(block):
-    items = block.split("\n")
-    html_items = []
-    for item in items:
-        text = item[3:]
-        children = text_to_children(text)
-        html_items.append(ParentNode("li", children))
-    return ParentNode("ol", html_items)
+    return STRICT_ENGINE.olist_to_html_node(block.split("\n"))
 
 
 def ulist_to_html_node(block):
-    items = block.split("\n")
-    html_items = []
-    for item in items:
-        text = item[2:]
-        children = text_to_children(text)
-        html_items.append(ParentNode("li", children))
-    return ParentNode("ul", html_items)
+    return STRICT_ENGINE.ulist_to_html_node(block.split("\n"))
 
 
 def quote_to_html_node(block):
-    lines = block.split("\n")
-    new_lines = []
-    for line in lines:
-        if not line.startswith(">"):
-            raise ValueError("Invalid quote block")
-        new_lines.append(line.lstrip(">").strip())
-    content = " ".join(new_lines)
-    children = text_to_children(content)
-    return ParentNode("blockquote", children)
\ No newline at end of file
+    return STRICT_ENGINE.quote_to_html_node(block.split("\n"))
@@ -1,5 +1,11 @@
 import pytest
-from src.markdown_parser import extract_title
+from src.markdown_parser import (
+    FrontMatterError,
+    extract_title,
+    parse_front_matter,
+    read_page_metadata,
+    split_front_matter,
+)
 
 def test_extract_title_basic():
     assert extract_title("# Hello") == "Hello"
@@ -21,4 +27,65 @@ def test_extract_title_no_h1():
         
 def test_extract_title_empty():
     with pytest.raises(ValueError):
-        extract_title("") 
\ No newline at end of file
+        extract_title("") 
+
+POST = """---
+title: "Tom, again"
+date: 2024-01-05
+tags: [tolkien, opinion]
+draft: yes
+template: post.html
+---
+# Why Tom Bombadil Was a Mistake
+
+Body text
+"""
+
+def test_split_front_matter():
+    metadata, body = split_front_matter(POST)
+    assert metadata == {
+        "title": "Tom, again",
+        "date": "2024-01-05",
+        "tags": ["tolkien", "opinion"],
+        "draft": True,
+        "template": "post.html",
+    }
+    assert body.startswith("# Why Tom")
+
+def test_split_front_matter_absent():
+    metadata, body = split_front_matter("# Title\n\n---\n\ntext")
+    assert body == "# Title\n\n---\n\ntext"
+    assert metadata["title"] is None
+    assert metadata["tags"] == []
+
+def test_parse_front_matter_errors():
+    with pytest.raises(FrontMatterError):
+        parse_front_matter("no colon here")
+    with pytest.raises(FrontMatterError):
+        parse_front_matter("date: yesterday")
+    with pytest.raises(FrontMatterError):
+        parse_front_matter("updated: 2024-01-05T10:00:00Z")
+    with pytest.raises(FrontMatterError):
+        parse_front_matter("draft: maybe")
+    with pytest.raises(FrontMatterError):
+        split_front_matter("---\ntitle: x\n# never closed")
+
+def test_updated_is_a_date():
+    assert parse_front_matter("updated: '2024-03-02'")["updated"] == "2024-03-02"
+
+def test_unknown_keys_are_kept():
+    assert parse_front_matter("author: Bilbo\n# comment\n")["author"] == "Bilbo"
+
+def test_read_page_metadata_matches_split(tmp_path):
+    path = tmp_path / "index.md"
+    path.write_text(POST)
+    assert read_page_metadata(str(path)) == split_front_matter(POST)[0]
+
+def test_read_page_metadata_falls_back_to_h1(tmp_path):
+    path = tmp_path / "index.md"
+    path.write_text("---\ndate: 2024-02-01\n---\n\n# Heading Title\n\ntext")
+    metadata = read_page_metadata(str(path))
+    assert metadata["title"] == "Heading Title"
+    assert metadata["date"] == "2024-02-01"
+    path.write_text("# Plain\n\ntext")
+    assert read_page_metadata(str(path))["title"] == "Plain"